@@ -1,5 +1,9 @@
+from collections.abc import AsyncIterator
+
 from shiny_rpc.client import BaseClient
+from shiny_rpc.framing import FramingMode
 
+from .compression import COMPRESSION_DICTIONARY
 from .requests import (
     CompleteTaskRequest,
     CreateTaskRequest,
@@ -7,6 +11,7 @@ from .requests import (
     DeleteTaskRequest,
     DeleteTodoListRequest,
     GetTodoListRequest,
+    GetTodoListTasksRequest,
     IncreaseTaskCompletionPercentRequest,
     UpdateTaskRequest,
     UpdateTodoListRequest,
@@ -18,6 +23,7 @@ from .responses import (
     DeleteTaskResponse,
     DeleteTodoListResponse,
     GetTodoListResponse,
+    GetTodoListTasksResponse,
     IncreaseTaskCompletionPercentResponse,
     UpdateTaskResponse,
     UpdateTodoListResponse,
@@ -31,11 +37,12 @@ class Client(BaseClient):
         headers: CreateTodoListRequest.HeadersSchema | None = None,
     ) -> CreateTodoListResponse:
         return await self.send(  # type:ignore[return-value]
-            CreateTodoListRequest(
+            request=CreateTodoListRequest(
                 method_name='create_todo_list',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=CreateTodoListResponse,
         )
 
     async def get_todo_list(
@@ -44,11 +51,26 @@ class Client(BaseClient):
         headers: GetTodoListRequest.HeadersSchema | None = None,
     ) -> GetTodoListResponse:
         return await self.send(  # type:ignore[return-value]
-            GetTodoListRequest(
+            request=GetTodoListRequest(
                 method_name='get_todo_list',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=GetTodoListResponse,
+        )
+
+    def get_todo_list_tasks(
+        self,
+        payload: GetTodoListTasksRequest.PayloadSchema,
+        headers: GetTodoListTasksRequest.HeadersSchema | None = None,
+    ) -> AsyncIterator[GetTodoListTasksResponse]:
+        return self.stream(  # type:ignore[return-value]
+            request=GetTodoListTasksRequest(
+                method_name='get_todo_list_tasks',
+                payload=payload,
+                headers=headers,
+            ),
+            response_class=GetTodoListTasksResponse,
         )
 
     async def update_todo_list(
@@ -57,11 +79,12 @@ class Client(BaseClient):
         headers: UpdateTodoListRequest.HeadersSchema | None = None,
     ) -> UpdateTodoListResponse:
         return await self.send(  # type:ignore[return-value]
-            UpdateTodoListRequest(
+            request=UpdateTodoListRequest(
                 method_name='update_todo_list',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=UpdateTodoListResponse,
         )
 
     async def delete_todo_list(
@@ -70,11 +93,12 @@ class Client(BaseClient):
         headers: DeleteTodoListRequest.HeadersSchema | None = None,
     ) -> DeleteTodoListResponse:
         return await self.send(  # type:ignore[return-value]
-            DeleteTodoListRequest(
+            request=DeleteTodoListRequest(
                 method_name='delete_todo_list',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=DeleteTodoListResponse,
         )
 
     async def create_task(
@@ -83,11 +107,12 @@ class Client(BaseClient):
         headers: CreateTaskRequest.HeadersSchema | None = None,
     ) -> CreateTaskResponse:
         return await self.send(  # type:ignore[return-value]
-            CreateTaskRequest(
+            request=CreateTaskRequest(
                 method_name='create_task',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=CreateTaskResponse,
         )
 
     async def update_task(
@@ -96,11 +121,12 @@ class Client(BaseClient):
         headers: UpdateTaskRequest.HeadersSchema | None = None,
     ) -> UpdateTaskResponse:
         return await self.send(  # type:ignore[return-value]
-            UpdateTaskRequest(
+            request=UpdateTaskRequest(
                 method_name='update_task',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=UpdateTaskResponse,
         )
 
     async def complete_task(
@@ -109,11 +135,12 @@ class Client(BaseClient):
         headers: CompleteTaskRequest.HeadersSchema | None = None,
     ) -> CompleteTaskResponse:
         return await self.send(  # type:ignore[return-value]
-            CompleteTaskRequest(
+            request=CompleteTaskRequest(
                 method_name='complete_task',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=CompleteTaskResponse,
         )
 
     async def increase_task_completion_percent(
@@ -122,11 +149,12 @@ class Client(BaseClient):
         headers: IncreaseTaskCompletionPercentRequest.HeadersSchema | None = None,
     ) -> IncreaseTaskCompletionPercentResponse:
         return await self.send(  # type:ignore[return-value]
-            IncreaseTaskCompletionPercentRequest(
+            request=IncreaseTaskCompletionPercentRequest(
                 method_name='increase_task_completion_percent',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=IncreaseTaskCompletionPercentResponse,
         )
 
     async def delete_task(
@@ -135,11 +163,12 @@ class Client(BaseClient):
         headers: DeleteTaskRequest.HeadersSchema | None = None,
     ) -> DeleteTaskResponse:
         return await self.send(  # type:ignore[return-value]
-            DeleteTaskRequest(
+            request=DeleteTaskRequest(
                 method_name='delete_task',
                 payload=payload,
                 headers=headers,
             ),
+            response_class=DeleteTaskResponse,
         )
 
 
@@ -149,4 +178,7 @@ class Client(BaseClient):
 client = Client(
     host='127.0.0.1',
     port=7777,
+    framing_mode=FramingMode.LENGTH_PREFIXED,
+    compression=True,
+    compression_dictionary=COMPRESSION_DICTIONARY,
 )
@@ -0,0 +1,9 @@
+# zlib preset dictionary, built from annotation field names and enum values.
+# Server and client must use the same one, so regenerate both after annotation changes.
+
+COMPRESSION_DICTIONARY = (
+    b'"simple""percent""title":"text":"user_id":"list":"id":"task_list'
+    b'_id":"task":"task_type":"task_id":"delta":"is_completed":"create'
+    b'd_at":"completed_at":"completion_percent":"create_by_service":"i'
+    b's_closed":"is_favourite":"service_id":"trace_id":'
+)
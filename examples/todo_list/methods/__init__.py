@@ -4,6 +4,7 @@ from .create_todo_list import create_todo_list
 from .delete_task import delete_task
 from .delete_todo_list import delete_todo_list
 from .get_todo_list import get_todo_list
+from .get_todo_list_tasks import get_todo_list_tasks
 from .handler import handler
 from .increase_task_completion_percent import increase_task_completion_percent
 from .update_task import update_task
@@ -13,6 +14,7 @@ __all__ = [
     'handler',
     'create_todo_list',
     'get_todo_list',
+    'get_todo_list_tasks',
     'update_todo_list',
     'delete_todo_list',
     'create_task',
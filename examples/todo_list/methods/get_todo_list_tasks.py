@@ -0,0 +1,13 @@
+from collections.abc import AsyncIterator
+
+from examples.todo_list.requests import GetTodoListTasksRequest
+from examples.todo_list.responses import GetTodoListTasksResponse
+from shiny_rpc.user import User
+
+
+async def get_todo_list_tasks(
+    request: GetTodoListTasksRequest,  # noqa: ARG001
+    user: User,  # noqa: ARG001
+) -> AsyncIterator[GetTodoListTasksResponse]:
+    raise NotImplementedError
+    yield
@@ -1,3 +1,4 @@
+from shiny_rpc.cache import CachePolicy
 from shiny_rpc.message_hander import MessageHandler
 
 from . import (
@@ -7,6 +8,7 @@ from . import (
     delete_task,
     delete_todo_list,
     get_todo_list,
+    get_todo_list_tasks,
     increase_task_completion_percent,
     update_task,
     update_todo_list,
@@ -22,14 +24,22 @@ handler.add_method(
 handler.add_method(
     method_name='get_todo_list',
     func=get_todo_list,  # type:ignore[arg-type]
+    cache=CachePolicy(ttl=60, key=['id'], tags=['todo_list:{id}']),
+    coalesce=True,
+)
+handler.add_method(
+    method_name='get_todo_list_tasks',
+    func=get_todo_list_tasks,  # type:ignore[arg-type]
 )
 handler.add_method(
     method_name='update_todo_list',
     func=update_todo_list,  # type:ignore[arg-type]
+    invalidates=['todo_list:{id}'],
 )
 handler.add_method(
     method_name='delete_todo_list',
     func=delete_todo_list,  # type:ignore[arg-type]
+    invalidates=['todo_list:{id}'],
 )
 handler.add_method(
     method_name='create_task',
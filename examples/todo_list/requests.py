@@ -17,6 +17,11 @@ class GetTodoListRequest(BaseRequest):
         id: int
 
 
+class GetTodoListTasksRequest(BaseRequest):
+    class PayloadSchema(BasePayloadSchema):
+        task_list_id: int
+
+
 class UpdateTodoListRequest(BaseRequest):
     class PayloadSchema(BasePayloadSchema):
         id: int
@@ -15,6 +15,11 @@ class GetTodoListResponse(BaseResponse):
         list: TodoListDTO
 
 
+class GetTodoListTasksResponse(BaseResponse):
+    class PayloadSchema(BasePayloadSchema):
+        task: TaskDTO
+
+
 class UpdateTodoListResponse(BaseResponse):
     class PayloadSchema(BasePayloadSchema):
         list: TodoListDTO
@@ -1,9 +1,11 @@
-import asyncio
 import logging
+import os
 
+from shiny_rpc.framing import FramingMode
 from shiny_rpc.server import Server
 from shiny_rpc.utils import setup_rich_logging
 
+from .compression import COMPRESSION_DICTIONARY
 from .methods import handler
 
 server = Server(
@@ -12,9 +14,11 @@ server = Server(
     log_level=logging.DEBUG,
     log_messages=True,
     message_handler=handler,
+    framing_mode=FramingMode.LENGTH_PREFIXED,
+    compression_dictionary=COMPRESSION_DICTIONARY,
 )
 
 
 if __name__ == '__main__':
     setup_rich_logging()
-    asyncio.run(server.run())
+    server.serve(workers=int(os.environ.get('WORKERS', 1)))
@@ -0,0 +1,132 @@
+import asyncio
+import socket
+import stat
+from collections.abc import Callable, Coroutine
+from pathlib import Path
+from typing import Any, Self
+
+UNIX_PREFIX = 'unix:'
+# Abstract namespace sockets have no file, their names start with zero byte (Linux only)
+ABSTRACT_PREFIX = '@'
+
+type ConnectionCallback = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Coroutine[Any, Any, None]]
+
+
+class Address:
+
+    """Listen or connect address: TCP host and port, Unix socket `unix:/path/to.sock` or abstract socket `unix:@name`."""
+
+    host: str
+    port: int
+    # Set only for Unix sockets
+    path: str | None
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.path = None
+
+        if host.startswith(UNIX_PREFIX):
+            path = host.removeprefix(UNIX_PREFIX)
+            self.path = f'\0{path.removeprefix(ABSTRACT_PREFIX)}' if path.startswith(ABSTRACT_PREFIX) else path
+
+    @classmethod
+    def parse(cls, address: str) -> Self:
+        """Parses `host:port`, `[ipv6]:port` or `unix:` address."""
+        if address.startswith(UNIX_PREFIX):
+            return cls(address)
+
+        host, _, port = address.rpartition(':')
+        return cls(host.removeprefix('[').removesuffix(']'), int(port))
+
+    @property
+    def is_unix(self) -> bool:
+        return self.path is not None
+
+    @property
+    def is_abstract(self) -> bool:
+        return bool(self.path) and self.path[0] == '\0'  # type:ignore[index]
+
+    def bind(self, *, reuse_port: bool = False) -> socket.socket:
+        if self.path is None:
+            return socket.create_server(
+                (self.host, self.port),
+                family=socket.AF_INET6 if ':' in self.host else socket.AF_INET,
+                reuse_port=reuse_port,
+            )
+
+        self.cleanup()
+        return socket.create_server(self.path, family=socket.AF_UNIX)
+
+    def cleanup(self) -> None:
+        # Socket file is left after server is closed and prevents next bind
+        if self.path is None or self.is_abstract:
+            return
+
+        try:
+            path = Path(self.path)
+            if stat.S_ISSOCK(path.stat().st_mode):
+                path.unlink()
+        except FileNotFoundError:
+            return
+
+    async def start_server(
+        self,
+        client_connected_cb: ConnectionCallback,
+        limit: int,
+        sock: socket.socket | None = None,
+    ) -> asyncio.Server:
+        if self.path is None:
+            return await asyncio.start_server(
+                client_connected_cb=client_connected_cb,
+                host=None if sock else self.host,
+                port=None if sock else self.port,
+                sock=sock,
+                limit=limit,
+            )
+
+        return await asyncio.start_unix_server(
+            client_connected_cb=client_connected_cb,
+            path=None if sock else self.path,
+            sock=sock,
+            limit=limit,
+        )
+
+    async def open_connection(self, limit: int) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.path is None:
+            return await asyncio.open_connection(
+                host=self.host,
+                port=self.port,
+                limit=limit,
+            )
+
+        return await asyncio.open_unix_connection(
+            path=self.path,
+            limit=limit,
+        )
+
+    @staticmethod
+    def describe_peer(writer: asyncio.StreamWriter) -> str:
+        peername = writer.get_extra_info('peername')
+        if isinstance(peername, tuple):
+            return f'{peername[0]}:{peername[1]}'
+
+        # Unix socket clients are usually unnamed, so listening socket is described
+        sockname = writer.get_extra_info('sockname')
+        if isinstance(sockname, bytes):
+            sockname = f'{ABSTRACT_PREFIX}{sockname[1:].decode(errors='replace')}'
+
+        return f'{UNIX_PREFIX}{peername or sockname}'
+
+    def __str__(self) -> str:
+        if self.path is None:
+            return f'[{self.host}]:{self.port}' if ':' in self.host else f'{self.host}:{self.port}'
+
+        if self.is_abstract:
+            return f'{UNIX_PREFIX}{ABSTRACT_PREFIX}{self.path[1:]}'
+
+        return f'{UNIX_PREFIX}{self.path}'
@@ -0,0 +1,86 @@
+import asyncio
+
+
+class AdmissionControl:
+
+    """
+    Limits connections served at once.
+
+    Up to `soft_limit` connections are served, next ones wait in queue for a free slot up to `timeout` seconds.
+    Connections above `hard_limit` (served and queued together) are rejected right away.
+    """
+
+    soft_limit: int
+    hard_limit: int
+    timeout: float
+
+    active: int
+    waiting: int
+    slots: asyncio.Semaphore
+
+    # Counters since server start
+    accepted: int
+    queued: int
+    rejected: int
+    timed_out: int
+
+    def __init__(
+        self,
+        soft_limit: int,
+        hard_limit: int,
+        timeout: float,
+    ) -> None:
+        self.soft_limit = soft_limit
+        self.hard_limit = max(hard_limit, soft_limit)
+        self.timeout = timeout
+
+        self.active = 0
+        self.waiting = 0
+        self.slots = asyncio.Semaphore(soft_limit)
+
+        self.accepted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def admit(self) -> bool:
+        if self.active + self.waiting >= self.hard_limit:
+            self.rejected += 1
+            return False
+
+        if self.slots.locked():
+            self.queued += 1
+            self.waiting += 1
+
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await self.slots.acquire()
+            except TimeoutError:
+                self.timed_out += 1
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self.slots.acquire()
+
+        self.active += 1
+        self.accepted += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self.slots.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'active': self.active,
+            'waiting': self.waiting,
+            'accepted': self.accepted,
+            'queued': self.queued,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+        }
+
+    def __str__(self) -> str:
+        return f'{self.soft_limit} connections, {self.hard_limit - self.soft_limit} in queue for {self.timeout} sec'
@@ -144,6 +144,21 @@ class AnnotationGenerator:
             target_file_name=file_name,
         )
 
+    def _generate_compression_dictionary(self) -> None:
+        file_name = 'compression.py'
+        dictionary = self.annotation_dto.make_compression_dictionary()
+        chunk_size = 64
+
+        self._print_step(file_name)
+        self._render(
+            source_file_name='compression.py.jinja2',
+            target_file_name=file_name,
+            fragments=[  # type:ignore[arg-type]
+                repr(dictionary[position:position + chunk_size])
+                for position in range(0, len(dictionary), chunk_size)
+            ],
+        )
+
     def _make_requests_or_responses(
         self,
         *,
@@ -236,6 +251,7 @@ class AnnotationGenerator:
         self._generate_enums()
         self._generate_dtos()
         self._generate_baseclasses()
+        self._generate_compression_dictionary()
         self._make_requests_and_responses()
         self._make_server()
         self._make_client()
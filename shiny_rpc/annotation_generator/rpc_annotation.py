@@ -1,6 +1,7 @@
 from enum import StrEnum
 from typing import Any, Literal
 
+from shiny_rpc.compression import make_compression_dictionary
 from shiny_rpc.errors import (
     AnnotationCaseError,
     AnnotationNoMethodError,
@@ -54,17 +55,20 @@ type RawFieldType = FieldTypePrimitive | list[RawFieldType | list[RawFieldType]]
 class AnnotationSchema(BaseSchema):
     enums: dict[str, dict[str, str]] | None = None
     objects: dict[str, dict[str, Any]] | None = None
-    methods: dict[str, dict[str, dict[str, Any]]] | None = None
+    methods: dict[str, dict[str, Any]] | None = None
     headers: dict[str, Any] | None = None
 
 
 class RPCAnnotationMethod:
     request: dict[str, AnnotationField]
     response: dict[str, RawFieldType]
+    # Streaming method yields many responses for one request
+    stream: bool
 
-    def __init__(self) -> None:
+    def __init__(self, *, stream: bool = False) -> None:
         self.request = {}
         self.response = {}
+        self.stream = stream
 
 
 class RPCAnnotationDTO:
@@ -177,7 +181,14 @@ class RPCAnnotationDTO:
                     },
                 )
 
-            self.methods[method_key] = RPCAnnotationMethod()
+            if not isinstance(raw_method.get('stream', False), bool):
+                raise AnnotationValidationError(
+                    details={
+                        'stream': f'must be boolean in {method_key} method',
+                    },
+                )
+
+            self.methods[method_key] = RPCAnnotationMethod(stream=raw_method.get('stream', False))
 
             for direction in ['request', 'response']:
                 current_object = (
@@ -201,3 +212,30 @@ class RPCAnnotationDTO:
         self._make_objects()
         self._make_methods()
         self._make_headers()
+
+    def make_compression_dictionary(self) -> bytes:
+        field_names = [
+            *(
+                name
+                for method in self.methods.values()
+                for fields in (method.request, method.response)
+                for name in fields
+            ),
+            *(
+                name
+                for fields in self.objects.values()
+                for name in fields
+            ),
+            *self.headers.keys(),
+            'trace_id',
+        ]
+
+        return make_compression_dictionary(
+            field_names=field_names,
+            values=[
+                # Enums are built with functional API, so mypy takes them for members, not classes
+                str(element.value)  # type:ignore[attr-defined]
+                for enum in self.enums.values()
+                for element in enum
+            ],
+        )
@@ -0,0 +1,95 @@
+import asyncio
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from pydantic import PositiveInt
+
+from shiny_rpc.messages import Request, Response
+from shiny_rpc.schema import BasePayloadSchema
+
+if TYPE_CHECKING:
+    from shiny_rpc.client import BaseClient
+
+
+class BatchRequest(Request):
+    class PayloadSchema(BasePayloadSchema):
+        # Encoded requests, each with its own method name, payload and trace_id
+        requests: list[bytes]
+        # Requests are handled one by one in given order
+        sequential: bool = False
+        # Requests handled at once, all by default
+        max_concurrency: PositiveInt | None = None
+
+
+class BatchResponse(Response):
+    class PayloadSchema(BasePayloadSchema):
+        # Encoded responses in order of requests, failed request gets its own error response
+        responses: list[bytes]
+
+
+class Batch:
+
+    """
+    Collects requests sent within `BaseClient.batch` context.
+
+    Requests sent in the same event loop iteration, e.g. by `asyncio.gather`, go in one envelope.
+    The first of them sends the envelope, when others are added.
+    """
+
+    client: 'BaseClient'
+    sequential: bool
+    max_concurrency: int | None
+    items: list[tuple[Request, type[Response], asyncio.Future[Response]]]
+
+    def __init__(
+        self,
+        client: 'BaseClient',
+        *,
+        sequential: bool = False,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self.client = client
+        self.sequential = sequential
+        self.max_concurrency = max_concurrency
+        self.items = []
+
+    async def send(
+        self,
+        request: Request,
+        response_class: type[Response],
+    ) -> Response:
+        future = asyncio.get_running_loop().create_future()
+        self.items.append((request, response_class, future))
+
+        if len(self.items) == 1:
+            items = self.items
+
+            try:
+                # Tasks started along with this one add their requests before it is resumed
+                await asyncio.sleep(0)
+                self.items = []
+
+                responses = await self.client.send_batch(
+                    [(request, response_class) for request, response_class, _ in items],
+                    sequential=self.sequential,
+                    max_concurrency=self.max_concurrency,
+                )
+            except asyncio.CancelledError:
+                # Requests sent after the envelope belong to the next one
+                if self.items is items:
+                    self.items = []
+                for *_, item_future in items:
+                    item_future.cancel()
+                raise
+            except Exception as error:  # noqa: BLE001
+                # Error of the envelope is raised by every request in it, this one included
+                for *_, item_future in items:
+                    item_future.set_exception(error)
+            else:
+                for (*_, item_future), response in zip(items, responses, strict=True):
+                    item_future.set_result(response)
+
+        return await future
+
+
+current_batch: ContextVar[Batch | None] = ContextVar('current_batch', default=None)
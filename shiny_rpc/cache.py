@@ -0,0 +1,239 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from string import Formatter
+
+import orjson
+
+from shiny_rpc.codec import JSON_CODEC, BaseCodec
+from shiny_rpc.messages import Request, Response
+
+type CacheKey = tuple[str, str, bytes]
+
+
+class CachePolicy:
+
+    """
+    Responses of read method are cached by `key` payload fields, all fields by default.
+
+    Tags may refer to payload fields, e.g. `todo_list:{id}`. Write methods invalidate tags formatted the same way,
+    so entries cached for other payloads are kept.
+    """
+
+    ttl: float
+    key: tuple[str, ...] | None
+    tags: tuple[str, ...]
+
+    def __init__(
+        self,
+        ttl: float,
+        key: Iterable[str] | None = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        self.ttl = ttl
+        self.key = tuple(key) if key is not None else None
+        self.tags = tuple(tags)
+
+
+def payload_key(request: Request, fields: tuple[str, ...] | None = None) -> bytes:
+    """Canonical encoding of request payload or its fields, equal payloads give equal keys."""
+    values = request.payload.model_dump(include=set(fields) if fields is not None else None)
+    return orjson.dumps(values, option=orjson.OPT_SORT_KEYS, default=str)
+
+
+def tag_fields(tags: Iterable[str]) -> set[str]:
+    return {field for tag in tags for _, field, _, _ in Formatter().parse(tag) if field is not None}
+
+
+def format_tags(tags: tuple[str, ...], request: Request) -> set[str]:
+    if not any('{' in tag for tag in tags):
+        return set(tags)
+
+    fields = request.payload.model_dump()
+    return {tag.format_map(fields) for tag in tags}
+
+
+class CachedResponse(Response):
+
+    """Successful response, encoded once and sent to many requests with their trace_id patched in."""
+
+    # Encoded response around its trace_id
+    head: bytes
+    tail: bytes
+
+    def __init__(
+        self,
+        method_name: str,
+        trace_id: str,
+        head: bytes,
+        tail: bytes,
+    ) -> None:
+        # Payload is not decoded back, it is kept only for logs
+        self.method_name = method_name
+        self.trace_id = trace_id
+        self.success = True
+        self.sequence = None
+        self.end_of_stream = False
+        self.payload = self.PayloadSchema.model_construct()
+        self.headers = self.HeadersSchema.model_construct(trace_id=trace_id)
+        self.head = head
+        self.tail = tail
+
+    def dump(self, codec: BaseCodec = JSON_CODEC) -> bytes:  # noqa: ARG002
+        # Entries are cached per codec, so codec is always the one response was encoded with
+        return b''.join((self.head, self.trace_id.encode(), self.tail))
+
+
+class CacheEntry:
+    __slots__ = ('expires_at', 'head', 'size', 'tags', 'tail', 'trace_id_size')
+
+    head: bytes
+    tail: bytes
+    trace_id_size: int
+    tags: set[str]
+    expires_at: float
+    size: int
+
+    def __init__(
+        self,
+        head: bytes,
+        tail: bytes,
+        trace_id_size: int,
+        tags: set[str],
+        expires_at: float,
+    ) -> None:
+        self.head = head
+        self.tail = tail
+        self.trace_id_size = trace_id_size
+        self.tags = tags
+        self.expires_at = expires_at
+        self.size = len(head) + len(tail)
+
+
+class ResponseCache:
+
+    """
+    LRU of encoded responses, bounded by their total size.
+
+    Entry is found by method name, codec and key fields of request payload.
+    Entry is dropped after its ttl or when any of its tags is invalidated.
+    """
+
+    max_size: int
+    entries: OrderedDict[CacheKey, CacheEntry]
+    # Keys of entries with every tag
+    tags: dict[str, set[CacheKey]]
+    size: int
+    # Incremented by every invalidation, response computed across it is not cached, it may be stale
+    version: int
+
+    # Counters since server start
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+    def __init__(self, max_size: int = 2**26) -> None:  # 64 MB
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.tags = {}
+        self.size = 0
+        self.version = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(policy: CachePolicy, request: Request, codec: BaseCodec) -> CacheKey:
+        return request.method_name, codec.name, payload_key(request, policy.key)
+
+    def get(self, key: CacheKey, request: Request) -> CachedResponse | None:
+        entry = self.entries.get(key)
+
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        # Encoded length of trace_id must not change, codec may prefix strings with their length
+        if len(request.trace_id.encode()) != entry.trace_id_size:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return CachedResponse(request.method_name, request.trace_id, entry.head, entry.tail)
+
+    def put(
+        self,
+        key: CacheKey,
+        policy: CachePolicy,
+        request: Request,
+        response: Response,
+        codec: BaseCodec,
+        version: int,
+    ) -> Response:
+        """Returns response to send, already encoded one, if it is cached."""
+        if not response.success or response.trace_id != request.trace_id or version != self.version:
+            return response
+
+        data = response.dump(codec)
+        trace_id = request.trace_id.encode()
+        # Headers are encoded after payload, so the last occurrence is trace_id header
+        position = data.rfind(trace_id)
+        if position < 0 or len(data) > self.max_size:
+            return response
+
+        if key in self.entries:
+            self._remove(key)
+
+        entry = self.entries[key] = CacheEntry(
+            head=data[:position],
+            tail=data[position + len(trace_id):],
+            trace_id_size=len(trace_id),
+            tags=format_tags(policy.tags, request),
+            expires_at=time.monotonic() + policy.ttl,
+        )
+        self.size += entry.size
+        for tag in entry.tags:
+            self.tags.setdefault(tag, set()).add(key)
+
+        while self.size > self.max_size:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+        return CachedResponse(request.method_name, request.trace_id, entry.head, entry.tail)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self.version += 1
+
+        for tag in tags:
+            for key in self.tags.get(tag, set()).copy():
+                self._remove(key)
+                self.invalidations += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self.entries.pop(key)
+        self.size -= entry.size
+
+        for tag in entry.tags:
+            keys = self.tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self.tags[tag]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'cache_entries': len(self.entries),
+            'cache_bytes': self.size,
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'cache_evictions': self.evictions,
+            'cache_invalidations': self.invalidations,
+        }
+
+    def __str__(self) -> str:
+        return f'up to {self.max_size} bytes'
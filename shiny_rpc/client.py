@@ -1,75 +1,636 @@
 import asyncio
 import logging
-from asyncio import LimitOverrunError, open_connection
+import time
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Iterable,
+)
+from contextlib import (
+    aclosing,
+    asynccontextmanager,
+    suppress,
+)
 from logging import getLogger
 from socket import socket
+from typing import cast
 from uuid import uuid4
 
-from shiny_rpc.constants import MESSAGE_SEPARATOR
-from shiny_rpc.errors import ClientFatalError
-from shiny_rpc.messages import Request, Response
+from shiny_rpc.address import Address
+from shiny_rpc.batch import (
+    Batch,
+    BatchRequest,
+    BatchResponse,
+    current_batch,
+)
+from shiny_rpc.codec import (
+    JSON_CODEC,
+    BaseCodec,
+    get_codec,
+)
+from shiny_rpc.compression import Compression
+from shiny_rpc.constants import (
+    BATCH_METHOD,
+    HANDSHAKE_METHOD,
+    PUSH_TRACE_ID,
+    SUBSCRIBE_METHOD,
+    UNSUBSCRIBE_METHOD,
+    ZERO_TRACE_ID,
+)
+from shiny_rpc.errors import (
+    ClientFatalError,
+    DeadlineExceededError,
+    ExternalError,
+    MaxMessageSizeReceivedError,
+)
+from shiny_rpc.framing import (
+    BaseFraming,
+    FramingMode,
+    make_framing,
+)
+from shiny_rpc.handshake import HandshakeRequest, HandshakeResponse
+from shiny_rpc.messages import (
+    ErrorResponse,
+    Request,
+    Response,
+    drain_notice,
+    ping_frame,
+    pong_frame,
+    response_from_error,
+)
+from shiny_rpc.pubsub import (
+    PushMessage,
+    SubscribeRequest,
+    SubscribeResponse,
+)
+from shiny_rpc.writer import CoalescingWriter
 
 
 class BaseClient:
     host: str
     port: int
+    address: Address
     server: socket
     max_message_size: int
     timeout_ms: int
+    framing: BaseFraming
+    preferred_codec: BaseCodec
+    codec: BaseCodec
+    preferred_compressions: list[Compression]
+    compression: Compression | None
+    chunked: bool
+    chunk_size: int | None
 
     is_connected: bool
-    locking_event: asyncio.Event
+    # Server is shutting down, requests are not sent until reconnect
+    is_draining: bool
+    lock: asyncio.Lock
+
+    # Pipelining: requests don`t wait for each other, responses are matched by trace_id
+    max_in_flight: int
+    in_flight: asyncio.Semaphore
+    pending: dict[str, asyncio.Queue[bytes | None]]
+    # Set, when there are no pending requests
+    idle: asyncio.Event
+    read_task: asyncio.Task[None] | None
+    # Queues of active `subscribe` iterators for every topic, they share one subscription on server
+    subscriptions: dict[str, set[asyncio.Queue[PushMessage | None]]]
 
     writer: asyncio.StreamWriter
+    # Requests of all concurrent senders are written through it, see `CoalescingWriter`
+    output: CoalescingWriter
     reader: asyncio.StreamReader
     logger: logging.Logger
 
     def __init__(
         self,
         host: str,
-        port: int,
+        port: int = 0,
         max_message_size: int = 2**20,  # 1 MB
         timeout_ms: int = 5000,  # 5 second
+        framing_mode: FramingMode = FramingMode.SEPARATOR,
+        codec: str = JSON_CODEC.name,
+        *,
+        compression: bool = False,
+        compression_threshold: int = 2**10,  # 1 KB
+        compression_dictionary: bytes | None = None,
+        chunked: bool = False,
+        max_in_flight: int = 1,
     ) -> None:
         self.host = host
         self.port = port
+        # Host may be Unix socket path `unix:/path/to.sock`, then port is not used
+        self.address = Address(host, port)
         self.max_message_size = max_message_size
         self.timeout_ms = timeout_ms
+        self.framing = make_framing(
+            mode=framing_mode,
+            max_message_size=max_message_size,
+        )
+        self.codec = JSON_CODEC
+        self.preferred_codec = get_codec(codec)
+
+        if self.preferred_codec.requires_length_prefix and framing_mode != FramingMode.LENGTH_PREFIXED:
+            raise ClientFatalError(
+                details={
+                    'codec': f'{self.preferred_codec} codec requires {FramingMode.LENGTH_PREFIXED.value} framing',
+                },
+            )
+
+        self.compression = None
+        self.preferred_compressions = []
+
+        if compression:
+            if framing_mode != FramingMode.LENGTH_PREFIXED:
+                raise ClientFatalError(
+                    details={
+                        'compression': f'requires {FramingMode.LENGTH_PREFIXED.value} framing',
+                    },
+                )
+
+            # With dictionary first, plain zlib as fallback for servers without it
+            self.preferred_compressions = [
+                Compression(
+                    max_message_size=max_message_size,
+                    threshold=compression_threshold,
+                    dictionary=dictionary,
+                )
+                for dictionary in dict.fromkeys((compression_dictionary, None))
+            ]
+
+        if chunked and not self.framing.supports_chunks:
+            raise ClientFatalError(
+                details={
+                    'chunked': f'requires {FramingMode.LENGTH_PREFIXED.value} framing',
+                },
+            )
+
+        # Chunk size is set by server in handshake
+        self.chunked = chunked
+        self.chunk_size = None
 
         self.is_connected = False
-        self.locking_event = asyncio.Event()
-        self.locking_event.set()
+        self.is_draining = False
+        self.lock = asyncio.Lock()
+
+        self.max_in_flight = max_in_flight
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.pending = {}
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.read_task = None
+        self.subscriptions = {}
+
         self.logger = getLogger(self.__class__.__name__)
 
     async def connect(self) -> None:
-        if self.is_connected:
+        """Connects to server, if not connected yet, or if connected server is shutting down."""
+        if self.is_connected and not self.is_draining:
             return
 
+        if self.is_connected:
+            await self._close_drained()
+
         try:
-            self.reader, self.writer = await open_connection(
-                host=self.host,
-                port=self.port,
-                limit=self.max_message_size,
-            )
-        except ConnectionRefusedError as error:
+            self.reader, self.writer = await self.address.open_connection(limit=self.max_message_size)
+            self.output = CoalescingWriter(self.writer)
+        except (ConnectionRefusedError, FileNotFoundError) as error:
             raise ClientFatalError.from_base_exception(error) from error
 
-    async def send(self, request: Request) -> Response:
-        request.trace_id = str(uuid4())
+        self.is_connected = True
+        self.is_draining = False
+        # Every connection starts with JSON and without compression, even after reconnect
+        self.codec = JSON_CODEC
+        self.compression = None
+        self.chunk_size = None
+
+        if self.preferred_codec is not JSON_CODEC or self.preferred_compressions or self.chunked or self.keepalive:
+            await self._handshake()
+
+        if self.max_in_flight > 1:
+            self.read_task = asyncio.create_task(self._read_responses())
+
+    @property
+    def keepalive(self) -> bool:
+        # Only pipelined client reads connection in background, so it can answer server pings while idle
+        return self.max_in_flight > 1
+
+    async def _close_drained(self) -> None:
+        # Responses to requests sent before drain notice are still delivered by draining server
+        await self.idle.wait()
+
+        async with self.lock:
+            if self.read_task:
+                self.read_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await self.read_task
 
-        await self.locking_event.wait()
-        self.locking_event.set()
+            self.is_connected = False
+            self.output.close()
 
+    async def _read_responses(self) -> None:
         try:
-            self.writer.write(request.dump() + MESSAGE_SEPARATOR)
-            await self.writer.drain()
-            data = await self.reader.readuntil(MESSAGE_SEPARATOR)
+            while True:
+                data = await self._read_frame()
+                trace_id = self.codec.find_trace_id(data, is_response=True)
+
+                if trace_id == PUSH_TRACE_ID:
+                    self._receive_push(data)
+                    continue
+
+                if trace_id == ZERO_TRACE_ID:
+                    # Server can`t read trace_id of invalid request, so it is unknown, which of pending requests
+                    # has failed, and all of them fail along with connection
+                    error = ErrorResponse.from_bytes(data, codec=self.codec)
+                    self.logger.warning(f'Disconnected from {self.address}: request without trace_id, {error.payload}')
+                    return
+
+                if trace_id and (queue := self.pending.get(trace_id)) is not None:
+                    queue.put_nowait(data)
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            ExternalError,
+        ) as error:
+            self.logger.warning(f'Disconnected from {self.address}: {error!r}')
+        finally:
+            self.is_connected = False
+            self.read_task = None
+            self.output.close()
+
+            for queue in self.pending.values():
+                queue.put_nowait(None)
+
+            for queues in self.subscriptions.values():
+                for subscription in queues:
+                    self._put_latest(subscription, None)
+
+    def _receive_push(self, data: bytes) -> None:
+        message = PushMessage.from_bytes(data, codec=self.codec)
+
+        for queue in self.subscriptions.get(message.payload.topic, ()):  # type:ignore[attr-defined]
+            self._put_latest(queue, message)
+
+    @staticmethod
+    def _put_latest(queue: asyncio.Queue[PushMessage | None], message: PushMessage | None) -> None:
+        # Reading connection must not wait for slow subscriber, its oldest message is dropped instead
+        if queue.full():
+            queue.get_nowait()
+
+        queue.put_nowait(message)
+
+    async def _handshake(self) -> None:
+        # Connection may be opened by request within batch context, handshake is not batched
+        response = await self._send(
+            request=HandshakeRequest(
+                method_name=HANDSHAKE_METHOD,
+                payload={
+                    'codecs': [self.preferred_codec.name],
+                    'compressions': [compression.name for compression in self.preferred_compressions],
+                    'chunked': self.chunked,
+                    'keepalive': self.keepalive,
+                },
+            ),
+            response_class=HandshakeResponse,
+        )
+        if not response.success:
+            # Server may reject connection, e.g. when its connection limit is reached
+            raise ClientFatalError(details=response.payload.model_dump())
+
+        payload = cast(HandshakeResponse.PayloadSchema, response.payload)
+        self.codec = get_codec(payload.codec)
+        self.compression = next(
+            (
+                compression
+                for compression in self.preferred_compressions
+                if compression.name == payload.compression
+            ),
+            None,
+        )
+        self.chunk_size = payload.chunk_size
+
+    def _write_frame(self, data: bytes) -> None:
+        if self.compression:
+            data = self.compression.compress(data)
+
+        self.framing.write(self.output, data)
+
+    async def _write_message(self, data: bytes) -> None:
+        if self.chunk_size and len(data) > self.chunk_size:
+            await self._write_chunks(data, self.chunk_size)
+            return
+
+        self._write_frame(data)
+        await self.output.drain()
+
+    async def _write_chunks(self, data: bytes, chunk_size: int) -> None:
+        view = memoryview(data)
+
+        for start in range(0, len(data), chunk_size):
+            chunk = bytes(view[start:start + chunk_size])
+            if self.compression:
+                chunk = self.compression.compress(chunk)
+
+            self.framing.write_chunk(self.output, chunk, more=start + chunk_size < len(data))
+            await self.output.drain()
+
+    async def _read_message(self) -> bytes:
+        data = await self.framing.read(self.reader)
+
+        if self.compression:
+            return self.compression.decompress(data)
+
+        return data
+
+    async def _read_frame(self) -> bytes:
+        # Control frames are not answers to any request
+        while True:
+            data = await self._read_message()
+
+            if data == drain_notice(self.codec):
+                self.logger.info(f'Server {self.address} is shutting down')
+                self.is_draining = True
+            elif data == ping_frame(self.codec):
+                # Frames of request being written prove the same to server, and pong must not split its chunks
+                if not self.lock.locked():
+                    self._write_frame(pong_frame(self.codec))
+            else:
+                return data
+
+    def _load_response(
+        self,
+        data: bytes,
+        response_class: type[Response],
+    ) -> Response:
+        success, _, _ = self.codec.find_stream_marker(data)
+        if not success:
+            return ErrorResponse.from_bytes(data, codec=self.codec)
+
+        return response_class.from_bytes(data, codec=self.codec)
+
+    @staticmethod
+    def _is_last_frame(success: bool, sequence: int | None, end_of_stream: bool) -> bool:  # noqa: FBT001
+        # Response without sequence number is sent by non-streaming method or on invalid request
+        return not success or sequence is None or end_of_stream
+
+    async def _exchange(
+        self,
+        data: bytes,
+        trace_id: str,
+        deadline: float | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Sends encoded request and yields encoded responses, until the last frame of stream.
+
+        Without pipelining connection is locked until the whole stream is read,
+        if iteration is stopped earlier, rest of the stream is skipped.
+        Pipelined request raises TimeoutError, when its frames don`t come until `deadline`.
+        """
+        if self.is_draining:
+            raise ClientFatalError(details={'connection': 'server is shutting down, reconnect is required'})
+
+        if self.read_task is None:
+            async with self.lock:
+                await self._write_message(data)
+
+                is_last = False
+                try:
+                    while not is_last:
+                        frame = await self._read_frame()
+                        is_last = self._is_last_frame(*self.codec.find_stream_marker(frame))
+                        yield frame
+                except asyncio.CancelledError:
+                    # Response may still come, so connection can`t be reused
+                    is_last = True
+                    self.is_connected = False
+                    self.output.close()
+                    raise
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # E.g. idle connection closed by server, next connect() opens a new one
+                    is_last = True
+                    self.is_connected = False
+                    raise
+                finally:
+                    while not is_last:
+                        is_last = self._is_last_frame(*self.codec.find_stream_marker(await self._read_frame()))
+            return
+
+        # Deadline is unix timestamp, while asyncio timeouts are measured by loop clock
+        loop_deadline = None if deadline is None else asyncio.get_running_loop().time() + deadline - time.time()
+
+        async with self.in_flight:
+            queue = self.pending[trace_id] = asyncio.Queue()
+            self.idle.clear()
+
+            try:
+                # Chunks of different requests must not interleave
+                async with self.lock:
+                    await self._write_message(data)
+
+                is_last = False
+                while not is_last:
+                    # Lost or dropped request must not hold its place in pipeline forever
+                    async with asyncio.timeout_at(loop_deadline):
+                        received = await queue.get()
+                    if received is None:
+                        raise ClientFatalError(details={'connection': 'closed by server'})
+
+                    is_last = self._is_last_frame(*self.codec.find_stream_marker(received))
+                    yield received
+            finally:
+                self.pending.pop(trace_id, None)
+                if not self.pending:
+                    self.idle.set()
+
+    def _set_deadline(self, request: Request) -> None:
+        # Deadline propagated from incoming request is kept, if it is earlier
+        deadline = time.time() + self.timeout_ms / 1000
+        if request.headers.deadline is None or request.headers.deadline > deadline:
+            request.headers.deadline = deadline
+
+    async def send(
+        self,
+        request: Request,
+        response_class: type[Response] = Response,
+    ) -> Response:
+        """
+        Server stops handling request, which is not done within `timeout_ms`, and returns DeadlineExceeded error.
+
+        Within `batch` context request is sent in batch envelope along with concurrent ones.
+        """
+        if (batch := current_batch.get()) is not None and batch.client is self:
+            return await batch.send(request, response_class)
+
+        return await self._send(request, response_class)
+
+    async def _send(
+        self,
+        request: Request,
+        response_class: type[Response],
+    ) -> Response:
+        request.trace_id = request.headers.trace_id = str(uuid4())
+        self._set_deadline(request)
+
+        try:
+            async with aclosing(
+                self._exchange(request.dump(self.codec), request.trace_id, request.headers.deadline),
+            ) as frames:
+                data = await anext(frames)
         except (
             ConnectionRefusedError,
-            LimitOverrunError,
+            MaxMessageSizeReceivedError,
         ) as error:
             raise ClientFatalError.from_base_exception(error) from error
+        except TimeoutError:
+            # Server drops expired request too, its late response is skipped as one with unknown trace_id
+            return response_from_error(DeadlineExceededError(request.headers.deadline), request)
+
+        return self._load_response(data, response_class)
+
+    async def send_batch(
+        self,
+        requests: list[tuple[Request, type[Response]]],
+        *,
+        sequential: bool = False,
+        max_concurrency: int | None = None,
+    ) -> list[Response]:
+        """
+        Sends requests in one envelope and returns their responses in the same order, see `batch`.
+
+        Failed request gets its own error response, error of the whole envelope is returned for every request.
+        """
+        for request, _ in requests:
+            request.trace_id = request.headers.trace_id = str(uuid4())
+            self._set_deadline(request)
+
+        response = await self._send(
+            request=BatchRequest(
+                method_name=BATCH_METHOD,
+                payload={
+                    'requests': [request.dump(self.codec) for request, _ in requests],
+                    'sequential': sequential,
+                    'max_concurrency': max_concurrency,
+                },
+            ),
+            response_class=BatchResponse,
+        )
+        if not response.success:
+            # E.g. envelope is above max message size of server
+            return [response] * len(requests)
+
+        responses = response.payload.responses  # type:ignore[attr-defined]
+        if len(responses) != len(requests):
+            raise ClientFatalError(details={'batch': f'{len(responses)} responses to {len(requests)} requests'})
 
-        self.locking_event.clear()
+        return [
+            self._load_response(data, response_class)
+            for data, (_, response_class) in zip(responses, requests, strict=True)
+        ]
 
-        return Response.load(data[:-1])
+    @asynccontextmanager
+    async def batch(
+        self,
+        *,
+        sequential: bool = False,
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[Batch]:
+        """
+        Requests sent concurrently within the context go to server in one envelope, one round trip for all of them.
+
+            async with client.batch():
+                todo_list, task = await asyncio.gather(client.get_todo_list(...), client.create_task(...))
+
+        Server handles them concurrently, at most `max_concurrency` at once, or one by one in order, if `sequential`.
+        Streams can`t be batched.
+        """
+        batch = Batch(self, sequential=sequential, max_concurrency=max_concurrency)
+        token = current_batch.set(batch)
+        try:
+            yield batch
+        finally:
+            current_batch.reset(token)
+
+    async def subscribe(
+        self,
+        *topics: str,
+        max_queue: int = 2**10,  # 1024
+    ) -> AsyncGenerator[PushMessage, None]:
+        """
+        Subscribes to topics and yields messages published to them, until iteration is stopped.
+
+            async for message in client.subscribe('todo_list:1'):
+                ...
+
+        Pushes are read in background, so client must be pipelined with max_in_flight above 1.
+        Up to `max_queue` messages are kept, while they are not consumed, then oldest ones are dropped.
+        Subscription is lost on disconnect, iteration raises ClientFatalError then.
+        """
+        if self.max_in_flight <= 1:
+            raise ClientFatalError(details={'subscribe': 'requires max_in_flight above 1'})
+
+        topics = tuple(dict.fromkeys(topics))
+        queue: asyncio.Queue[PushMessage | None] = asyncio.Queue(max_queue)
+        for topic in topics:
+            self.subscriptions.setdefault(topic, set()).add(queue)
+
+        try:
+            await self._update_subscription(SUBSCRIBE_METHOD, topics)
+
+            while (message := await queue.get()) is not None:
+                yield message
+
+            raise ClientFatalError(details={'connection': 'closed by server'})
+        finally:
+            unsubscribed = []
+            for topic in topics:
+                queues = self.subscriptions.get(topic, set())
+                queues.discard(queue)
+                if not queues:
+                    self.subscriptions.pop(topic, None)
+                    unsubscribed.append(topic)
+
+            if unsubscribed and self.is_connected and not self.is_draining:
+                await self._update_subscription(UNSUBSCRIBE_METHOD, unsubscribed)
+
+    async def _update_subscription(self, method_name: str, topics: Iterable[str]) -> None:
+        response = await self._send(
+            request=SubscribeRequest(
+                method_name=method_name,
+                payload={'topics': list(topics)},
+            ),
+            response_class=SubscribeResponse,
+        )
+        if not response.success:
+            raise ClientFatalError(details=response.payload.model_dump())
+
+    async def stream(
+        self,
+        request: Request,
+        response_class: type[Response] = Response,
+    ) -> AsyncIterator[Response]:
+        """
+        Sends request to streaming method and yields its responses one by one.
+
+        Iteration stops after `end` frame, error response is yielded as last one.
+        Stream is not limited by `timeout_ms`, deadline may be set in request headers explicitly.
+        """
+        request.trace_id = request.headers.trace_id = str(uuid4())
+
+        try:
+            async with aclosing(
+                self._exchange(request.dump(self.codec), request.trace_id, request.headers.deadline),
+            ) as frames:
+                async for data in frames:
+                    success, _, end_of_stream = self.codec.find_stream_marker(data)
+
+                    if not success:
+                        yield ErrorResponse.from_bytes(data, codec=self.codec)
+                    elif not end_of_stream:
+                        yield response_class.from_bytes(data, codec=self.codec)
+        except (
+            ConnectionRefusedError,
+            MaxMessageSizeReceivedError,
+        ) as error:
+            raise ClientFatalError.from_base_exception(error) from error
+        except TimeoutError:
+            yield response_from_error(DeadlineExceededError(request.headers.deadline), request)
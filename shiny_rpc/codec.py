@@ -0,0 +1,709 @@
+import struct
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from datetime import (
+    UTC,
+    date,
+    datetime,
+    timedelta,
+    timezone,
+)
+from enum import Enum, IntEnum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    TypeVar,
+)
+from uuid import UUID
+
+import orjson
+from pydantic import ValidationError as PydanticValidationError
+from pydantic_core import SchemaSerializer
+
+from shiny_rpc.errors import (
+    InvalidMessageFormatError,
+    UnknownCodecError,
+    ValidationError,
+)
+from shiny_rpc.parser import (
+    Buffer,
+    find_header_value,
+    find_method_name,
+    parse_request,
+    parse_response,
+    parse_stream_marker,
+)
+from shiny_rpc.schema import (
+    BaseHeadersSchema,
+    BasePayloadSchema,
+    BaseSchema,
+)
+
+if TYPE_CHECKING:
+    from shiny_rpc.messages import Request, Response
+
+SchemaT = TypeVar('SchemaT', bound=BaseSchema)
+RequestT = TypeVar('RequestT', bound='Request')
+ResponseT = TypeVar('ResponseT', bound='Response')
+
+
+class RawPayload:
+
+    """Encoded payload slice of lazy request, decoded and validated on demand."""
+
+    data: bytes | memoryview
+    codec: 'BaseCodec'
+
+    def __init__(
+        self,
+        data: bytes | memoryview,
+        codec: 'BaseCodec',
+    ) -> None:
+        self.data = data
+        self.codec = codec
+
+    @property
+    def view(self) -> memoryview:
+        # Slice of source buffer, e.g. of spilled upload mapping, so nothing is copied
+        return memoryview(self.data)
+
+    def load(self, schema: type[SchemaT]) -> SchemaT:
+        return self.codec.load_payload(schema, self.data)
+
+
+class BaseCodec(ABC):
+    name: str
+    # Encoded messages may contain any byte, including MESSAGE_SEPARATOR
+    requires_length_prefix: bool
+
+    @abstractmethod
+    def find_method_name(self, data: Buffer) -> str:
+        ...
+
+    @abstractmethod
+    def find_stream_marker(self, data: bytes | memoryview) -> tuple[bool, int | None, bool]:
+        """Returns success, sequence number and end-of-stream flag of encoded response without decoding it."""
+
+    @abstractmethod
+    def find_headers(self, schema: type[SchemaT], data: Buffer, *, is_response: bool = False) -> SchemaT:
+        """Decodes only headers of encoded message, used to route messages without decoding payload."""
+
+    @abstractmethod
+    def find_raw_header(self, data: Buffer, name: str) -> Any:  # noqa:ANN401
+        """Decodes one header of encoded request without validation, for hot paths, which need only it."""
+
+    def find_trace_id(self, data: Buffer, *, is_response: bool = False) -> str | None:
+        return self.find_headers(BaseHeadersSchema, data, is_response=is_response).trace_id
+
+    @abstractmethod
+    def dump_request(self, request: 'Request') -> bytes:
+        ...
+
+    @abstractmethod
+    def dump_response(self, response: 'Response') -> bytes:
+        ...
+
+    @abstractmethod
+    def load_payload(self, schema: type[SchemaT], data: bytes | memoryview) -> SchemaT:
+        ...
+
+    @abstractmethod
+    def load_request(
+        self,
+        request_class: type[RequestT],
+        data: Buffer,
+        *,
+        lazy_payload: bool | None = None,
+    ) -> RequestT:
+        """Keeps payload encoded, if `lazy_payload` is set, or if it is not passed and request class defers it."""
+
+    @abstractmethod
+    def load_response(self, response_class: type[ResponseT], data: bytes | memoryview) -> ResponseT:
+        ...
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def _to_json(serializer: SchemaSerializer, schema: type[BaseSchema], value: BaseSchema) -> bytes:
+    if value.__class__ is schema:
+        return serializer.to_json(value)
+
+    return value.__pydantic_serializer__.to_json(value)
+
+
+class JsonCodec(BaseCodec):
+
+    """Text format: `method_name[:ok|:err|:end[@sequence]]{payload}{headers}`."""
+
+    name = 'json'
+    requires_length_prefix = False
+
+    def find_method_name(self, data: Buffer) -> str:
+        return find_method_name(data)
+
+    def find_stream_marker(self, data: bytes | memoryview) -> tuple[bool, int | None, bool]:
+        buffer = data if isinstance(data, bytes) else bytes(data)
+
+        payload_start = buffer.find(b'{')
+        marker_start = buffer.find(b':', 0, payload_start)
+        if payload_start == -1 or marker_start == -1:
+            raise InvalidMessageFormatError
+
+        return parse_stream_marker(buffer[marker_start + 1:payload_start])
+
+    def find_headers(self, schema: type[SchemaT], data: Buffer, *, is_response: bool = False) -> SchemaT:
+        message = parse_response(data) if is_response else parse_request(data)
+
+        return self.load_payload(schema, message.headers)
+
+    def find_raw_header(self, data: Buffer, name: str) -> Any:  # noqa:ANN401
+        if (value := find_header_value(data, name)) is None:
+            return None
+
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError as error:
+            raise ValidationError.from_base_exception(error) from error
+
+    def dump_request(self, request: 'Request') -> bytes:
+        return b''.join((
+            request.method_name_prefix(request.method_name),
+            _to_json(request.payload_serializer, request.PayloadSchema, request.payload),
+            _to_json(request.headers_serializer, request.HeadersSchema, request.headers),
+        ))
+
+    def dump_response(self, response: 'Response') -> bytes:
+        prefix = (
+            response.method_name_prefix(response.method_name, success=response.success)
+            if response.sequence is None
+            else f'{response.method_name}:{response.status}@{response.sequence}'.encode()
+        )
+
+        return b''.join((
+            prefix,
+            _to_json(response.payload_serializer, response.PayloadSchema, response.payload),
+            _to_json(response.headers_serializer, response.HeadersSchema, response.headers),
+        ))
+
+    def load_payload(self, schema: type[SchemaT], data: bytes | memoryview) -> SchemaT:
+        # JSON validator takes only bytes, so slice of message is copied, it costs far less than validation itself.
+        # Handlers, which need encoded payload of spilled upload as is, read `request.raw_payload` without a copy
+        raw = data if isinstance(data, bytes) else bytes(data)
+
+        try:
+            return schema.__pydantic_validator__.validate_json(raw)
+        except PydanticValidationError as error:
+            raise ValidationError.from_base_exception(error) from error
+
+    def load_request(
+        self,
+        request_class: type[RequestT],
+        data: Buffer,
+        *,
+        lazy_payload: bool | None = None,
+    ) -> RequestT:
+        message = parse_request(data)
+
+        if lazy_payload is None:
+            lazy_payload = request_class.defers_payload(message.buffer)
+
+        # Headers go first, so request with invalid ones costs no payload validation
+        headers = self.load_payload(request_class.HeadersSchema, message.headers)
+        payload: BasePayloadSchema | RawPayload = (
+            RawPayload(message.payload, self)
+            if lazy_payload
+            else self.load_payload(request_class.PayloadSchema, message.payload)
+        )
+
+        return request_class(
+            method_name=message.method_name,
+            payload=payload,
+            headers=headers,
+            trace_id=headers.trace_id,
+        )
+
+    def load_response(self, response_class: type[ResponseT], data: bytes | memoryview) -> ResponseT:
+        message = parse_response(data)
+
+        payload = self.load_payload(response_class.PayloadSchema, message.payload)
+        headers = self.load_payload(response_class.HeadersSchema, message.headers)
+
+        if not headers.trace_id:
+            raise InvalidMessageFormatError
+
+        return response_class(
+            method_name=message.method_name,
+            trace_id=headers.trace_id,
+            success=bool(message.success),
+            payload=payload,
+            headers=headers,
+            sequence=message.sequence,
+            end_of_stream=message.end_of_stream,
+        )
+
+
+class Tag(IntEnum):
+    NULL = 0x00
+    FALSE = 0x01
+    TRUE = 0x02
+    INT = 0x03
+    BIG_INT = 0x04
+    FLOAT = 0x05
+    STRING = 0x06
+    DATE = 0x07
+    DATETIME = 0x08
+    UUID = 0x09
+    ENUM = 0x0A
+    LIST = 0x0B
+    OBJECT = 0x0C
+    BYTES = 0x0D
+    SHORT_STRING = 0x0E
+    SHORT_INT = 0x0F
+
+
+LENGTH = struct.Struct('!I')
+SHORT_LENGTH = struct.Struct('!B')
+INT = struct.Struct('!q')
+SHORT_INT = struct.Struct('!i')
+FLOAT = struct.Struct('!d')
+DATE = struct.Struct('!i')
+DATETIME = struct.Struct('!qi')
+
+INT_MIN = -(2**63)
+INT_MAX = 2**63 - 1
+SHORT_INT_MIN = -(2**31)
+SHORT_INT_MAX = 2**31 - 1
+SHORT_LENGTH_MAX = 2**8 - 1
+
+RESPONSE_SUCCESS_FLAG = 0b001
+RESPONSE_SEQUENCE_FLAG = 0b010
+RESPONSE_END_OF_STREAM_FLAG = 0b100
+NAIVE_DATETIME_OFFSET = -(2**31)
+EPOCH = datetime(1970, 1, 1)  # noqa:DTZ001
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=UTC)
+UUID_SIZE = 16
+
+
+def _encode_sized(tag: int, raw: bytes, buffer: bytearray) -> None:
+    buffer.append(tag)
+    buffer += LENGTH.pack(len(raw))
+    buffer += raw
+
+
+def _encode_string(value: str, buffer: bytearray) -> None:
+    raw = value.encode('utf-8')
+    if len(raw) > SHORT_LENGTH_MAX:
+        _encode_sized(Tag.STRING, raw, buffer)
+        return
+
+    buffer.append(Tag.SHORT_STRING)
+    buffer.append(len(raw))
+    buffer += raw
+
+
+def _encode_int(value: int, buffer: bytearray) -> None:
+    if SHORT_INT_MIN <= value <= SHORT_INT_MAX:
+        buffer.append(Tag.SHORT_INT)
+        buffer += SHORT_INT.pack(value)
+        return
+
+    if INT_MIN <= value <= INT_MAX:
+        buffer.append(Tag.INT)
+        buffer += INT.pack(value)
+        return
+
+    _encode_sized(Tag.BIG_INT, str(value).encode('ascii'), buffer)
+
+
+def _encode_datetime(value: datetime, buffer: bytearray) -> None:
+    buffer.append(Tag.DATETIME)
+
+    offset = value.utcoffset()
+    if offset is None:
+        delta = value - EPOCH
+        offset_seconds = NAIVE_DATETIME_OFFSET
+    else:
+        delta = value - EPOCH_UTC
+        offset_seconds = int(offset.total_seconds())
+
+    microseconds = (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+    buffer += DATETIME.pack(microseconds, offset_seconds)
+
+
+def _encode_list(value: list[Any] | tuple[Any, ...] | set[Any], buffer: bytearray) -> None:
+    buffer.append(Tag.LIST)
+    buffer += LENGTH.pack(len(value))
+
+    for element in value:
+        _encode_value(element, buffer)
+
+
+def _encode_object(value: dict[str, Any], buffer: bytearray) -> None:
+    buffer.append(Tag.OBJECT)
+    buffer += LENGTH.pack(len(value))
+
+    for key, element in value.items():
+        raw_key = str(key).encode('utf-8')
+        if len(raw_key) > SHORT_LENGTH_MAX:
+            raise ValidationError(
+                details={
+                    'too_long_key': key,
+                },
+            )
+
+        buffer.append(len(raw_key))
+        buffer += raw_key
+        _encode_value(element, buffer)
+
+
+ENCODERS: dict[type, Callable[[Any, bytearray], None]] = {
+    type(None): lambda _, buffer: buffer.append(Tag.NULL),
+    bool: lambda value, buffer: buffer.append(Tag.TRUE if value else Tag.FALSE),
+    int: _encode_int,
+    float: lambda value, buffer: buffer.extend((Tag.FLOAT, *FLOAT.pack(value))),
+    str: _encode_string,
+    bytes: lambda value, buffer: _encode_sized(Tag.BYTES, value, buffer),
+    # datetime goes first, isinstance fallback must not take it for date
+    datetime: _encode_datetime,
+    date: lambda value, buffer: buffer.extend((Tag.DATE, *DATE.pack(value.toordinal()))),
+    UUID: lambda value, buffer: buffer.extend((Tag.UUID, *value.bytes)),
+    list: _encode_list,
+    tuple: _encode_list,
+    set: _encode_list,
+    frozenset: _encode_list,
+    dict: _encode_object,
+}
+
+
+def _encode_value(value: Any, buffer: bytearray) -> None:  # noqa:ANN401
+    encoder = ENCODERS.get(value.__class__)
+    if encoder is not None:
+        encoder(value, buffer)
+        return
+
+    if isinstance(value, Enum):
+        buffer.append(Tag.ENUM)
+        _encode_value(value.value, buffer)
+        return
+
+    for value_type, encoder in ENCODERS.items():
+        if isinstance(value, value_type):
+            encoder(value, buffer)
+            return
+
+    raise ValidationError(
+        details={
+            'unsupported_type': value.__class__.__name__,
+        },
+    )
+
+
+def _decode_value(data: bytes | memoryview, offset: int) -> tuple[Any, int]:  # noqa:PLR0911,PLR0915
+    tag = data[offset]
+    offset += 1
+
+    match tag:
+        case Tag.NULL:
+            return None, offset
+        case Tag.FALSE:
+            return False, offset
+        case Tag.TRUE:
+            return True, offset
+        case Tag.SHORT_INT:
+            return SHORT_INT.unpack_from(data, offset)[0], offset + SHORT_INT.size
+        case Tag.INT:
+            return INT.unpack_from(data, offset)[0], offset + INT.size
+        case Tag.FLOAT:
+            return FLOAT.unpack_from(data, offset)[0], offset + FLOAT.size
+        case Tag.SHORT_STRING:
+            start = offset + SHORT_LENGTH.size
+            end = start + data[offset]
+            if end > len(data):
+                raise InvalidMessageFormatError
+            return str(data[start:end], 'utf-8'), end
+        case Tag.BIG_INT | Tag.STRING | Tag.BYTES:
+            (length,) = LENGTH.unpack_from(data, offset)
+            start = offset + LENGTH.size
+            end = start + length
+            if end > len(data):
+                raise InvalidMessageFormatError
+
+            if tag == Tag.BYTES:
+                return bytes(data[start:end]), end
+            if tag == Tag.STRING:
+                return str(data[start:end], 'utf-8'), end
+            return int(str(data[start:end], 'ascii')), end
+        case Tag.DATE:
+            return date.fromordinal(DATE.unpack_from(data, offset)[0]), offset + DATE.size
+        case Tag.DATETIME:
+            microseconds, offset_seconds = DATETIME.unpack_from(data, offset)
+            delta = timedelta(microseconds=microseconds)
+
+            if offset_seconds == NAIVE_DATETIME_OFFSET:
+                return EPOCH + delta, offset + DATETIME.size
+
+            value = (EPOCH_UTC + delta).astimezone(timezone(timedelta(seconds=offset_seconds)))
+            return value, offset + DATETIME.size
+        case Tag.UUID:
+            end = offset + UUID_SIZE
+            if end > len(data):
+                raise InvalidMessageFormatError
+            return UUID(bytes=bytes(data[offset:end])), end
+        case Tag.ENUM:
+            return _decode_value(data, offset)
+        case Tag.LIST:
+            (count,) = LENGTH.unpack_from(data, offset)
+            offset += LENGTH.size
+            # Every element takes at least its tag, so forged count can`t make decoder loop for long
+            if count > len(data) - offset:
+                raise InvalidMessageFormatError
+
+            elements = []
+            for _ in range(count):
+                element, offset = _decode_value(data, offset)
+                elements.append(element)
+            return elements, offset
+        case Tag.OBJECT:
+            (count,) = LENGTH.unpack_from(data, offset)
+            offset += LENGTH.size
+            if count > len(data) - offset:
+                raise InvalidMessageFormatError
+
+            elements_by_key = {}
+            for _ in range(count):
+                key_start = offset + SHORT_LENGTH.size
+                key_length = data[offset]
+                offset = key_start + key_length
+                if offset > len(data):
+                    raise InvalidMessageFormatError
+
+                element, offset = _decode_value(data, offset)
+                elements_by_key[str(data[key_start:key_start + key_length], 'utf-8')] = element
+            return elements_by_key, offset
+
+    raise InvalidMessageFormatError
+
+
+def _decode_object(data: bytes | memoryview) -> dict[str, Any]:
+    try:
+        if data[0] != Tag.OBJECT:
+            raise InvalidMessageFormatError
+
+        value, offset = _decode_value(data, 0)
+    except (struct.error, IndexError, ValueError, OverflowError, RecursionError) as error:
+        raise InvalidMessageFormatError from error
+
+    if offset != len(data):
+        raise InvalidMessageFormatError
+
+    return value
+
+
+class BinaryCodec(BaseCodec):
+
+    """
+    Compact struct-based tag-length-value format, stdlib only.
+
+    `name_length:u8 name [flags:u8 [sequence:u32]] payload_length:u32 payload headers`
+
+    Response flags are success, sequence presence and end-of-stream bits.
+    Payload and headers are TLV objects, dates, datetimes, UUIDs and enums
+    are sent as fixed-size binary values instead of JSON strings.
+    """
+
+    name = 'binary'
+    requires_length_prefix = True
+
+    @staticmethod
+    def _read_method_name(data: Buffer) -> tuple[str, int]:
+        try:
+            (length,) = SHORT_LENGTH.unpack_from(data, 0)
+            end = SHORT_LENGTH.size + length
+            if not length or end > len(data):
+                raise InvalidMessageFormatError
+
+            return str(data[SHORT_LENGTH.size:end], 'utf-8'), end
+        except (struct.error, UnicodeDecodeError) as error:
+            raise InvalidMessageFormatError from error
+
+    @staticmethod
+    def _write_method_name(method_name: str, buffer: bytearray) -> None:
+        raw_method_name = method_name.encode('utf-8')
+        if len(raw_method_name) > SHORT_LENGTH_MAX:
+            raise InvalidMessageFormatError
+
+        buffer.append(len(raw_method_name))
+        buffer += raw_method_name
+
+    @staticmethod
+    def _write_body(payload: BaseSchema, headers: BaseSchema, buffer: bytearray) -> bytes:
+        payload_length_at = len(buffer)
+        buffer += LENGTH.pack(0)
+
+        _encode_value(payload.__pydantic_serializer__.to_python(payload), buffer)
+        LENGTH.pack_into(buffer, payload_length_at, len(buffer) - payload_length_at - LENGTH.size)
+
+        _encode_value(headers.__pydantic_serializer__.to_python(headers), buffer)
+
+        return bytes(buffer)
+
+    @staticmethod
+    def _split_body(data: Buffer, offset: int) -> tuple[memoryview, memoryview]:
+        try:
+            (payload_length,) = LENGTH.unpack_from(data, offset)
+        except struct.error as error:
+            raise InvalidMessageFormatError from error
+
+        payload_start = offset + LENGTH.size
+        headers_start = payload_start + payload_length
+        if headers_start >= len(data):
+            raise InvalidMessageFormatError
+
+        # Slices of source buffer, e.g. of spilled upload mapping, so nothing is copied
+        view = memoryview(data)
+        return view[payload_start:headers_start], view[headers_start:]
+
+    @staticmethod
+    def _read_flags(data: Buffer, offset: int) -> tuple[bool, int | None, bool, int]:
+        if offset >= len(data):
+            raise InvalidMessageFormatError
+
+        flags = data[offset]
+        offset += 1
+        sequence = None
+
+        if flags & RESPONSE_SEQUENCE_FLAG:
+            try:
+                (sequence,) = LENGTH.unpack_from(data, offset)
+            except struct.error as error:
+                raise InvalidMessageFormatError from error
+            offset += LENGTH.size
+
+        return (
+            bool(flags & RESPONSE_SUCCESS_FLAG),
+            sequence,
+            bool(flags & RESPONSE_END_OF_STREAM_FLAG),
+            offset,
+        )
+
+    def _find_raw_headers(self, data: Buffer, *, is_response: bool) -> memoryview:
+        _, offset = self._read_method_name(data)
+        if is_response:
+            *_, offset = self._read_flags(data, offset)
+
+        return self._split_body(data, offset)[1]
+
+    def find_method_name(self, data: Buffer) -> str:
+        return self._read_method_name(data)[0]
+
+    def find_stream_marker(self, data: bytes | memoryview) -> tuple[bool, int | None, bool]:
+        _, offset = self._read_method_name(data)
+        success, sequence, end_of_stream, _ = self._read_flags(data, offset)
+        return success, sequence, end_of_stream
+
+    def find_headers(self, schema: type[SchemaT], data: Buffer, *, is_response: bool = False) -> SchemaT:
+        return self.load_payload(schema, self._find_raw_headers(data, is_response=is_response))
+
+    def find_raw_header(self, data: Buffer, name: str) -> Any:  # noqa:ANN401
+        # Headers are found by payload length, so payload is neither scanned nor decoded
+        return _decode_object(self._find_raw_headers(data, is_response=False)).get(name)
+
+    def dump_request(self, request: 'Request') -> bytes:
+        buffer = bytearray()
+        self._write_method_name(request.method_name, buffer)
+
+        return self._write_body(request.payload, request.headers, buffer)
+
+    def dump_response(self, response: 'Response') -> bytes:
+        buffer = bytearray()
+        self._write_method_name(response.method_name, buffer)
+
+        if response.sequence is None:
+            buffer.append(response.success)
+        else:
+            buffer.append(
+                response.success * RESPONSE_SUCCESS_FLAG
+                | RESPONSE_SEQUENCE_FLAG
+                | response.end_of_stream * RESPONSE_END_OF_STREAM_FLAG,
+            )
+            buffer += LENGTH.pack(response.sequence)
+
+        return self._write_body(response.payload, response.headers, buffer)
+
+    def load_payload(self, schema: type[SchemaT], data: bytes | memoryview) -> SchemaT:
+        try:
+            return schema.model_validate(_decode_object(data))
+        except PydanticValidationError as error:
+            raise ValidationError.from_base_exception(error) from error
+
+    def load_request(
+        self,
+        request_class: type[RequestT],
+        data: Buffer,
+        *,
+        lazy_payload: bool | None = None,
+    ) -> RequestT:
+        method_name, offset = self._read_method_name(data)
+        raw_payload, raw_headers = self._split_body(data, offset)
+
+        if lazy_payload is None:
+            lazy_payload = request_class.defers_payload(data)
+
+        # Headers go first, so request with invalid ones costs no payload validation
+        headers = self.load_payload(request_class.HeadersSchema, raw_headers)
+        payload: BasePayloadSchema | RawPayload = (
+            RawPayload(raw_payload, self)
+            if lazy_payload
+            else self.load_payload(request_class.PayloadSchema, raw_payload)
+        )
+
+        return request_class(
+            method_name=method_name,
+            payload=payload,
+            headers=headers,
+            trace_id=headers.trace_id,
+        )
+
+    def load_response(self, response_class: type[ResponseT], data: bytes | memoryview) -> ResponseT:
+        method_name, offset = self._read_method_name(data)
+        success, sequence, end_of_stream, offset = self._read_flags(data, offset)
+        raw_payload, raw_headers = self._split_body(data, offset)
+
+        payload = self.load_payload(response_class.PayloadSchema, raw_payload)
+        headers = self.load_payload(response_class.HeadersSchema, raw_headers)
+
+        if not headers.trace_id:
+            raise InvalidMessageFormatError
+
+        return response_class(
+            method_name=method_name,
+            trace_id=headers.trace_id,
+            success=success,
+            payload=payload,
+            headers=headers,
+            sequence=sequence,
+            end_of_stream=end_of_stream,
+        )
+
+
+# Annotated explicitly, type of variable imported through import cycle can`t be inferred
+JSON_CODEC: BaseCodec = JsonCodec()
+BINARY_CODEC: BaseCodec = BinaryCodec()
+
+CODECS: dict[str, BaseCodec] = {}
+
+
+def register_codec(codec: BaseCodec) -> None:
+    CODECS[codec.name] = codec
+
+
+def get_codec(name: str) -> BaseCodec:
+    if name not in CODECS:
+        raise UnknownCodecError(name)
+
+    return CODECS[name]
+
+
+register_codec(JSON_CODEC)
+register_codec(BINARY_CODEC)
@@ -0,0 +1,105 @@
+import zlib
+
+from shiny_rpc.errors import InvalidMessageFormatError, MaxMessageSizeReceivedError
+
+# Method name can`t be empty, so no encoded message starts with zero byte
+COMPRESSED_MARKER = b'\x00'
+ZLIB = 'zlib'
+
+
+class Compression:
+
+    """
+    Per-frame zlib compression, applied only to messages above `threshold` bytes.
+
+    Compressed frames are prefixed with COMPRESSED_MARKER, all other frames are sent as is.
+    Optional preset dictionary (see `make_compression_dictionary`) must be the same on both sides,
+    so its checksum is a part of compression name used in handshake.
+    """
+
+    name: str
+    threshold: int
+    level: int
+    max_message_size: int
+    dictionary: bytes | None
+
+    def __init__(
+        self,
+        max_message_size: int,
+        *,
+        threshold: int = 2**10,  # 1 KB
+        level: int = 6,
+        dictionary: bytes | None = None,
+    ) -> None:
+        self.max_message_size = max_message_size
+        self.threshold = threshold
+        self.level = level
+        self.dictionary = dictionary or None
+        self.name = (
+            f'{ZLIB}:{zlib.crc32(self.dictionary):08x}'
+            if self.dictionary
+            else ZLIB
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        if len(data) < self.threshold:
+            return data
+
+        compressor = (
+            zlib.compressobj(self.level, zdict=self.dictionary)
+            if self.dictionary
+            else zlib.compressobj(self.level)
+        )
+        compressed = b''.join((
+            COMPRESSED_MARKER,
+            compressor.compress(data),
+            compressor.flush(),
+        ))
+
+        return compressed if len(compressed) < len(data) else data
+
+    def decompress(self, data: bytes) -> bytes:
+        if not data.startswith(COMPRESSED_MARKER):
+            return data
+
+        decompressor = (
+            zlib.decompressobj(zdict=self.dictionary)
+            if self.dictionary
+            else zlib.decompressobj()
+        )
+
+        try:
+            decompressed = decompressor.decompress(memoryview(data)[1:], self.max_message_size)
+        except zlib.error as error:
+            raise InvalidMessageFormatError from error
+
+        if decompressor.unconsumed_tail:
+            raise MaxMessageSizeReceivedError(
+                max_message_size=self.max_message_size,
+            )
+
+        if not decompressor.eof:
+            raise InvalidMessageFormatError
+
+        return decompressed
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def make_compression_dictionary(
+    *,
+    field_names: list[str],
+    values: list[str],
+) -> bytes:
+    """
+    Builds zlib preset dictionary from JSON fragments which are repeated in every message.
+
+    zlib prefers matches closer to the end of dictionary, so field names go last.
+    """
+    fragments = [
+        *(f'"{value}"' for value in dict.fromkeys(values)),
+        *(f'"{name}":' for name in dict.fromkeys(field_names)),
+    ]
+
+    return ''.join(fragments).encode('utf-8')
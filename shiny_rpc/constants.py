@@ -2,3 +2,13 @@ from uuid import UUID
 
 MESSAGE_SEPARATOR = b'\x1a'
 ZERO_TRACE_ID = str(UUID(int=0))
+HANDSHAKE_METHOD = '__handshake'
+DRAIN_METHOD = '__drain'
+PING_METHOD = '__ping'
+PONG_METHOD = '__pong'
+BATCH_METHOD = '__batch'
+SUBSCRIBE_METHOD = '__subscribe'
+UNSUBSCRIBE_METHOD = '__unsubscribe'
+PUSH_METHOD = '__push'
+# Push frames are not answers to any request, clients tell them from responses by this trace_id
+PUSH_TRACE_ID = str(UUID(int=1))
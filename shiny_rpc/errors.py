@@ -156,6 +156,17 @@ class UnknownMethodError(ExternalError):
         )
 
 
+class UnknownCodecError(ExternalError):
+    def __init__(
+        self,
+        codec_name: str,
+    ) -> None:
+        super().__init__(
+            error_code='UnknownCodec',
+            details={'codec': codec_name},
+        )
+
+
 class MethodInternalError(ExternalError):
     def __init__(
         self,
@@ -167,6 +178,96 @@ class MethodInternalError(ExternalError):
         )
 
 
+class ConnectionLimitError(ExternalError):
+    def __init__(
+        self,
+        connection_limit: int,
+    ) -> None:
+        super().__init__(
+            error_code='ConnectionLimit',
+            details={'connection_limit': connection_limit},
+        )
+
+
+class DeadlineExceededError(ExternalError):
+    def __init__(
+        self,
+        deadline: float | None,
+    ) -> None:
+        super().__init__(
+            error_code='DeadlineExceeded',
+            details={'deadline': deadline},
+        )
+
+
+class ServerShuttingDownError(ExternalError):
+    def __init__(self) -> None:
+        super().__init__(
+            error_code='ServerShuttingDown',
+            details={
+                # Request was not started, so it is safe to send it again on new connection
+                'retryable': True,
+            },
+        )
+
+
+class MethodOverloadedError(ExternalError):
+    def __init__(
+        self,
+        method_name: str,
+        max_queue: int,
+    ) -> None:
+        super().__init__(
+            error_code='MethodOverloaded',
+            details={
+                'method': method_name,
+                'max_queue': max_queue,
+                # Request was not started, so it is safe to send it again later
+                'retryable': True,
+            },
+        )
+
+
+class RateLimitedError(ExternalError):
+    def __init__(
+        self,
+        scope: str,
+        retry_after: float,
+    ) -> None:
+        super().__init__(
+            error_code='RateLimited',
+            details={
+                'scope': scope,
+                # Seconds to earn one token, request sent after it is not limited by the same bucket
+                'retry_after': retry_after,
+                # Request was not started, so it is safe to send it again later
+                'retryable': True,
+            },
+        )
+
+
+class NotBatchableError(ExternalError):
+    def __init__(
+        self,
+        method_name: str,
+    ) -> None:
+        super().__init__(
+            error_code='NotBatchable',
+            details={'method': method_name},
+        )
+
+
+class UpstreamUnavailableError(ExternalError):
+    def __init__(
+        self,
+        upstream: str,
+    ) -> None:
+        super().__init__(
+            error_code='UpstreamUnavailable',
+            details={'upstream': upstream},
+        )
+
+
 class MaxMessageSizeReceivedError(ExternalError):
     def __init__(
         self,
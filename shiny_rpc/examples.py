@@ -1,5 +1,6 @@
 from datetime import UTC, datetime
 from enum import Enum
+from typing import Any
 
 from shiny_rpc.messages import Request, Response
 from shiny_rpc.schema import BasePayloadSchema, BaseSchema
@@ -33,7 +34,12 @@ class ExampleResponse(Response):
         object_field: SomeObjectDTO
 
 
-example_request_values = {
+class ExampleListResponse(Response):
+    class PayloadSchema(BasePayloadSchema):
+        objects: list[SomeObjectDTO]
+
+
+example_request_values: dict[str, Any] = {
     'send_this': 'back',
     'object_field': {
         'string_field': 'hello world',
@@ -45,7 +51,7 @@ example_request_values = {
     },
 }
 
-example_response_values = {
+example_response_values: dict[str, Any] = {
     'some_param': 'test',
     **example_request_values,
 }
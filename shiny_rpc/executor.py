@@ -0,0 +1,112 @@
+import asyncio
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from enum import Enum
+from typing import Any
+
+
+class ExecutionPolicy(str, Enum):
+    # Method is called right in event loop
+    LOOP = 'loop'
+    # Method is called in thread pool, async method gets its own event loop there
+    THREAD = 'thread'
+    # Method is called in process pool with pickled request and without user, response is pickled back
+    PROCESS = 'process'
+
+
+class MethodExecutor:
+
+    """
+    Thread and process pools for methods, which would block event loop.
+
+    Pools are created on first use, so workers forked by `Supervisor` don`t share them.
+    """
+
+    thread_pool_size: int
+    process_pool_size: int
+    thread_pool: ThreadPoolExecutor | None
+    process_pool: ProcessPoolExecutor | None
+    # Calls submitted to pool and not finished yet
+    pending: dict[ExecutionPolicy, int]
+
+    def __init__(
+        self,
+        thread_pool_size: int | None = None,
+        process_pool_size: int | None = None,
+    ) -> None:
+        cpu_count = os.cpu_count() or 1
+
+        self.thread_pool_size = thread_pool_size or min(32, cpu_count + 4)
+        self.process_pool_size = process_pool_size or cpu_count
+        self.thread_pool = None
+        self.process_pool = None
+        self.pending = {
+            ExecutionPolicy.THREAD: 0,
+            ExecutionPolicy.PROCESS: 0,
+        }
+
+    def _get_pool(self, policy: ExecutionPolicy) -> Executor:
+        if policy == ExecutionPolicy.THREAD:
+            if self.thread_pool is None:
+                self.thread_pool = ThreadPoolExecutor(
+                    max_workers=self.thread_pool_size,
+                    thread_name_prefix='shiny_rpc',
+                )
+
+            return self.thread_pool
+
+        if self.process_pool is None:
+            # Spawned processes don`t inherit event loop and threads of server
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.process_pool_size,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+
+        return self.process_pool
+
+    async def run[T](
+        self,
+        policy: ExecutionPolicy,
+        func: Callable[..., T],
+        *args: Any,  # noqa:ANN401
+    ) -> T:
+        pool = self._get_pool(policy)
+        self.pending[policy] += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+        except BrokenExecutor:
+            # Crashed process breaks the whole pool, next call starts new one
+            if pool is self.process_pool:
+                self.process_pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            raise
+        finally:
+            self.pending[policy] -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'thread_pending': self.pending[ExecutionPolicy.THREAD],
+            'thread_queued': max(self.pending[ExecutionPolicy.THREAD] - self.thread_pool_size, 0),
+            'process_pending': self.pending[ExecutionPolicy.PROCESS],
+            'process_queued': max(self.pending[ExecutionPolicy.PROCESS] - self.process_pool_size, 0),
+        }
+
+    def shutdown(self) -> None:
+        for pool in (self.thread_pool, self.process_pool):
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        self.thread_pool = None
+        self.process_pool = None
+
+    def __str__(self) -> str:
+        return f'{self.thread_pool_size} threads, {self.process_pool_size} processes'
@@ -0,0 +1,138 @@
+import asyncio
+import struct
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from enum import Enum
+from typing import Protocol
+
+from shiny_rpc.constants import MESSAGE_SEPARATOR
+from shiny_rpc.errors import InvalidMessageFormatError, MaxMessageSizeReceivedError
+
+LENGTH_HEADER = struct.Struct('!I')
+# Set in length header of every chunk of the message, except the last one
+CHUNK_FLAG = 1 << 31
+
+
+class FrameWriter(Protocol):
+
+    """Stream writer or `CoalescingWriter`, frame is written as several fragments without concatenation."""
+
+    def writelines(self, fragments: Iterable[bytes], /) -> None:
+        ...
+
+
+class FramingMode(str, Enum):
+    SEPARATOR = 'separator'
+    LENGTH_PREFIXED = 'length_prefixed'
+
+
+class BaseFraming(ABC):
+    mode: FramingMode
+    # Message may be split into several chunk frames, see `read_chunk`
+    supports_chunks: bool = False
+    max_message_size: int
+
+    def __init__(self, max_message_size: int) -> None:
+        self.max_message_size = max_message_size
+
+    @abstractmethod
+    async def read(self, reader: asyncio.StreamReader) -> bytes:
+        ...
+
+    @abstractmethod
+    def write(self, writer: FrameWriter, data: bytes) -> None:
+        ...
+
+    async def read_chunk(self, reader: asyncio.StreamReader) -> tuple[bytes, bool]:
+        """Returns frame and flag, set if more chunks of the same message follow it."""
+        return await self.read(reader), False
+
+    def write_chunk(
+        self,
+        writer: FrameWriter,
+        data: bytes,
+        *,
+        more: bool,
+    ) -> None:
+        if more:
+            raise InvalidMessageFormatError
+
+        self.write(writer, data)
+
+
+class SeparatorFraming(BaseFraming):
+
+    """Frames are terminated by MESSAGE_SEPARATOR, so message itself can`t contain it."""
+
+    mode = FramingMode.SEPARATOR
+
+    async def read(self, reader: asyncio.StreamReader) -> bytes:
+        try:
+            data = await reader.readuntil(MESSAGE_SEPARATOR)
+        except asyncio.LimitOverrunError as error:
+            raise MaxMessageSizeReceivedError(
+                max_message_size=self.max_message_size,
+            ) from error
+
+        return data[:-1]
+
+    def write(self, writer: FrameWriter, data: bytes) -> None:
+        writer.writelines((data, MESSAGE_SEPARATOR))
+
+
+class LengthPrefixedFraming(BaseFraming):
+
+    """
+    Every frame starts with fixed-size big-endian length header.
+
+    Message is delimited without scanning its content.
+    """
+
+    mode = FramingMode.LENGTH_PREFIXED
+    supports_chunks = True
+
+    async def read(self, reader: asyncio.StreamReader) -> bytes:
+        data, more = await self.read_chunk(reader)
+        if more:
+            raise InvalidMessageFormatError
+
+        return data
+
+    async def read_chunk(self, reader: asyncio.StreamReader) -> tuple[bytes, bool]:
+        header = await reader.readexactly(LENGTH_HEADER.size)
+        (length,) = LENGTH_HEADER.unpack(header)
+
+        more = bool(length & CHUNK_FLAG)
+        length &= ~CHUNK_FLAG
+
+        if length > self.max_message_size:
+            raise MaxMessageSizeReceivedError(
+                max_message_size=self.max_message_size,
+            )
+
+        return await reader.readexactly(length), more
+
+    def write(self, writer: FrameWriter, data: bytes) -> None:
+        writer.writelines((LENGTH_HEADER.pack(len(data)), data))
+
+    def write_chunk(
+        self,
+        writer: FrameWriter,
+        data: bytes,
+        *,
+        more: bool,
+    ) -> None:
+        writer.writelines((LENGTH_HEADER.pack(len(data) | CHUNK_FLAG if more else len(data)), data))
+
+
+FRAMINGS: dict[FramingMode, type[BaseFraming]] = {
+    FramingMode.SEPARATOR: SeparatorFraming,
+    FramingMode.LENGTH_PREFIXED: LengthPrefixedFraming,
+}
+
+
+def make_framing(
+    mode: FramingMode,
+    max_message_size: int,
+) -> BaseFraming:
+    return FRAMINGS[mode](max_message_size=max_message_size)
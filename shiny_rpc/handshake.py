@@ -0,0 +1,25 @@
+from pydantic import Field
+
+from shiny_rpc.constants import HANDSHAKE_METHOD
+from shiny_rpc.messages import Request, Response
+from shiny_rpc.schema import BasePayloadSchema
+
+# Handshake is always sent with JSON codec, right after connection is opened
+HANDSHAKE_PREFIX = HANDSHAKE_METHOD.encode('utf-8') + b'{'
+
+
+class HandshakeRequest(Request):
+    class PayloadSchema(BasePayloadSchema):
+        codecs: list[str]
+        compressions: list[str] = Field(default_factory=list)
+        chunked: bool = False
+        # Client answers server pings, so server can detect dead connection
+        keepalive: bool = False
+
+
+class HandshakeResponse(Response):
+    class PayloadSchema(BasePayloadSchema):
+        codec: str
+        compression: str | None = None
+        # Size of chunks for requests above it, if server accepts chunked requests
+        chunk_size: int | None = None
@@ -1,17 +1,60 @@
 import asyncio
 from abc import ABC, abstractmethod
 
+from shiny_rpc.codec import BaseCodec
+from shiny_rpc.compression import Compression
+from shiny_rpc.writer import CoalescingWriter
+
 
 class UserIface(ABC):
-    address: str
+    # Server may keep tens of thousands of mostly idle users, so they have no __dict__
+    __slots__ = (
+        'codec',
+        'compression',
+        'connection_id',
+        'in_flight',
+        'keepalive',
+        'last_active',
+        'output',
+        'ping_sent_at',
+        'reader',
+        'tasks',
+        'topics',
+        'writer',
+    )
+
+    # Connection number, unique within server process
+    connection_id: int
     reader: asyncio.StreamReader
     writer: asyncio.StreamWriter
+    # Responses are written through it, see `CoalescingWriter`
+    output: CoalescingWriter
+    # Negotiated by handshake, every connection starts with JSON and without compression
+    codec: BaseCodec
+    compression: Compression | None
+    # Requests handled concurrently in pipelined mode, see `Server.max_in_flight`
+    tasks: set[asyncio.Task[None]]
+    # Topics, which messages are pushed to connection, see `PubSub`
+    topics: set[str]
+
+    # Requests in progress, user is not idle while it is above zero
+    in_flight: int
+    # Monotonic time of the last frame received from user, see `Server.idle_timeout`
+    last_active: float
+    # Agreed in handshake, only such users answer pings
+    keepalive: bool
+    ping_sent_at: float | None
 
     @abstractmethod
     def __init__(
         self,
-        address: str,
+        connection_id: int,
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
     ) -> None:
         ...
+
+    @property
+    @abstractmethod
+    def address(self) -> str:
+        ...
@@ -1,66 +1,310 @@
-from collections.abc import Awaitable, Callable
-from typing import Self
+import asyncio
+import copy
+import inspect
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Hashable,
+    Iterable,
+)
+from typing import Any, Self
 
+from shiny_rpc.batch import BatchRequest, BatchResponse
+from shiny_rpc.cache import (
+    CachePolicy,
+    ResponseCache,
+    format_tags,
+    payload_key,
+    tag_fields,
+)
+from shiny_rpc.constants import (
+    BATCH_METHOD,
+    SUBSCRIBE_METHOD,
+    UNSUBSCRIBE_METHOD,
+)
 from shiny_rpc.errors import (
+    DeadlineExceededError,
+    ExternalError,
     MethodInternalError,
+    NotBatchableError,
+    ServerFatalError,
     UnknownMethodError,
     ValidationError,
 )
+from shiny_rpc.executor import ExecutionPolicy, MethodExecutor
 from shiny_rpc.ifaces import UserIface
 from shiny_rpc.messages import (
     Request,
     Response,
     response_from_error,
 )
+from shiny_rpc.parser import Buffer
+from shiny_rpc.pubsub import (
+    PubSub,
+    SubscribeRequest,
+    SubscribeResponse,
+)
+from shiny_rpc.ratelimit import RateLimiter
+from shiny_rpc.scheduler import (
+    MethodLimits,
+    Priority,
+    Scheduler,
+)
+from shiny_rpc.singleflight import SingleFlight
 
 type HandlerMethod = Callable[[Request, UserIface], Awaitable[Response]]
+type StreamHandlerMethod = Callable[[Request, UserIface], AsyncIterator[Response]]
+type SyncHandlerMethod = Callable[[Request, UserIface], Response]
+type AnyHandlerMethod = HandlerMethod | StreamHandlerMethod | SyncHandlerMethod
+
+
+def _response_from_exception(error: BaseException, request: Request) -> Response:
+    if isinstance(error, ValidationError):
+        # Lazy request payload is validated only when handler touches it
+        return response_from_error(error, request)
+
+    return response_from_error(
+        MethodInternalError.from_base_exception(error),
+        request,
+    )
+
+
+def _with_trace_id(response: Response, request: Request) -> Response:
+    # Response of shared execution is sent to every caller with its own trace_id
+    if response.trace_id == request.trace_id:
+        return response
+
+    shared_response = copy.copy(response)
+    shared_response.trace_id = request.trace_id
+    shared_response.headers = response.headers.model_copy(update={'trace_id': request.trace_id})
+    return shared_response
+
+
+def _call_method(
+    method: HandlerMethod | SyncHandlerMethod,
+    request: Request,
+    user: UserIface | None,
+) -> Response:
+    # Runs in pool, where async method needs its own event loop
+    response = method(request, user)  # type:ignore[arg-type]
+    if inspect.isawaitable(response):
+        return asyncio.run(response)  # type:ignore[arg-type]
+
+    return response
+
+
+def _call_method_in_process(
+    method: HandlerMethod | SyncHandlerMethod,
+    request: Request,
+) -> Response:
+    # Exceptions are turned into responses here, because they may be not picklable
+    try:
+        return _call_method(method, request, None)
+    except BaseException as error:  # noqa: BLE001
+        return _response_from_exception(error, request)
 
 
 class MessageHandler:
-    methods: dict[str, HandlerMethod]
+    methods: dict[str, AnyHandlerMethod]
+    # Methods implemented as async generators, every yielded response is sent as separate frame
+    streaming_methods: set[str]
+    # Methods, which are not called right in event loop
+    policies: dict[str, ExecutionPolicy]
+    limits: dict[str, MethodLimits]
+    # Read methods with cached responses and tags, which write methods invalidate
+    cache_policies: dict[str, CachePolicy]
+    invalidated_tags: dict[str, tuple[str, ...]]
+    # Concurrent calls of these methods with equal payloads share one execution
+    coalesced_methods: set[str]
+    singleflight: SingleFlight
+    # Replaced by server with pools, limits, cache of configured size, pub/sub with its framing and rate limits
+    executor: MethodExecutor
+    scheduler: Scheduler
+    cache: ResponseCache
+    pubsub: PubSub
+    rate_limiter: RateLimiter
 
     def __init__(self) -> None:
         self.methods = {}
+        self.streaming_methods = set()
+        self.policies = {}
+        self.limits = {}
+        self.cache_policies = {}
+        self.invalidated_tags = {}
+        self.coalesced_methods = set()
+        self.singleflight = SingleFlight()
+        self.executor = MethodExecutor()
+        self.scheduler = Scheduler(self.limits)
+        self.cache = ResponseCache()
+        self.pubsub = PubSub()
+        self.rate_limiter = RateLimiter()
 
     def include(
         self,
         message_handler: Self,
     ) -> None:
         self.methods.update(message_handler.methods)
+        self.streaming_methods -= message_handler.methods.keys()
+        self.streaming_methods |= message_handler.streaming_methods
+        for method_name in message_handler.methods:
+            self.policies.pop(method_name, None)
+        self.policies.update(message_handler.policies)
+        self.limits.update(message_handler.limits)
+        for method_name in message_handler.methods:
+            self.cache_policies.pop(method_name, None)
+            self.invalidated_tags.pop(method_name, None)
+        self.cache_policies.update(message_handler.cache_policies)
+        self.invalidated_tags.update(message_handler.invalidated_tags)
+        self.coalesced_methods -= message_handler.methods.keys()
+        self.coalesced_methods |= message_handler.coalesced_methods
 
     def add_method(
         self,
         method_name: str,
-        func: HandlerMethod,
+        func: AnyHandlerMethod,
+        policy: ExecutionPolicy | None = None,
+        *,
+        max_concurrency: int | None = None,
+        priority: Priority = Priority.NORMAL,
+        max_queue: int = 2**10,  # 1024
+        cache: CachePolicy | None = None,
+        invalidates: Iterable[str] = (),
+        coalesce: bool = False,
     ) -> None:
+        """
+        Sync methods are called in thread pool by default, async ones right in event loop.
+
+        Calls above max_concurrency wait in queue, see `Scheduler`.
+        Successful responses of method with cache policy are reused until its ttl
+        or until one of its tags is invalidated by a call of method with such tag in `invalidates`, see `ResponseCache`.
+        Concurrent calls of coalesced method with equal payloads share one execution with user of the first call,
+        so its response must not depend on user, see `SingleFlight`.
+        """
+        is_stream = inspect.isasyncgenfunction(func)
+        if policy is None:
+            policy = (
+                ExecutionPolicy.LOOP
+                if is_stream or inspect.iscoroutinefunction(func)
+                else ExecutionPolicy.THREAD
+            )
+
+        if is_stream and policy != ExecutionPolicy.LOOP:
+            raise ServerFatalError(
+                details={method_name: f'streaming method can`t use {policy.value} execution policy'},
+            )
+
+        if is_stream and (cache or coalesce):
+            raise ServerFatalError(details={method_name: 'streaming method can`t be cached or coalesced'})
+
+        invalidates = tuple(invalidates)
+        self._check_cache_fields(method_name, func, cache, invalidates)
+
         self.methods[method_name] = func
+        self.limits[method_name] = MethodLimits(
+            max_concurrency=max_concurrency,
+            priority=priority,
+            max_queue=max_queue,
+        )
+
+        if is_stream:
+            self.streaming_methods.add(method_name)
+        else:
+            self.streaming_methods.discard(method_name)
+
+        if policy != ExecutionPolicy.LOOP:
+            self.policies[method_name] = policy
+        else:
+            self.policies.pop(method_name, None)
+
+        if cache:
+            self.cache_policies[method_name] = cache
+        else:
+            self.cache_policies.pop(method_name, None)
+
+        if invalidates:
+            self.invalidated_tags[method_name] = invalidates
+        else:
+            self.invalidated_tags.pop(method_name, None)
+
+        if coalesce:
+            self.coalesced_methods.add(method_name)
+        else:
+            self.coalesced_methods.discard(method_name)
+
+    @staticmethod
+    def _check_cache_fields(
+        method_name: str,
+        func: AnyHandlerMethod,
+        cache: CachePolicy | None,
+        invalidates: tuple[str, ...],
+    ) -> None:
+        # Cache key and tags are built from payload fields, so misspelled field fails at start, not on call
+        fields = tag_fields(invalidates)
+        if cache:
+            fields |= tag_fields(cache.tags) | set(cache.key or ())
+
+        request_class = func.__annotations__.get('request')
+        if not fields or not request_class:
+            return
+
+        if unknown := fields - request_class.PayloadSchema.model_fields.keys():
+            raise ServerFatalError(
+                details={method_name: f'unknown payload fields in cache key or tags: {sorted(unknown)}'},
+            )
 
     def method(
         self,
         method_name: str,
-    ) -> Callable[[HandlerMethod], HandlerMethod]:
-        def decorator(func: HandlerMethod) -> HandlerMethod:
+        policy: ExecutionPolicy | None = None,
+        *,
+        max_concurrency: int | None = None,
+        priority: Priority = Priority.NORMAL,
+        max_queue: int = 2**10,  # 1024
+        cache: CachePolicy | None = None,
+        invalidates: Iterable[str] = (),
+        coalesce: bool = False,
+    ) -> Callable[[AnyHandlerMethod], AnyHandlerMethod]:
+        def decorator(func: AnyHandlerMethod) -> AnyHandlerMethod:
             self.add_method(
                 method_name=method_name,
                 func=func,
+                policy=policy,
+                max_concurrency=max_concurrency,
+                priority=priority,
+                max_queue=max_queue,
+                cache=cache,
+                invalidates=invalidates,
+                coalesce=coalesce,
             )
 
             return func
         return decorator
 
-    async def handle(
+    async def handle(  # noqa: PLR0911
         self,
-        message: bytes,
+        message: Buffer,
         user: UserIface,
-    ) -> Response:
+    ) -> Response | AsyncGenerator[Response, None]:
         try:
-            method_name = Request.find_method_name(message)
+            method_name = Request.find_method_name(message, codec=user.codec)
         except ValidationError as error:
             return response_from_error(error)
 
+        if method_name == BATCH_METHOD:
+            return await self._handle_batch(message, user)
+
+        if method_name in (SUBSCRIBE_METHOD, UNSUBSCRIBE_METHOD):
+            return self._handle_subscription(method_name, message, user)
+
         method = self.methods.get(method_name)
         if not method or method_name not in self.methods:
-            return response_from_error(UnknownMethodError(method_name))
+            return response_from_error(
+                UnknownMethodError(method_name),
+                trace_id=self._find_trace_id(message, user),
+            )
 
         request_class = self.methods[method_name].__annotations__.get('request')
         if not request_class:
@@ -68,16 +312,309 @@ class MessageHandler:
                 MethodInternalError(
                     details={'request_argument': 'must be set in message handler method'},
                 ),
+                trace_id=self._find_trace_id(message, user),
             )
 
         try:
-            request = request_class.load(message)
+            # Payload is validated only after deadline is checked
+            request = request_class.from_bytes(message, codec=user.codec, lazy_payload=True)
         except ValidationError as error:
-            return response_from_error(error)
+            return response_from_error(
+                error,
+                trace_id=self._find_trace_id(message, user),
+            )
+
+        deadline = self._loop_deadline(request)
+        if deadline is not None and deadline <= asyncio.get_running_loop().time():
+            # Client doesn`t wait for response anymore, so request is dropped before any work is done
+            return self._deadline_error(request)
+
+        if not request_class.defers_payload(message):
+            try:
+                request.payload  # noqa: B018
+            except ValidationError as error:
+                return response_from_error(error, request)
+
+        if method_name in self.streaming_methods:
+            return self._stream(method, request, user, deadline)  # type:ignore[arg-type]
+
+        if method_name in self.cache_policies:
+            return await self._call_cached(method_name, method, request, user, deadline)  # type:ignore[arg-type]
 
         try:
-            return await method(request, user)
-        except BaseException as error:  # noqa: BLE001
+            flight_key = (
+                (method_name, user.codec.name, payload_key(request))
+                if method_name in self.coalesced_methods
+                else None
+            )
+        except ValidationError as error:
+            return response_from_error(error, request)
+
+        response = await self._call_once(
+            request=request,
+            deadline=deadline,
+            call=lambda: self._call_scheduled(method_name, method, request, user),  # type:ignore[arg-type]
+            flight_key=flight_key,
+        )
+
+        if method_name in self.invalidated_tags:
+            self.cache.invalidate(format_tags(self.invalidated_tags[method_name], request))
+
+        return response
+
+    async def _handle_batch(
+        self,
+        message: Buffer,
+        user: UserIface,
+    ) -> Response:
+        """
+        Handles requests of batch envelope concurrently, or one by one if it is sequential, and answers with one envelope.
+
+        Every request is handled as if it came alone, so failed request doesn`t affect others.
+        """
+        try:
+            batch = BatchRequest.from_bytes(message, codec=user.codec)
+            requests = batch.payload.requests  # type:ignore[attr-defined]
+            limit = 1 if batch.payload.sequential else batch.payload.max_concurrency  # type:ignore[attr-defined]
+        except ValidationError as error:
+            return response_from_error(error, trace_id=self._find_trace_id(message, user))
+
+        semaphore = asyncio.Semaphore(limit) if limit else None
+
+        async def handle_item(data: bytes) -> bytes:
+            # Envelope is not limited, so each of its requests is charged, as if it came alone
+            if (rejection := self.rate_limiter.check(user, data)) is not None:
+                return rejection
+
+            if semaphore is None:
+                return (await self._handle_batch_item(data, user)).dump(user.codec)
+
+            async with semaphore:
+                return (await self._handle_batch_item(data, user)).dump(user.codec)
+
+        return BatchResponse(
+            method_name=BATCH_METHOD,
+            trace_id=batch.trace_id,
+            success=True,
+            payload={'responses': await asyncio.gather(*(handle_item(data) for data in requests))},
+        )
+
+    async def _handle_batch_item(
+        self,
+        message: bytes,
+        user: UserIface,
+    ) -> Response:
+        try:
+            method_name = Request.find_method_name(message, codec=user.codec)
+        except ValidationError as error:
+            return response_from_error(error)
+
+        # Stream has many responses, while envelope keeps one per request
+        if method_name == BATCH_METHOD or method_name in self.streaming_methods:
             return response_from_error(
-                MethodInternalError.from_base_exception(error),
+                NotBatchableError(method_name),
+                trace_id=self._find_trace_id(message, user),
             )
+
+        return await self.handle(message, user)  # type:ignore[return-value]
+
+    def _handle_subscription(
+        self,
+        method_name: str,
+        message: Buffer,
+        user: UserIface,
+    ) -> Response:
+        try:
+            request = SubscribeRequest.from_bytes(message, codec=user.codec)
+        except ValidationError as error:
+            return response_from_error(error, trace_id=self._find_trace_id(message, user))
+
+        if method_name == SUBSCRIBE_METHOD:
+            self.pubsub.subscribe(user, request.payload.topics)  # type:ignore[attr-defined]
+        else:
+            self.pubsub.unsubscribe(user, request.payload.topics)  # type:ignore[attr-defined]
+
+        return SubscribeResponse(
+            method_name=method_name,
+            trace_id=request.trace_id,
+            success=True,
+            payload={'topics': sorted(user.topics)},
+        )
+
+    async def _call_once(
+        self,
+        request: Request,
+        deadline: float | None,
+        call: Callable[[], Coroutine[Any, Any, Response]],
+        flight_key: Hashable | None,
+    ) -> Response:
+        """Calls method within request deadline, coalesced calls with the same flight_key share one execution."""
+        try:
+            async with asyncio.timeout_at(deadline):
+                if flight_key is None:
+                    return await call()
+
+                response = await self.singleflight.run(flight_key, call)
+        except TimeoutError:
+            return self._deadline_error(request)
+
+        return _with_trace_id(response, request)
+
+    async def _call_cached(
+        self,
+        method_name: str,
+        method: HandlerMethod | SyncHandlerMethod,
+        request: Request,
+        user: UserIface,
+        deadline: float | None,
+    ) -> Response:
+        policy = self.cache_policies[method_name]
+
+        try:
+            key = self.cache.make_key(policy, request, user.codec)
+        except ValidationError as error:
+            return response_from_error(error, request)
+
+        if (cached := self.cache.get(key, request)) is not None:
+            return cached
+
+        async def call() -> Response:
+            version = self.cache.version
+            response = await self._call_scheduled(method_name, method, request, user)
+            return self.cache.put(key, policy, request, response, user.codec, version)
+
+        # Cache key already contains method, codec and payload fields, response depends on nothing else.
+        # Encoded response can be patched only with trace_id of the same length
+        return await self._call_once(
+            request=request,
+            deadline=deadline,
+            call=call,
+            flight_key=(*key, len(request.trace_id.encode())) if method_name in self.coalesced_methods else None,
+        )
+
+    async def _call_scheduled(
+        self,
+        method_name: str,
+        method: HandlerMethod | SyncHandlerMethod,
+        request: Request,
+        user: UserIface,
+    ) -> Response:
+        try:
+            await self.scheduler.acquire(method_name)
+        except ExternalError as error:
+            return response_from_error(error, request)
+
+        try:
+            return await self._call(method_name, method, request, user)
+        except asyncio.CancelledError:
+            # Deadline has passed or user has disconnected
+            raise
+        except BaseException as error:  # noqa: BLE001
+            return _response_from_exception(error, request)
+        finally:
+            self.scheduler.release(method_name)
+
+    async def _call(
+        self,
+        method_name: str,
+        method: HandlerMethod | SyncHandlerMethod,
+        request: Request,
+        user: UserIface,
+    ) -> Response:
+        match self.policies.get(method_name, ExecutionPolicy.LOOP):
+            case ExecutionPolicy.THREAD:
+                return await self.executor.run(ExecutionPolicy.THREAD, _call_method, method, request, user)
+            case ExecutionPolicy.PROCESS:
+                # Lazy payload refers to connection buffer, so it is loaded before pickling
+                request.payload  # noqa: B018
+                return await self.executor.run(ExecutionPolicy.PROCESS, _call_method_in_process, method, request)
+
+        response = method(request, user)
+        if inspect.isawaitable(response):
+            return await response
+
+        return response
+
+    @staticmethod
+    def _loop_deadline(request: Request) -> float | None:
+        # Deadline is unix timestamp, while asyncio timeouts are measured by loop clock
+        if (time_left := request.time_left) is None:
+            return None
+
+        return asyncio.get_running_loop().time() + time_left
+
+    @staticmethod
+    def _deadline_error(request: Request) -> Response:
+        return response_from_error(DeadlineExceededError(request.headers.deadline), request)
+
+    @staticmethod
+    def _find_trace_id(message: Buffer, user: UserIface) -> str | None:
+        # Pipelining client matches responses by trace_id, so error responses should keep it too
+        try:
+            return user.codec.find_trace_id(message)
+        except ValidationError:
+            return None
+
+    async def _stream(
+        self,
+        method: StreamHandlerMethod,
+        request: Request,
+        user: UserIface,
+        deadline: float | None,
+    ) -> AsyncGenerator[Response, None]:
+        """
+        Numbers responses yielded by streaming method and closes the stream with terminal frame.
+
+        Terminal frame is either empty `end` response or error response, if method has failed.
+        Method is advanced only when previous frame is sent, so one frame is kept in memory at a time.
+        Stream holds its scheduler slot until terminal frame and is stopped, when deadline has passed.
+        """
+        try:
+            async with asyncio.timeout_at(deadline):
+                await self.scheduler.acquire(request.method_name)
+        except TimeoutError:
+            yield self._deadline_error(request)
+            return
+        except ExternalError as error:
+            yield response_from_error(error, request)
+            return
+
+        responses = method(request, user)
+        sequence = 0
+
+        try:
+            while True:
+                timeout = asyncio.timeout_at(deadline)
+                try:
+                    async with timeout:
+                        response = await anext(responses)
+                except StopAsyncIteration:
+                    last_response = Response(
+                        method_name=request.method_name,
+                        trace_id=request.trace_id,
+                        success=True,
+                    )
+                    break
+                except asyncio.CancelledError:
+                    # User has disconnected or server is shutting down, stream task must end as cancelled
+                    raise
+                except BaseException as error:  # noqa: BLE001
+                    last_response = (
+                        self._deadline_error(request)
+                        if timeout.expired()
+                        else _response_from_exception(error, request)
+                    )
+                    break
+
+                response.trace_id = response.headers.trace_id = request.trace_id
+                response.sequence = sequence
+                yield response
+                sequence += 1
+        finally:
+            # Client may disconnect in the middle of the stream
+            await responses.aclose()  # type:ignore[attr-defined]
+            self.scheduler.release(request.method_name)
+
+        last_response.sequence = sequence
+        last_response.end_of_stream = True
+        yield last_response
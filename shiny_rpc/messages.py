@@ -1,33 +1,89 @@
 import logging
-import re
-from typing import Any, Self
+import time
+from functools import cache, lru_cache
+from mmap import mmap
+from typing import (
+    Any,
+    ClassVar,
+    Self,
+)
 from uuid import uuid4
 
 import orjson
+from pydantic import Field
 from pydantic import ValidationError as PydanticValidationError
+from pydantic_core import SchemaSerializer
 
-from shiny_rpc.constants import ZERO_TRACE_ID
+from shiny_rpc.codec import (
+    JSON_CODEC,
+    BaseCodec,
+    RawPayload,
+)
+from shiny_rpc.constants import (
+    DRAIN_METHOD,
+    PING_METHOD,
+    PONG_METHOD,
+    ZERO_TRACE_ID,
+)
 from shiny_rpc.errors import (
     ExternalError,
     InvalidMessageFormatError,
     ValidationError,
 )
+from shiny_rpc.parser import (
+    Buffer,
+    parse_request,
+    parse_response,
+)
 from shiny_rpc.schema import BaseHeadersSchema, BasePayloadSchema
-from shiny_rpc.utils import compute_average_time
+
+# Error responses echo method names sent by clients, so cache of their encoded prefixes is bounded
+MAX_CACHED_PREFIXES = 2**10
+
+
+@lru_cache(maxsize=MAX_CACHED_PREFIXES)
+def _request_prefix(method_name: str) -> bytes:
+    return method_name.encode('utf-8')
+
+
+@lru_cache(maxsize=MAX_CACHED_PREFIXES)
+def _response_prefix(method_name: str, *, success: bool) -> bytes:
+    return f'{method_name}:{'ok' if success else 'err'}'.encode()
 
 
 class Request:
     method_name: str
     trace_id: str
-    payload: BasePayloadSchema
     headers: BaseHeadersSchema
 
+    # Lazy requests keep encoded payload until first `request.payload` access
+    lazy_payload: ClassVar[bool] = False
+    _payload: BasePayloadSchema | None
+    _raw_payload: RawPayload | None
+
+    payload_serializer: ClassVar[SchemaSerializer]
+    headers_serializer: ClassVar[SchemaSerializer]
+
     class PayloadSchema(BasePayloadSchema):
         ...
 
     class HeadersSchema(BaseHeadersSchema):
         ...
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa:ANN401
+        super().__init_subclass__(**kwargs)
+        cls.bind_serializers()
+
+    @classmethod
+    def bind_serializers(cls) -> None:
+        cls.payload_serializer = cls.PayloadSchema.__pydantic_serializer__
+        cls.headers_serializer = cls.HeadersSchema.__pydantic_serializer__
+
+    @classmethod
+    def method_name_prefix(cls, method_name: str) -> bytes:
+        # Method name is set per instance, not per class, so its encoded prefix is cached on first dump
+        return _request_prefix(method_name)
+
     @property
     def headers_schema(self) -> type[BaseHeadersSchema]:
         return BaseHeadersSchema
@@ -36,21 +92,27 @@ class Request:
         self,
         method_name: str,
         trace_id: str | None = None,
-        payload: dict[str, Any] | BasePayloadSchema | None = None,
+        payload: dict[str, Any] | BasePayloadSchema | RawPayload | None = None,
         headers: dict[str, Any] | BaseHeadersSchema | None = None,
     ) -> None:
         payload = payload or {}
         headers = headers or {}
 
         self.method_name = method_name
+        self._payload = None
+        self._raw_payload = None
 
         self.trace_id = trace_id or str(uuid4())
         if isinstance(headers, BaseHeadersSchema):
-            headers.trace_id = self.trace_id
+            # Decoded headers already have it, while assignment to model is not free
+            if headers.trace_id != self.trace_id:
+                headers.trace_id = self.trace_id
         else:
             headers['trace_id'] = self.trace_id
 
-        if isinstance(payload, BasePayloadSchema):
+        if isinstance(payload, RawPayload):
+            self._raw_payload = payload
+        elif isinstance(payload, BasePayloadSchema):
             self.payload = payload
         else:
             try:
@@ -66,72 +128,115 @@ class Request:
             except PydanticValidationError as error:
                 raise ValidationError.from_base_exception(error) from error
 
-    @classmethod
-    def load(cls, data: bytes | str) -> Self:
-        message = data if isinstance(data, str) else data.decode('utf-8')
-
-        all_opening_curly_brace = [
-            element.start()
-            for element in re.finditer('(?={)', message)
-        ]
-        if len(all_opening_curly_brace) < 2:  # noqa:PLR2004
-            raise InvalidMessageFormatError
+    @property
+    def payload(self) -> BasePayloadSchema:
+        if self._payload is None:
+            if self._raw_payload is None:
+                raise InvalidMessageFormatError
 
-        payload_start_at = all_opening_curly_brace[0]
-        headers_start_at = all_opening_curly_brace[-1]
+            self._payload = self._raw_payload.load(self.PayloadSchema)
+            self._raw_payload = None
 
-        if payload_start_at >= headers_start_at:
-            raise InvalidMessageFormatError
+        return self._payload
+
+    @payload.setter
+    def payload(self, payload: BasePayloadSchema) -> None:
+        self._payload = payload
+        self._raw_payload = None
+
+    @property
+    def is_payload_loaded(self) -> bool:
+        return self._payload is not None
 
-        method_name = message[0:payload_start_at]
+    @property
+    def raw_payload(self) -> memoryview | None:
+        """
+        Encoded payload of lazy request, until it is loaded, e.g. to copy content of spilled upload to file.
+
+        View refers to connection buffer, so it is valid only until handler returns.
+        """
+        if self._raw_payload is None:
+            return None
+
+        return self._raw_payload.view
+
+    @property
+    def time_left(self) -> float | None:
+        """Seconds until deadline set by client, handlers may pass `headers.deadline` on to outbound requests."""
+        if self.headers.deadline is None:
+            return None
+
+        return self.headers.deadline - time.time()
+
+    @classmethod
+    def load(cls, data: bytes | memoryview | str) -> Self:
+        message = parse_request(data)
 
         try:
-            payload = orjson.loads(message[payload_start_at:headers_start_at])
-            headers = orjson.loads(message[headers_start_at:])
+            payload = orjson.loads(message.payload)
+            headers = orjson.loads(message.headers)
         except orjson.JSONDecodeError as error:
             raise ValidationError.from_base_exception(error) from error
 
         trace_id = headers.get('trace_id', None)
 
         return cls(
-            method_name=method_name,
+            method_name=message.method_name,
             payload=payload,
             headers=headers,
             trace_id=trace_id,
         )
 
-    def dump(self) -> bytes:
-        payload = orjson.dumps(self.PayloadSchema.model_dump(self.payload))
-        headers = orjson.dumps(self.HeadersSchema.model_dump(self.headers))
-
-        return b''.join([
-            self.method_name.encode('utf-8'),
-            payload,
-            headers,
-        ])
+    @classmethod
+    def defers_payload(cls, data: Buffer) -> bool:
+        # Payload of spilled upload stays in its mapping, until handler touches it
+        return cls.lazy_payload or isinstance(data, mmap)
 
     @classmethod
-    def find_method_name(cls, data: bytes | str) -> str:
-        message = data if isinstance(data, str) else data.decode('utf-8')
+    def from_bytes(
+        cls,
+        data: Buffer,
+        codec: BaseCodec = JSON_CODEC,
+        *,
+        lazy_payload: bool | None = None,
+    ) -> Self:
+        """
+        Validates payload and headers straight from encoded bytes, without building intermediate dicts.
 
-        payload_start_at = message.find('{')
-        if (
-            payload_start_at in (-1, 0)
-        ):
-            raise InvalidMessageFormatError
+        Payload is kept encoded, if `lazy_payload` is set, by default it is set for lazy classes and spilled uploads.
+        """
+        return codec.load_request(cls, data, lazy_payload=lazy_payload)
+
+    def dump(self, codec: BaseCodec = JSON_CODEC) -> bytes:
+        return codec.dump_request(self)
 
-        return message[0:payload_start_at]
+    @classmethod
+    def find_method_name(
+        cls,
+        data: Buffer,
+        codec: BaseCodec = JSON_CODEC,
+    ) -> str:
+        return codec.find_method_name(data)
 
     def __str__(self) -> str:
         return f'Request <{self.method_name}: {self.trace_id}>'
 
 
+Request.bind_serializers()
+
+
 class Response:
     method_name: str
     trace_id: str
     payload: BasePayloadSchema
     headers: BaseHeadersSchema
     success: bool
+    # Set only for frames of streaming method
+    sequence: int | None
+    end_of_stream: bool
+
+    payload_serializer: ClassVar[SchemaSerializer]
+    headers_serializer: ClassVar[SchemaSerializer]
 
     class PayloadSchema(BasePayloadSchema):
         ...
@@ -139,95 +244,121 @@ class Response:
     class HeadersSchema(BaseHeadersSchema):
         ...
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa:ANN401
+        super().__init_subclass__(**kwargs)
+        cls.bind_serializers()
+
+    @classmethod
+    def bind_serializers(cls) -> None:
+        cls.payload_serializer = cls.PayloadSchema.__pydantic_serializer__
+        cls.headers_serializer = cls.HeadersSchema.__pydantic_serializer__
+
+    @classmethod
+    def method_name_prefix(cls, method_name: str, *, success: bool) -> bytes:
+        return _response_prefix(method_name, success=success)
+
     def __init__(
         self,
         method_name: str,
         trace_id: str,
         *,
         success: bool,
-        payload: dict[str, Any] | None = None,
-        headers: dict[str, Any] | None = None,
+        payload: dict[str, Any] | BasePayloadSchema | None = None,
+        headers: dict[str, Any] | BaseHeadersSchema | None = None,
+        sequence: int | None = None,
+        end_of_stream: bool = False,
     ) -> None:
         self.method_name = method_name
         self.trace_id = trace_id
         self.success = success
+        self.sequence = sequence
+        self.end_of_stream = end_of_stream
 
         payload = payload or {}
         headers = headers or {}
-        headers['trace_id'] = self.trace_id
+        if isinstance(headers, BaseHeadersSchema):
+            if headers.trace_id != self.trace_id:
+                headers.trace_id = self.trace_id
+        else:
+            headers['trace_id'] = self.trace_id
 
         try:
-            self.payload = self.PayloadSchema.model_validate(payload)
-            self.headers = self.HeadersSchema.model_validate(headers)
+            self.payload = (
+                payload
+                if isinstance(payload, BasePayloadSchema)
+                else self.PayloadSchema.model_validate(payload)
+            )
+            self.headers = (
+                headers
+                if isinstance(headers, BaseHeadersSchema)
+                else self.HeadersSchema.model_validate(headers)
+            )
         except PydanticValidationError as error:
             raise ValidationError.from_base_exception(error) from error
 
     @classmethod
-    def load(cls, data: bytes | str) -> Self:
-        message = data if isinstance(data, str) else data.decode('utf-8')
-
-        success_start_at = message.find(':')
-        if success_start_at < 2:  # noqa:PLR2004
-            raise InvalidMessageFormatError
-
-        all_opening_curly_brace = [
-            element.start()
-            for element in re.finditer('(?={)', message)
-        ]
-        if len(all_opening_curly_brace) < 2:  # noqa:PLR2004
-            raise InvalidMessageFormatError
-
-        payload_start_at = all_opening_curly_brace[0]
-        headers_start_at = all_opening_curly_brace[-1]
-
-        if payload_start_at >= headers_start_at:
-            raise InvalidMessageFormatError
+    def load(cls, data: bytes | memoryview | str) -> Self:
+        message = parse_response(data)
 
-        if (
-            success_start_at >= headers_start_at
-            or payload_start_at >= headers_start_at
-        ):
-            raise InvalidMessageFormatError
-
-
-        method_name = message[0:success_start_at]
-        success = (message[success_start_at+1:payload_start_at] == 'ok')
-        payload = orjson.loads(message[payload_start_at:headers_start_at])
-        headers = orjson.loads(message[headers_start_at:])
+        try:
+            payload = orjson.loads(message.payload)
+            headers = orjson.loads(message.headers)
+        except orjson.JSONDecodeError as error:
+            raise ValidationError.from_base_exception(error) from error
 
         if not (trace_id := headers.get('trace_id')):
             raise InvalidMessageFormatError
 
         return cls(
-            method_name=method_name,
+            method_name=message.method_name,
             trace_id=trace_id,
-            success=success,
+            success=bool(message.success),
             payload=payload,
             headers=headers,
+            sequence=message.sequence,
+            end_of_stream=message.end_of_stream,
         )
 
-    def dump(self) -> bytes:
-        payload = orjson.dumps(self.PayloadSchema.model_dump(self.payload))
-        headers = orjson.dumps(self.HeadersSchema.model_dump(self.headers))
-        success = b'ok' if self.success else b'err'
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes | memoryview,
+        codec: BaseCodec = JSON_CODEC,
+    ) -> Self:
+        """Validates payload and headers straight from encoded bytes, without building intermediate dicts."""
+        return codec.load_response(cls, data)
 
-        return b''.join([
-            self.method_name.encode('utf-8'),
-            b':',
-            success,
-            payload,
-            headers,
-        ])
+    def dump(self, codec: BaseCodec = JSON_CODEC) -> bytes:
+        return codec.dump_response(self)
+
+    @property
+    def status(self) -> str:
+        if not self.success:
+            return 'err'
+
+        return 'end' if self.end_of_stream else 'ok'
 
     def __str__(self) -> str:
-        return f'Response[{'ok' if self.success else 'err'}] <{self.method_name}: {self.trace_id}>'
+        sequence = f'@{self.sequence}' if self.sequence is not None else ''
+        return f'Response[{self.status}{sequence}] <{self.method_name}: {self.trace_id}>'
+
+
+Response.bind_serializers()
+
+
+class ErrorResponse(Response):
+    class PayloadSchema(BasePayloadSchema):
+        error_code: str
+        details: dict[str, Any] = Field(default_factory=dict)
 
 
 def response_from_error(
     error: ExternalError,
     request: Request | None = None,
+    *,
+    trace_id: str | None = None,
 ) -> Response:
-    return Response(
+    return ErrorResponse(
         method_name=(
             request.method_name
             if request
@@ -237,7 +368,7 @@ def response_from_error(
                 else '__warning'
             )
         ),
-        trace_id=request.trace_id if request else ZERO_TRACE_ID,
+        trace_id=request.trace_id if request else (trace_id or ZERO_TRACE_ID),
         success=False,
         payload={
             'error_code': error.error_code,
@@ -246,49 +377,93 @@ def response_from_error(
     )
 
 
+@cache
+def control_frame(method_name: str, codec: BaseCodec) -> bytes:
+    """Control frame is not an answer to any request, peers compare frames with it byte to byte."""
+    return Response(
+        method_name=method_name,
+        trace_id=ZERO_TRACE_ID,
+        success=True,
+    ).dump(codec)
+
+
+def drain_notice(codec: BaseCodec) -> bytes:
+    """Sent by server to connected clients on shutdown, asking them to stop sending requests."""
+    return control_frame(DRAIN_METHOD, codec)
+
+
+def ping_frame(codec: BaseCodec) -> bytes:
+    """Sent by server to idle clients, which agreed to keepalive in handshake, they answer with `pong_frame`."""
+    return control_frame(PING_METHOD, codec)
+
+
+def pong_frame(codec: BaseCodec) -> bytes:
+    return control_frame(PONG_METHOD, codec)
+
+
 if __name__ == '__main__':
+    import timeit
+    from collections.abc import Callable
+
     from rich import print
 
     from shiny_rpc.examples import (
+        ExampleListResponse,
         ExampleRequest,
         ExampleResponse,
         example_request_values,
         example_response_values,
     )
 
-    @compute_average_time
-    def make_request_response() -> tuple[Request, Response]:
-        return (
-            ExampleRequest(
-                method_name='first_method',
-                trace_id=str(uuid4()),
-                payload=example_request_values,
-            ),
-            ExampleResponse(
-                method_name='first_method',
-                trace_id=str(uuid4()),
-                success=True,
-                payload=example_response_values,
-            ),
-        )
+    def measure(name: str, function: Callable[[], object], number: int) -> None:
+        # The best of several runs is the least disturbed by other processes
+        seconds = min(timeit.repeat(function, number=number, repeat=7)) / number
+        print(f'{name}: {seconds * 1_000_000:.1f} us per call')
 
-    req, resp = make_request_response()
+    req = ExampleRequest(
+        method_name='first_method',
+        trace_id=str(uuid4()),
+        payload=example_request_values,
+    )
+    resp = ExampleResponse(
+        method_name='first_method',
+        trace_id=str(uuid4()),
+        success=True,
+        payload=example_response_values,
+    )
 
-    @compute_average_time
-    def dump_request_response(request: ExampleRequest, response: ExampleResponse) -> tuple[bytes, bytes]:
-        return (
-            request.dump(),
-            response.dump(),
-        )
+    def dump_via_dict(message: Request | Response, marker: bytes) -> bytes:
+        # Previous dump() implementation, kept here as benchmark baseline
+        return b''.join([
+            message.method_name.encode('utf-8'),
+            marker,
+            orjson.dumps(message.PayloadSchema.model_dump(message.payload)),
+            orjson.dumps(message.HeadersSchema.model_dump(message.headers)),
+        ])
 
-    dumped_req, dumped_resp = dump_request_response(req, resp)
+    measure('ExampleRequest dump via dict', lambda: dump_via_dict(req, b''), 10_000)
+    measure('ExampleRequest.dump', req.dump, 10_000)
+    measure('ExampleResponse dump via dict', lambda: dump_via_dict(resp, b':ok'), 10_000)
+    measure('ExampleResponse.dump', resp.dump, 10_000)
 
-    @compute_average_time
-    def load_request_response(raw_request: bytes, raw_response: bytes) -> tuple[Request, Response]:
-        return (
-            ExampleRequest.load(raw_request),
-            ExampleResponse.load(raw_response),
-        )
+    dumped_req, dumped_resp = req.dump(), resp.dump()
 
-    req, resp = load_request_response(dumped_req, dumped_resp)
-    print(req, resp, sep='\n')
+    list_response = ExampleListResponse(
+        method_name='first_method',
+        trace_id=str(uuid4()),
+        success=True,
+        payload={'objects': [example_request_values['object_field']] * 2000},
+    )
+    dumped_list_resp = list_response.dump()
+
+    # from_bytes validates straight from JSON, load builds dicts with orjson first
+    measure('ExampleRequest.load', lambda: ExampleRequest.load(dumped_req), 10_000)
+    measure('ExampleRequest.from_bytes', lambda: ExampleRequest.from_bytes(dumped_req), 10_000)
+    measure('ExampleResponse.load', lambda: ExampleResponse.load(dumped_resp), 10_000)
+    measure('ExampleResponse.from_bytes', lambda: ExampleResponse.from_bytes(dumped_resp), 10_000)
+    measure('ExampleListResponse.load, 2000 objects', lambda: ExampleListResponse.load(dumped_list_resp), 20)
+    measure(
+        'ExampleListResponse.from_bytes, 2000 objects',
+        lambda: ExampleListResponse.from_bytes(dumped_list_resp),
+        20,
+    )
@@ -0,0 +1,243 @@
+import re
+from mmap import mmap
+
+from shiny_rpc.errors import InvalidMessageFormatError
+
+OPENING_CURLY_BRACE = ord('{')
+CLOSING_CURLY_BRACE = ord('}')
+QUOTE = ord('"')
+BACKSLASH = ord('\\')
+
+SUCCESS_MARKERS = {
+    b'ok': True,
+    b'err': False,
+    b'end': True,
+}
+END_OF_STREAM_MARKER = b'end'
+SEQUENCE_SEPARATOR = b'@'
+# Colon after key and value: string with its escapes, or any other token up to the end of it
+KEY_VALUE = re.compile(rb'\s*:\s*("[^"\\]*(?:\\.[^"\\]*)*"|[^\s,}\]"][^\s,}\]]*)', re.DOTALL)
+
+# Chunked requests are passed as mmap of temporary file, see `ChunkedUpload`
+type Buffer = bytes | bytearray | memoryview | mmap
+
+
+class ParsedMessage:
+
+    """
+    Boundaries of `method_name[:ok|:err|:end[@sequence]]{payload}{headers}` message.
+
+    Payload and headers are exposed as memoryview slices of source buffer,
+    so nothing is copied or decoded until JSON parser takes them.
+    """
+
+    buffer: bytes | bytearray | mmap
+    method_name: str
+    success: bool | None
+    sequence: int | None
+    end_of_stream: bool
+    payload_start: int
+    headers_start: int
+
+    def __init__(
+        self,
+        buffer: bytes | bytearray | mmap,
+        method_name: str,
+        payload_start: int,
+        headers_start: int,
+        success: bool | None = None,
+        sequence: int | None = None,
+        *,
+        end_of_stream: bool = False,
+    ) -> None:
+        self.buffer = buffer
+        self.method_name = method_name
+        self.payload_start = payload_start
+        self.headers_start = headers_start
+        self.success = success
+        self.sequence = sequence
+        self.end_of_stream = end_of_stream
+
+    @property
+    def payload(self) -> memoryview:
+        return memoryview(self.buffer)[self.payload_start:self.headers_start]
+
+    @property
+    def headers(self) -> memoryview:
+        return memoryview(self.buffer)[self.headers_start:]
+
+
+def _to_buffer(data: Buffer | str) -> bytes | bytearray | mmap:
+    if isinstance(data, bytes | bytearray | mmap):
+        return data
+
+    if isinstance(data, str):
+        return data.encode('utf-8')
+
+    return data.tobytes()
+
+
+def _find_opening_quote(buffer: bytes | bytearray | mmap, closing_quote_at: int) -> int:
+    position = closing_quote_at
+
+    while True:
+        position = buffer.rfind(b'"', 0, position)
+        if position == -1:
+            raise InvalidMessageFormatError
+
+        backslashes = 0
+        while position > backslashes and buffer[position - backslashes - 1] == BACKSLASH:
+            backslashes += 1
+
+        if backslashes % 2 == 0:
+            return position
+
+
+def _find_headers_start(buffer: bytes | bytearray | mmap, payload_start: int) -> int:
+    """
+    Matches curly braces backwards from the end of message.
+
+    Headers are the last (and usually the smallest) JSON object in message,
+    so only they are walked, jumping between structural characters with `rfind`.
+    """
+    end = len(buffer) - 1
+    if end <= payload_start or buffer[end] != CLOSING_CURLY_BRACE:
+        raise InvalidMessageFormatError
+
+    depth = 1
+    position = end
+    opening_at = buffer.rfind(b'{', payload_start, position)
+    closing_at = buffer.rfind(b'}', payload_start, position)
+    quote_at = buffer.rfind(b'"', payload_start, position)
+
+    while True:
+        position = max(opening_at, closing_at, quote_at)
+        if position <= payload_start:
+            raise InvalidMessageFormatError
+
+        character = buffer[position]
+
+        if character == QUOTE:
+            position = _find_opening_quote(buffer, position)
+            quote_at = buffer.rfind(b'"', payload_start, position)
+            if opening_at > position:
+                opening_at = buffer.rfind(b'{', payload_start, position)
+            if closing_at > position:
+                closing_at = buffer.rfind(b'}', payload_start, position)
+            continue
+
+        if character == CLOSING_CURLY_BRACE:
+            depth += 1
+            closing_at = buffer.rfind(b'}', payload_start, position)
+            continue
+
+        depth -= 1
+        if depth == 0:
+            return position
+
+        opening_at = buffer.rfind(b'{', payload_start, position)
+
+
+def _decode_method_name(raw_method_name: bytes | bytearray) -> str:
+    if not raw_method_name:
+        raise InvalidMessageFormatError
+
+    try:
+        return raw_method_name.decode('utf-8')
+    except UnicodeDecodeError as error:
+        raise InvalidMessageFormatError from error
+
+
+def find_method_name(data: Buffer | str) -> str:
+    buffer = _to_buffer(data)
+
+    payload_start = buffer.find(b'{')
+    if payload_start == -1:
+        raise InvalidMessageFormatError
+
+    return _decode_method_name(buffer[:payload_start])
+
+
+def parse_request(data: Buffer | str) -> ParsedMessage:
+    buffer = _to_buffer(data)
+
+    payload_start = buffer.find(b'{')
+    if payload_start == -1:
+        raise InvalidMessageFormatError
+
+    return ParsedMessage(
+        buffer=buffer,
+        method_name=_decode_method_name(buffer[:payload_start]),
+        payload_start=payload_start,
+        headers_start=_find_headers_start(buffer, payload_start),
+    )
+
+
+def find_header_value(data: Buffer | str, name: str) -> bytes | None:
+    """
+    Returns encoded value of `name` key of headers, walking only them, so payload is neither scanned nor matched.
+
+    Quoted name followed by colon is always a key, unless its opening quote is escaped.
+    """
+    buffer = _to_buffer(data)
+
+    payload_start = buffer.find(b'{')
+    if payload_start == -1:
+        raise InvalidMessageFormatError
+
+    key = b'"' + name.encode('utf-8') + b'"'
+
+    position = _find_headers_start(buffer, payload_start)
+    while (position := buffer.find(key, position + 1)) != -1:
+        backslashes = 0
+        while position > backslashes and buffer[position - backslashes - 1] == BACKSLASH:
+            backslashes += 1
+
+        if backslashes % 2 == 0 and (match := KEY_VALUE.match(buffer, position + len(key))):
+            return match.group(1)
+
+    return None
+
+
+def parse_stream_marker(marker: bytes | bytearray) -> tuple[bool, int | None, bool]:
+    """Returns success, sequence number and end-of-stream flag of `ok|err|end[@sequence]` marker."""
+    status, separator, raw_sequence = marker.partition(SEQUENCE_SEPARATOR)
+    if status not in SUCCESS_MARKERS:
+        raise InvalidMessageFormatError
+
+    if not separator:
+        if status == END_OF_STREAM_MARKER:
+            raise InvalidMessageFormatError
+
+        return SUCCESS_MARKERS[bytes(status)], None, False
+
+    if not raw_sequence.isdigit():
+        raise InvalidMessageFormatError
+
+    # Stream is finished by `end` marker or by an error
+    return SUCCESS_MARKERS[bytes(status)], int(raw_sequence), status != b'ok'
+
+
+def parse_response(data: Buffer | str) -> ParsedMessage:
+    buffer = _to_buffer(data)
+
+    payload_start = buffer.find(b'{')
+    if payload_start == -1:
+        raise InvalidMessageFormatError
+
+    raw_method_name, separator, marker = buffer[:payload_start].partition(b':')
+    if not separator:
+        raise InvalidMessageFormatError
+
+    success, sequence, end_of_stream = parse_stream_marker(marker)
+
+    return ParsedMessage(
+        buffer=buffer,
+        method_name=_decode_method_name(raw_method_name),
+        payload_start=payload_start,
+        headers_start=_find_headers_start(buffer, payload_start),
+        success=success,
+        sequence=sequence,
+        end_of_stream=end_of_stream,
+    )
+
@@ -0,0 +1,167 @@
+import asyncio
+from collections import deque
+from collections.abc import Iterable
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
+
+from pydantic import Field
+
+from shiny_rpc.constants import PUSH_METHOD, PUSH_TRACE_ID
+from shiny_rpc.framing import (
+    BaseFraming,
+    FramingMode,
+    make_framing,
+)
+from shiny_rpc.ifaces import UserIface
+from shiny_rpc.messages import Request, Response
+from shiny_rpc.schema import BasePayloadSchema
+
+if TYPE_CHECKING:
+    from shiny_rpc.codec import BaseCodec
+    from shiny_rpc.compression import Compression
+
+
+class SubscribeRequest(Request):
+    class PayloadSchema(BasePayloadSchema):
+        topics: list[str]
+
+
+class SubscribeResponse(Response):
+    class PayloadSchema(BasePayloadSchema):
+        # All topics of connection after subscribe or unsubscribe
+        topics: list[str]
+
+
+class PushMessage(Response):
+    class PayloadSchema(BasePayloadSchema):
+        topic: str
+        data: dict[str, Any] = Field(default_factory=dict)
+
+
+class PubSub:
+
+    """
+    Topics subscribed by connections, messages published to topic are pushed to all its subscribers.
+
+    Message is encoded once for every codec and compression in use, subscribers with the same ones get the same frame.
+    Frame is written at once, unless connection is congested, then it waits in subscriber queue of up to `max_queue`
+    frames. When slow subscriber falls behind, its oldest frames are dropped, so it can`t hold unbounded memory.
+    """
+
+    framing: BaseFraming
+    max_queue: int
+    # Subscribed users of every topic by connection id
+    subscribers: dict[str, dict[int, UserIface]]
+    # Frames not written yet and tasks writing them, only for users with pushes in progress
+    queues: dict[int, deque[bytes]]
+    senders: dict[int, asyncio.Task[None]]
+
+    # Counters since server start
+    published: int
+    pushed: int
+    dropped: int
+
+    def __init__(
+        self,
+        framing: BaseFraming | None = None,
+        max_queue: int = 2**10,  # 1024
+    ) -> None:
+        # Replaced by server with its framing
+        self.framing = framing or make_framing(mode=FramingMode.SEPARATOR, max_message_size=2**20)
+        self.max_queue = max_queue
+        self.subscribers = {}
+        self.queues = {}
+        self.senders = {}
+
+        self.published = 0
+        self.pushed = 0
+        self.dropped = 0
+
+    def subscribe(self, user: UserIface, topics: Iterable[str]) -> None:
+        for topic in topics:
+            self.subscribers.setdefault(topic, {})[user.connection_id] = user
+            user.topics.add(topic)
+
+    def unsubscribe(self, user: UserIface, topics: Iterable[str]) -> None:
+        for topic in topics:
+            user.topics.discard(topic)
+
+            subscribers = self.subscribers.get(topic, {})
+            subscribers.pop(user.connection_id, None)
+            if not subscribers:
+                self.subscribers.pop(topic, None)
+
+    def remove(self, user: UserIface) -> None:
+        """Unsubscribes disconnected user from all its topics and drops its pending frames."""
+        self.unsubscribe(user, list(user.topics))
+
+        if (sender := self.senders.pop(user.connection_id, None)) is not None:
+            sender.cancel()
+        self.queues.pop(user.connection_id, None)
+
+    def publish(
+        self,
+        topic: str,
+        payload: BasePayloadSchema | dict[str, Any] | None = None,
+    ) -> int:
+        """Queues message to every subscriber of topic and returns their number, it doesn`t wait for writes."""
+        self.published += 1
+        if not (subscribers := self.subscribers.get(topic)):
+            return 0
+
+        message = PushMessage(
+            method_name=PUSH_METHOD,
+            trace_id=PUSH_TRACE_ID,
+            success=True,
+            payload={
+                'topic': topic,
+                'data': payload.model_dump() if isinstance(payload, BasePayloadSchema) else payload or {},
+            },
+        )
+        frames: dict[tuple[BaseCodec, Compression | None], bytes] = {}
+
+        for user in subscribers.values():
+            if (frame := frames.get((user.codec, user.compression))) is None:
+                frame = frames[user.codec, user.compression] = message.dump(user.codec)
+                if user.compression:
+                    frame = frames[user.codec, user.compression] = user.compression.compress(frame)
+
+            self._push(user, frame)
+
+        return len(subscribers)
+
+    def _push(self, user: UserIface, frame: bytes) -> None:
+        if (queue := self.queues.get(user.connection_id)) is None:
+            if not user.output.is_congested:
+                self.framing.write(user.output, frame)
+                self.pushed += 1
+                return
+
+            queue = self.queues[user.connection_id] = deque()
+            self.senders[user.connection_id] = asyncio.create_task(self._send(user, queue))
+        elif len(queue) >= self.max_queue:
+            queue.popleft()
+            self.dropped += 1
+
+        queue.append(frame)
+
+    async def _send(self, user: UserIface, queue: deque[bytes]) -> None:
+        # Connection task notices disconnection itself
+        with suppress(ConnectionError):
+            while queue:
+                self.framing.write(user.output, queue.popleft())
+                self.pushed += 1
+                # Waits only while client doesn`t read, frames published meanwhile are queued
+                await user.output.drain()
+
+        # Next publish starts new task, so idle subscribers have no tasks
+        self.queues.pop(user.connection_id, None)
+        self.senders.pop(user.connection_id, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'pubsub_topics': len(self.subscribers),
+            'pubsub_published': self.published,
+            'pubsub_pushed': self.pushed,
+            'pubsub_dropped': self.dropped,
+        }
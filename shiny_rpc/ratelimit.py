@@ -0,0 +1,219 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from shiny_rpc.codec import BaseCodec
+from shiny_rpc.constants import BATCH_METHOD, ZERO_TRACE_ID
+from shiny_rpc.errors import (
+    InvalidMessageFormatError,
+    RateLimitedError,
+    ServerFatalError,
+    ValidationError,
+)
+from shiny_rpc.ifaces import UserIface
+from shiny_rpc.messages import response_from_error
+from shiny_rpc.parser import Buffer
+
+# Least recently seen identities are dropped above this number, so requests with random identities can`t grow memory
+MAX_IDENTITIES = 2**16
+
+
+class TokenBucket:
+    # One per connection and identity, so it has no __dict__
+    __slots__ = ('tokens', 'updated_at')
+
+    tokens: float
+    updated_at: float
+
+    def __init__(self, tokens: float, updated_at: float) -> None:
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class RateLimit:
+
+    """Token bucket limit: `rate` requests per second on average, up to `burst` of them at once."""
+
+    rate: float
+    burst: float
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        if rate <= 0:
+            raise ServerFatalError(details={'rate_limit': 'rate must be positive'})
+
+        self.rate = rate
+        self.burst = max(burst if burst is not None else rate, 1.0)
+
+    @property
+    def retry_after(self) -> float:
+        # Time to earn one token, it is the hint for rejected requests
+        return 1 / self.rate
+
+    def refill(self, bucket: TokenBucket, now: float) -> bool:
+        """Adds tokens earned since last refill and returns, whether bucket has a token for request."""
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated_at) * self.rate)
+        bucket.updated_at = now
+        return bucket.tokens >= 1
+
+    def __str__(self) -> str:
+        return f'{self.rate}/sec, burst {self.burst}'
+
+
+class RateLimiter:
+
+    """
+    Checks requests against token buckets of their connection, identity and method, before payload is decoded.
+
+    Request takes a token from each of its buckets, only when all of them have one.
+    Identity is request header, e.g. `service_id`, so client can`t get more by opening more connections.
+    It is looked up right in encoded request, while connection and method buckets need at most method name.
+    Rejected request gets pre-encoded `RateLimited` error with its trace_id patched in.
+    Batch envelope takes no tokens, message handler checks each of its requests instead.
+    """
+
+    per_connection: RateLimit | None
+    per_identity: RateLimit | None
+    identity_header: str | None
+    per_method: dict[str, RateLimit]
+    enabled: bool
+
+    connections: dict[int, TokenBucket]
+    # Ordered from least to most recently seen, see `_identity_bucket`
+    identities: OrderedDict[str, TokenBucket]
+    methods: dict[str, tuple[RateLimit, TokenBucket]]
+    # Encoded errors around zero trace_id for every scope, limit and codec
+    frames: dict[tuple[str, RateLimit, BaseCodec], tuple[bytes, bytes]]
+
+    # Counters of rejected requests by scope since server start
+    limited: dict[str, int]
+
+    def __init__(
+        self,
+        per_connection: RateLimit | None = None,
+        per_identity: RateLimit | None = None,
+        identity_header: str | None = None,
+        per_method: dict[str, RateLimit] | None = None,
+    ) -> None:
+        if per_identity and not identity_header:
+            raise ServerFatalError(details={'identity_rate_limit': 'requires identity_header'})
+
+        self.per_connection = per_connection
+        self.per_identity = per_identity
+        self.identity_header = identity_header
+        self.per_method = per_method or {}
+        self.enabled = bool(per_connection or per_identity or self.per_method)
+
+        now = time.monotonic()
+        self.connections = {}
+        self.identities = OrderedDict()
+        self.methods = {
+            method_name: (limit, TokenBucket(limit.burst, now))
+            for method_name, limit in self.per_method.items()
+        }
+        self.frames = {}
+
+        self.limited = {'connection': 0, 'identity': 0, 'method': 0}
+
+    def check(self, user: UserIface, data: Buffer) -> bytes | None:
+        """Returns encoded error to send instead of handling request, when any of its buckets is empty."""
+        if not self.enabled:
+            return None
+
+        try:
+            method_name = user.codec.find_method_name(data)
+        except InvalidMessageFormatError:
+            # Invalid request is answered by handler, it is limited only per connection
+            method_name = None
+
+        if method_name == BATCH_METHOD:
+            return None
+
+        now = time.monotonic()
+        connection_bucket = identity_bucket = method_bucket = None
+
+        if self.per_connection:
+            if (connection_bucket := self.connections.get(user.connection_id)) is None:
+                connection_bucket = self.connections[user.connection_id] = TokenBucket(self.per_connection.burst, now)
+
+            if not self.per_connection.refill(connection_bucket, now):
+                return self._reject('connection', self.per_connection, user.codec, data)
+
+        if method_name is not None and (method := self.methods.get(method_name)) is not None:
+            method_limit, method_bucket = method
+            if not method_limit.refill(method_bucket, now):
+                return self._reject('method', method_limit, user.codec, data)
+
+        if self.per_identity:
+            identity = self._find_header(user.codec, data, self.identity_header)  # type:ignore[arg-type]
+            if identity is not None:
+                identity_bucket = self._identity_bucket(str(identity), now)
+                if not self.per_identity.refill(identity_bucket, now):
+                    return self._reject('identity', self.per_identity, user.codec, data)
+
+        if connection_bucket is not None:
+            connection_bucket.tokens -= 1
+        if method_bucket is not None:
+            method_bucket.tokens -= 1
+        if identity_bucket is not None:
+            identity_bucket.tokens -= 1
+
+        return None
+
+    def _identity_bucket(self, identity: str, now: float) -> TokenBucket:
+        if (bucket := self.identities.get(identity)) is not None:
+            self.identities.move_to_end(identity)
+            return bucket
+
+        if len(self.identities) >= MAX_IDENTITIES:
+            # Identity, which is not seen for the longest time, starts with full bucket, if it comes back
+            self.identities.popitem(last=False)
+
+        bucket = self.identities[identity] = TokenBucket(self.per_identity.burst, now)  # type:ignore[union-attr]
+        return bucket
+
+    @staticmethod
+    def _find_header(codec: BaseCodec, data: Buffer, name: str) -> Any:  # noqa:ANN401
+        try:
+            return codec.find_raw_header(data, name)
+        except (InvalidMessageFormatError, ValidationError):
+            # Invalid request is answered by handler, or rejected without its trace_id
+            return None
+
+    def _reject(
+        self,
+        scope: str,
+        limit: RateLimit,
+        codec: BaseCodec,
+        data: Buffer,
+    ) -> bytes:
+        self.limited[scope] += 1
+
+        if (frame := self.frames.get((scope, limit, codec))) is None:
+            encoded = response_from_error(RateLimitedError(scope, limit.retry_after)).dump(codec)
+            position = encoded.rfind(ZERO_TRACE_ID.encode())
+            frame = self.frames[scope, limit, codec] = encoded[:position], encoded[position + len(ZERO_TRACE_ID):]
+
+        trace_id = self._find_header(codec, data, 'trace_id')
+        if not isinstance(trace_id, str) or not trace_id:
+            return ZERO_TRACE_ID.encode().join(frame)
+
+        # Headers are not validated, so only trace_id, which needs no escaping, is patched in as is.
+        # Its encoded length must not change either, codec may prefix strings with their length
+        if len(trace_id) != len(ZERO_TRACE_ID) or not (trace_id.isascii() and trace_id.replace('-', '').isalnum()):
+            return response_from_error(RateLimitedError(scope, limit.retry_after), trace_id=trace_id).dump(codec)
+
+        return trace_id.encode().join(frame)
+
+    def remove(self, user: UserIface) -> None:
+        self.connections.pop(user.connection_id, None)
+
+    def stats(self) -> dict[str, int]:
+        return {f'rate_limited_{scope}': count for scope, count in self.limited.items()}
+
+    def __str__(self) -> str:
+        limits = {
+            'connection': self.per_connection,
+            f'identity by {self.identity_header}': self.per_identity,
+            **{f'method {method_name}': limit for method_name, limit in self.per_method.items()},
+        }
+        return ', '.join(f'{scope}: {limit}' for scope, limit in limits.items() if limit)
@@ -0,0 +1,242 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from typing import Any, Self
+
+from shiny_rpc.address import Address
+from shiny_rpc.client import BaseClient
+from shiny_rpc.codec import BaseCodec
+from shiny_rpc.errors import (
+    ClientFatalError,
+    ExternalError,
+    InvalidMessageFormatError,
+    UnknownMethodError,
+    UpstreamUnavailableError,
+    ValidationError,
+)
+from shiny_rpc.ifaces import UserIface
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Request, response_from_error
+from shiny_rpc.parser import Buffer
+from shiny_rpc.server import Server
+
+
+class Upstream(BaseClient):
+
+    """Pipelined connection to backend server, shared by all router users with the same codec."""
+
+    async def forward(
+        self,
+        data: Buffer,
+        trace_id: str,
+    ) -> AsyncGenerator[bytes, None]:
+        """Sends encoded request as is and yields encoded responses, until the last frame of stream."""
+        if trace_id in self.pending:
+            raise InvalidMessageFormatError
+
+        try:
+            async with aclosing(self._exchange(bytes(data), trace_id)) as frames:
+                async for frame in frames:
+                    yield frame
+        except ClientFatalError as error:
+            raise UpstreamUnavailableError(str(self.address)) from error
+
+
+class UpstreamPool:
+
+    """Backend servers for one route, requests are spread between them by round-robin."""
+
+    addresses: list[tuple[str, int]]
+    client_kwargs: dict[str, Any]
+    upstreams: dict[tuple[str, int, str], Upstream]
+    position: int
+    lock: asyncio.Lock
+
+    def __init__(
+        self,
+        addresses: list[tuple[str, int]],
+        **client_kwargs: Any,  # noqa:ANN401
+    ) -> None:
+        self.addresses = addresses
+        self.client_kwargs = {'max_in_flight': 2**10, **client_kwargs}
+        self.upstreams = {}
+        self.position = 0
+        self.lock = asyncio.Lock()
+
+    async def _connect(
+        self,
+        host: str,
+        port: int,
+        codec: BaseCodec,
+    ) -> Upstream:
+        key = (host, port, codec.name)
+
+        upstream = self.upstreams.get(key)
+        if upstream and upstream.is_connected and not upstream.is_draining:
+            return upstream
+
+        # Upstream, which is shutting down, still delivers responses to forwarded requests
+
+        upstream = Upstream(
+            host=host,
+            port=port,
+            codec=codec.name,
+            **self.client_kwargs,
+        )
+        await upstream.connect()
+
+        # Frames are forwarded as is, so backend must speak the same codec as user
+        if upstream.codec is not codec:
+            raise UpstreamUnavailableError(str(upstream.address))
+
+        self.upstreams[key] = upstream
+        return upstream
+
+    async def get(self, codec: BaseCodec) -> Upstream:
+        async with self.lock:
+            for _ in self.addresses:
+                host, port = self.addresses[self.position % len(self.addresses)]
+                self.position += 1
+
+                try:
+                    return await self._connect(host, port, codec)
+                except (ClientFatalError, UpstreamUnavailableError):
+                    continue
+
+        raise UpstreamUnavailableError(
+            ', '.join(str(Address(host, port)) for host, port in self.addresses),
+        )
+
+
+class Router:
+
+    """Routing table from method name prefixes to upstream pools, the longest matching prefix wins."""
+
+    routes: dict[str, UpstreamPool]
+    method_pools: dict[str, UpstreamPool | None]
+
+    def __init__(self) -> None:
+        self.routes = {}
+        self.method_pools = {}
+
+    def include(
+        self,
+        router: Self,
+    ) -> None:
+        self.routes.update(router.routes)
+        self.method_pools.clear()
+
+    def add_route(
+        self,
+        prefix: str,
+        upstreams: list[tuple[str, int]],
+        **client_kwargs: Any,  # noqa:ANN401
+    ) -> None:
+        self.routes[prefix] = UpstreamPool(
+            addresses=upstreams,
+            **client_kwargs,
+        )
+        self.method_pools.clear()
+
+    def find_pool(self, method_name: str) -> UpstreamPool | None:
+        if method_name not in self.method_pools:
+            prefix = max(
+                (prefix for prefix in self.routes if method_name.startswith(prefix)),
+                key=len,
+                default=None,
+            )
+            self.method_pools[method_name] = self.routes[prefix] if prefix is not None else None
+
+        return self.method_pools[method_name]
+
+
+class RouterServer(Server):
+
+    """
+    Gateway, which forwards raw frames to upstream servers without decoding payload.
+
+    Only method name and trace_id of request are read to choose upstream and match responses.
+    """
+
+    router: Router
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        router: Router,
+        **kwargs: Any,  # noqa:ANN401
+    ) -> None:
+        super().__init__(
+            host=host,
+            port=port,
+            message_handler=MessageHandler(),
+            **kwargs,
+        )
+        self.router = router
+
+    async def _forward(
+        self,
+        user: UserIface,
+        upstream: Upstream,
+        data: Buffer,
+        trace_id: str,
+    ) -> None:
+        async with aclosing(upstream.forward(data, trace_id)) as frames:
+            async for frame in frames:
+                if user.connection_id not in self.users:
+                    return
+
+                try:
+                    self._write_message(user, frame)
+                    await user.output.drain()
+                except BrokenPipeError:
+                    await self._user_disconnected(user)
+                    return
+
+    async def _handle_message(
+        self,
+        user: UserIface,
+        data: Buffer,
+    ) -> None:
+        try:
+            method_name = user.codec.find_method_name(data)
+            trace_id = user.codec.find_trace_id(data)
+        except ValidationError as error:
+            await self._send_error(user=user, error=error)
+            return
+
+        if self.log_messages:
+            self.logger.debug(f'{user.address}: {method_name} {trace_id}')
+
+        pool = self.router.find_pool(method_name)
+        if not pool:
+            await self._send_response(
+                user=user,
+                response=response_from_error(UnknownMethodError(method_name), trace_id=trace_id),
+            )
+            return
+
+        try:
+            if not trace_id:
+                raise InvalidMessageFormatError
+
+            await self._forward(
+                user=user,
+                upstream=await pool.get(user.codec),
+                data=data,
+                trace_id=trace_id,
+            )
+        except ExternalError as error:
+            await self._send_response(
+                user=user,
+                response=response_from_error(
+                    error,
+                    Request(method_name=method_name, trace_id=trace_id),
+                ),
+            )
+
+    async def _connect(self) -> None:
+        self.logger.info(f'Available routes: {list(self.router.routes.keys())}')
+
+        await super()._connect()
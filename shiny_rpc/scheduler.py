@@ -0,0 +1,192 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+from enum import IntEnum
+
+from shiny_rpc.errors import MethodOverloadedError
+
+
+class Priority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class MethodLimits:
+    # Calls of method handled at once, unlimited by default
+    max_concurrency: int | None
+    priority: Priority
+    # Calls waiting for a slot, next ones are rejected
+    max_queue: int
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        priority: Priority = Priority.NORMAL,
+        max_queue: int = 2**10,  # 1024
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.priority = priority
+        self.max_queue = max_queue
+
+
+DEFAULT_LIMITS = MethodLimits()
+
+
+class MethodQueue:
+    limits: MethodLimits
+    running: int
+    waiters: deque[tuple[float, asyncio.Future[None]]]
+
+    # Counters since server start
+    started: int
+    queued: int
+    rejected: int
+    total_wait_time: float
+    max_wait_time: float
+
+    def __init__(self, limits: MethodLimits) -> None:
+        self.limits = limits
+        self.running = 0
+        self.waiters = deque()
+
+        self.started = 0
+        self.queued = 0
+        self.rejected = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'running': self.running,
+            'waiting': len(self.waiters),
+            'started': self.started,
+            'queued': self.queued,
+            'rejected': self.rejected,
+            'avg_wait_ms': int(self.total_wait_time / self.queued * 1000) if self.queued else 0,
+            'max_wait_ms': int(self.max_wait_time * 1000),
+        }
+
+
+class Scheduler:
+
+    """
+    Starts method calls within per-method and total concurrency limits.
+
+    Calls above limits wait in per-method queues. Free slot goes to the waiting call with the best priority,
+    waiting call is raised by one priority class every `aging_interval` seconds, so low priority calls are not starved.
+    Calls above `max_queue` of their method are rejected with retryable error.
+    """
+
+    # Shared with message handler, so methods added later are limited too
+    limits: dict[str, MethodLimits]
+    max_concurrency: int | None
+    aging_interval: float
+
+    queues: dict[str, MethodQueue]
+    running: int
+
+    def __init__(
+        self,
+        limits: dict[str, MethodLimits],
+        max_concurrency: int | None = None,
+        aging_interval: float = 1.0,
+    ) -> None:
+        self.limits = limits
+        self.max_concurrency = max_concurrency
+        self.aging_interval = aging_interval
+
+        self.queues = {}
+        self.running = 0
+
+    def _get_queue(self, method_name: str) -> MethodQueue:
+        if (queue := self.queues.get(method_name)) is None:
+            queue = self.queues[method_name] = MethodQueue(self.limits.get(method_name, DEFAULT_LIMITS))
+
+        return queue
+
+    def _can_start(self, queue: MethodQueue) -> bool:
+        return (
+            (self.max_concurrency is None or self.running < self.max_concurrency)
+            and (queue.limits.max_concurrency is None or queue.running < queue.limits.max_concurrency)
+        )
+
+    def _start(self, queue: MethodQueue, wait_time: float | None = None) -> None:
+        queue.running += 1
+        queue.started += 1
+        self.running += 1
+
+        if wait_time is not None:
+            queue.total_wait_time += wait_time
+            queue.max_wait_time = max(queue.max_wait_time, wait_time)
+
+    def _effective_priority(self, queue: MethodQueue, now: float) -> float:
+        enqueued_at, _ = queue.waiters[0]
+        return queue.limits.priority - (now - enqueued_at) / self.aging_interval
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+
+        while candidates := [queue for queue in self.queues.values() if queue.waiters and self._can_start(queue)]:
+            queue = min(candidates, key=lambda queue: self._effective_priority(queue, now))
+            enqueued_at, future = queue.waiters.popleft()
+
+            # Waiter may be cancelled, while its task is not resumed yet
+            if future.done():
+                continue
+
+            self._start(queue, now - enqueued_at)
+            future.set_result(None)
+
+    async def acquire(self, method_name: str) -> None:
+        queue = self._get_queue(method_name)
+
+        # Waiters left after dispatch are blocked by limits, so new call can`t jump over them
+        if not queue.waiters and self._can_start(queue):
+            self._start(queue)
+            return
+
+        if len(queue.waiters) >= queue.limits.max_queue:
+            queue.rejected += 1
+            raise MethodOverloadedError(method_name, queue.limits.max_queue)
+
+        waiter = (time.monotonic(), asyncio.get_running_loop().create_future())
+        queue.waiters.append(waiter)
+        queue.queued += 1
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            if waiter[1].cancelled():
+                with suppress(ValueError):
+                    queue.waiters.remove(waiter)
+            else:
+                # Slot was given right before cancellation
+                self.release(method_name)
+            raise
+
+    def release(self, method_name: str) -> None:
+        queue = self.queues[method_name]
+        queue.running -= 1
+        self.running -= 1
+
+        self._dispatch()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {method_name: queue.stats() for method_name, queue in self.queues.items()}
+
+    def total_stats(self) -> dict[str, int]:
+        return {
+            'scheduled_running': self.running,
+            'scheduled_waiting': sum(len(queue.waiters) for queue in self.queues.values()),
+            'scheduled_rejected': sum(queue.rejected for queue in self.queues.values()),
+        }
+
+    def __str__(self) -> str:
+        limits = {
+            method_name: f'{limits.priority.name.lower()}, {limits.max_concurrency or 'unlimited'}'
+            for method_name, limits in self.limits.items()
+            if limits.max_concurrency or limits.priority != Priority.NORMAL
+        }
+        return f'{self.max_concurrency or 'unlimited'} calls at once, methods: {limits}'
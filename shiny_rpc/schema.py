@@ -21,3 +21,5 @@ class BasePayloadSchema(BaseSchema):
 
 class BaseHeadersSchema(BaseSchema):
     trace_id: str | None = None
+    # Unix timestamp, after which client doesn`t wait for response anymore
+    deadline: float | None = None
@@ -1,18 +1,66 @@
 import asyncio
+import itertools
 import logging
-from typing import Any
-
-from shiny_rpc.constants import MESSAGE_SEPARATOR
+import signal
+import socket
+import time
+from collections.abc import (
+    AsyncGenerator,
+    Coroutine,
+    Iterator,
+)
+from contextlib import AsyncExitStack, suppress
+from typing import Any, cast
+
+from shiny_rpc.address import Address
+from shiny_rpc.admission import AdmissionControl
+from shiny_rpc.cache import ResponseCache
+from shiny_rpc.codec import (
+    CODECS,
+    JSON_CODEC,
+    BaseCodec,
+    get_codec,
+)
+from shiny_rpc.compression import Compression
+from shiny_rpc.constants import HANDSHAKE_METHOD
 from shiny_rpc.errors import (
     BaseError,
+    ConnectionLimitError,
     ExternalError,
+    InvalidMessageFormatError,
     MaxMessageSizeReceivedError,
     ServerFatalError,
+    ServerShuttingDownError,
+    ValidationError,
     handle_error,
 )
+from shiny_rpc.executor import MethodExecutor
+from shiny_rpc.framing import (
+    BaseFraming,
+    FramingMode,
+    make_framing,
+)
+from shiny_rpc.handshake import (
+    HANDSHAKE_PREFIX,
+    HandshakeRequest,
+    HandshakeResponse,
+)
 from shiny_rpc.ifaces import UserIface
 from shiny_rpc.message_hander import MessageHandler
-from shiny_rpc.messages import Response, response_from_error
+from shiny_rpc.messages import (
+    Response,
+    drain_notice,
+    ping_frame,
+    pong_frame,
+    response_from_error,
+)
+from shiny_rpc.parser import Buffer
+from shiny_rpc.pubsub import PubSub
+from shiny_rpc.ratelimit import RateLimit, RateLimiter
+from shiny_rpc.scheduler import Scheduler
+from shiny_rpc.schema import BasePayloadSchema
+from shiny_rpc.supervisor import Supervisor
+from shiny_rpc.upload import ChunkedUpload
 from shiny_rpc.user import User
 
 
@@ -22,15 +70,52 @@ class Server:
 
     host: str
     port: int
+    # host and port first, then extra listen addresses
+    addresses: list[Address]
     connection_limit: int
+    admission: AdmissionControl
+    # Sent as is to rejected connections, they always start with JSON codec and without compression
+    rejection_message: bytes
     chunk_size: int
     max_message_size: int
+    max_upload_size: int
+    max_in_flight: int
+    # Pools for methods with thread and process execution policies
+    executor: MethodExecutor
+    scheduler: Scheduler
+    # Encoded responses of methods with cache policy
+    cache: ResponseCache
+    # Topics subscribed by users, see `publish`
+    pubsub: PubSub
+    # Token buckets per connection, identity header and method, checked before request is handled
+    rate_limiter: RateLimiter
+    framing: BaseFraming
+    codecs: dict[str, BaseCodec]
+    compressions: dict[str, Compression]
     log_level: int
     log_messages: bool
 
-    server: asyncio.Server
-    users: dict[str, Any]
-
+    # Graceful shutdown: server stops accepting and waits for in-flight requests up to shutdown_grace seconds
+    shutdown_grace: float
+    stopping: asyncio.Event
+    is_draining: bool
+    in_flight: int
+    idle: asyncio.Event
+    connection_tasks: set[asyncio.Task[None]]
+
+    # Users without requests in progress are closed after idle_timeout since their last frame or finished request.
+    # Users, which agreed to keepalive, are pinged after keepalive_interval and closed without answer in keepalive_timeout
+    idle_timeout: float | None
+    keepalive_interval: float | None
+    keepalive_timeout: float
+    reaped_idle: int
+    reaped_dead: int
+
+    servers: list[asyncio.Server]
+    # Already bound sockets for every address (see `Supervisor`)
+    listen_sockets: list[socket.socket] | None
+    connection_ids: Iterator[int]
+    users: dict[int, UserIface]
 
     def __init__(
         self,
@@ -39,23 +124,118 @@ class Server:
         message_handler: MessageHandler,
         *,
         user_class: type[UserIface] = User,
+        listen: list[str] | None = None,
         connection_limit: int = 2 ** 10,  # 1024
+        hard_connection_limit: int | None = None,
+        connection_queue_timeout_ms: int = 5000,  # 5 seconds
         chunk_size: int = 2**15,  # 32 KB
         max_message_size: int = 2**20,  # 1 MB
+        max_upload_size: int = 2**30,  # 1 GB
+        max_in_flight: int = 1,
+        thread_pool_size: int | None = None,
+        process_pool_size: int | None = None,
+        max_concurrency: int | None = None,
+        priority_aging_ms: int = 1000,  # 1 second
+        cache_size: int = 2**26,  # 64 MB
+        push_queue_size: int = 2**10,  # 1024
+        rate_limit: RateLimit | None = None,
+        identity_rate_limit: RateLimit | None = None,
+        identity_header: str | None = None,
+        method_rate_limits: dict[str, RateLimit] | None = None,
+        framing_mode: FramingMode = FramingMode.SEPARATOR,
+        codecs: list[str] | None = None,
+        compression_threshold: int = 2**10,  # 1 KB
+        compression_dictionary: bytes | None = None,
         log_level: int = logging.INFO,
         log_messages: bool = False,
+        shutdown_grace_ms: int = 10000,  # 10 seconds
+        idle_timeout_ms: int | None = None,
+        keepalive_interval_ms: int | None = None,
+        keepalive_timeout_ms: int = 10000,  # 10 seconds
     ) -> None:
         self.message_handler = message_handler
         self.user_class = user_class
 
         self.host = host
         self.port = port
+        self.addresses = [
+            Address(host, port),
+            *(Address.parse(address) for address in listen or []),
+        ]
         self.connection_limit = connection_limit
+        self.admission = AdmissionControl(
+            soft_limit=connection_limit,
+            hard_limit=hard_connection_limit or connection_limit,
+            timeout=connection_queue_timeout_ms / 1000,
+        )
+        self.rejection_message = response_from_error(
+            ConnectionLimitError(connection_limit),
+        ).dump(JSON_CODEC)
         self.chunk_size = chunk_size
         self.max_message_size = max_message_size
+        self.max_upload_size = max_upload_size
+        self.max_in_flight = max_in_flight
+        self.executor = self.message_handler.executor = MethodExecutor(
+            thread_pool_size=thread_pool_size,
+            process_pool_size=process_pool_size,
+        )
+        self.scheduler = self.message_handler.scheduler = Scheduler(
+            limits=self.message_handler.limits,
+            max_concurrency=max_concurrency,
+            aging_interval=priority_aging_ms / 1000,
+        )
+        self.cache = self.message_handler.cache = ResponseCache(max_size=cache_size)
+        self.framing = make_framing(
+            mode=framing_mode,
+            max_message_size=max_message_size,
+        )
+        self.pubsub = self.message_handler.pubsub = PubSub(framing=self.framing, max_queue=push_queue_size)
+        self.rate_limiter = self.message_handler.rate_limiter = RateLimiter(
+            per_connection=rate_limit,
+            per_identity=identity_rate_limit,
+            identity_header=identity_header,
+            per_method=method_rate_limits,
+        )
+        self.codecs = {
+            codec.name: codec
+            for codec in (
+                get_codec(name)
+                for name in (codecs if codecs is not None else CODECS)
+            )
+            if not codec.requires_length_prefix or framing_mode == FramingMode.LENGTH_PREFIXED
+        }
+        # Compressed frames may contain any byte, so they can`t be separated by MESSAGE_SEPARATOR
+        self.compressions = {
+            compression.name: compression
+            for compression in (
+                Compression(
+                    max_message_size=max_message_size,
+                    threshold=compression_threshold,
+                    dictionary=dictionary,
+                )
+                for dictionary in (None, compression_dictionary)
+            )
+        } if framing_mode == FramingMode.LENGTH_PREFIXED else {}
         self.log_level = log_level
         self.log_messages = log_messages
 
+        self.shutdown_grace = shutdown_grace_ms / 1000
+        self.stopping = asyncio.Event()
+        self.is_draining = False
+        self.in_flight = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.connection_tasks = set()
+
+        self.idle_timeout = idle_timeout_ms / 1000 if idle_timeout_ms else None
+        self.keepalive_interval = keepalive_interval_ms / 1000 if keepalive_interval_ms else None
+        self.keepalive_timeout = keepalive_timeout_ms / 1000
+        self.reaped_idle = 0
+        self.reaped_dead = 0
+
+        self.servers = []
+        self.listen_sockets = None
+        self.connection_ids = itertools.count(1)
         self.users = {}
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -74,59 +254,309 @@ class Server:
         self,
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
-    ) -> User:
-        address = writer.get_extra_info('peername')
-        user_address = f'{address[0]}:{address[1]}'
-
-        self.users[user_address] = self.user_class(
-            address=user_address,
+    ) -> UserIface:
+        user = self.user_class(
+            connection_id=next(self.connection_ids),
             reader=reader,
             writer=writer,
         )
+        self.users[user.connection_id] = user
 
-        return self.users[user_address]
+        return user
 
-    async def _user_disconnected(self, user: User) -> None:
+    async def _user_disconnected(self, user: UserIface) -> None:
         self.logger.debug(f'User {user.address} was disconnected')
 
-        user.writer.close()
+        for task in user.tasks:
+            if task is not asyncio.current_task():
+                task.cancel()
+
+        self.pubsub.remove(user)
+        self.rate_limiter.remove(user)
+        user.output.close()
         await user.writer.wait_closed()
 
-        if user.address in self.users:
-            self.users.pop(user.address)
+        self.users.pop(user.connection_id, None)
 
-    async def _send_response(self, user: User, response: Response) -> None:
-        if user.address not in self.users:
+    async def _read_chunk(self, user: UserIface) -> tuple[bytes, bool]:
+        data, more = await self.framing.read_chunk(user.reader)
+        # Any frame proves that user is alive, pong is not required
+        user.last_active = time.monotonic()
+        user.ping_sent_at = None
+
+        return data, more
+
+    @staticmethod
+    def _decompress(user: UserIface, data: bytes) -> bytes:
+        if user.compression:
+            return user.compression.decompress(data)
+
+        return data
+
+    async def _read_upload(self, user: UserIface, data: bytes) -> ChunkedUpload:
+        """
+        Reads rest of chunked request, first chunk is already read, but not decompressed yet.
+
+        Messages above max_message_size are spilled to disk, up to max_upload_size.
+        """
+        upload = ChunkedUpload(
+            spool_size=self.max_message_size,
+            max_size=self.max_upload_size,
+        )
+        error: InvalidMessageFormatError | None = None
+
+        try:
+            more = True
+            while True:
+                if not error:
+                    try:
+                        await upload.write(self._decompress(user, data))
+                    except InvalidMessageFormatError as chunk_error:
+                        # Invalid chunk is still a whole frame, rest of chunks are skipped
+                        error = chunk_error
+
+                if not more:
+                    break
+
+                # Flag is taken from every frame header, so the next message is read from its beginning
+                data, more = await self._read_chunk(user)
+        except BaseException:
+            upload.close()
+            raise
+
+        if error:
+            upload.close()
+            raise error
+
+        return upload
+
+    def _write_message(self, user: UserIface, data: bytes) -> None:
+        if user.compression:
+            data = user.compression.compress(data)
+
+        self.framing.write(user.output, data)
+
+    async def _send_response(self, user: UserIface, response: Response) -> None:
+        if user.connection_id not in self.users:
             return
 
+        await self._send_frame(user, response.dump(user.codec))
+
+    async def _send_frame(self, user: UserIface, data: bytes) -> None:
         try:
-            user.writer.write(response.dump() + MESSAGE_SEPARATOR)
-            await user.writer.drain()
+            self._write_message(user, data)
+            await user.output.drain()
         except BrokenPipeError:
             await self._user_disconnected(user)
             return
 
-    async def _send_error(self, user: User, error: ExternalError) -> None:
+    async def _send_stream(self, user: UserIface, responses: AsyncGenerator[Response, None]) -> None:
+        # drain() in _send_response pauses the stream while client is not reading it
+        async for response in responses:
+            if user.connection_id not in self.users:
+                await responses.aclose()
+                return
+
+            self._log_response(user, response)
+            await self._send_response(user, response)
+
+    def _log_response(self, user: UserIface, response: Response) -> None:
+        if self.log_messages:
+            self.logger.debug(f'{user.address}: {response}')
+            self.logger.debug(response.payload)
+
+    async def _send_error(self, user: UserIface, error: ExternalError) -> None:
         return await self._send_response(
             user=user,
             response=response_from_error(error),
         )
 
-    async def _process_connection(
+    async def _handshake(
+        self,
+        user: UserIface,
+        data: bytes,
+    ) -> None:
+        try:
+            request = HandshakeRequest.from_bytes(data, codec=user.codec)
+        except ValidationError as error:
+            await self._send_error(user=user, error=error)
+            return
+
+        payload = cast(HandshakeRequest.PayloadSchema, request.payload)
+        codec = next(
+            (
+                self.codecs[name]
+                for name in payload.codecs
+                if name in self.codecs
+            ),
+            JSON_CODEC,
+        )
+        compression = next(
+            (
+                self.compressions[name]
+                for name in payload.compressions
+                if name in self.compressions
+            ),
+            None,
+        )
+
+        await self._send_response(
+            user=user,
+            response=HandshakeResponse(
+                method_name=HANDSHAKE_METHOD,
+                trace_id=request.trace_id,
+                success=True,
+                payload={
+                    'codec': codec.name,
+                    'compression': compression.name if compression else None,
+                    'chunk_size': (
+                        self.chunk_size
+                        if payload.chunked and self.framing.supports_chunks
+                        else None
+                    ),
+                },
+            ),
+        )
+
+        self.logger.debug(f'User {user.address} negotiated {codec} codec, {compression} compression')
+        user.codec = codec
+        user.compression = compression
+        user.keepalive = payload.keepalive
+
+    async def _process_connection(  # noqa: PLR0911
+        self,
+        user: UserIface,
+    ) -> None:
+        try:
+            data, more = await self._read_chunk(user)
+            if more:
+                upload = await self._read_upload(user, data)
+            else:
+                upload = None
+                data = self._decompress(user, data)
+        except InvalidMessageFormatError as error:
+            await self._send_error(user=user, error=error)
+            return
+
+        if upload:
+            if self.is_draining:
+                with upload:
+                    await self._reject_request(user, upload.view())
+                return
+
+            if (rejection := self.rate_limiter.check(user, upload.view())) is not None:
+                upload.close()
+                await self._send_frame(user, rejection)
+                return
+
+            await self._dispatch(user, self._handle_upload(user, upload))
+            return
+
+        if data == pong_frame(user.codec):
+            return
+
+        if user.codec is JSON_CODEC and data.startswith(HANDSHAKE_PREFIX):
+            # Responses to requests sent before handshake must be encoded with previous codec
+            await self._wait_in_flight(user, limit=0)
+            await self._handshake(user, data)
+            return
+
+        if self.is_draining:
+            await self._reject_request(user, data)
+            return
+
+        # Rejected right in reading loop, so flood of requests costs neither tasks nor decoding
+        if (rejection := self.rate_limiter.check(user, data)) is not None:
+            await self._send_frame(user, rejection)
+            return
+
+        await self._dispatch(user, self._handle_message(user, data))
+
+    async def _reject_request(self, user: UserIface, data: Buffer) -> None:
+        try:
+            trace_id = user.codec.find_trace_id(data)
+        except ValidationError:
+            trace_id = None
+
+        await self._send_response(
+            user=user,
+            response=response_from_error(ServerShuttingDownError(), trace_id=trace_id),
+        )
+
+    async def _wait_in_flight(self, user: UserIface, limit: int) -> None:
+        while len(user.tasks) > limit:
+            await asyncio.wait(user.tasks, return_when=asyncio.FIRST_COMPLETED)
+
+    async def _dispatch(
+        self,
+        user: UserIface,
+        handling: Coroutine[Any, Any, None],
+    ) -> None:
+        """
+        Handles message in place, or in background task if pipelining is enabled by max_in_flight.
+
+        Reading of next messages is paused while user has max_in_flight requests in progress.
+        """
+        handling = self._track(user, handling)
+
+        if self.max_in_flight <= 1:
+            await handling
+            return
+
+        await self._wait_in_flight(user, limit=self.max_in_flight - 1)
+
+        task = asyncio.create_task(self._handle_in_background(user, handling))
+        user.tasks.add(task)
+        task.add_done_callback(user.tasks.discard)
+
+    async def _track(self, user: UserIface, handling: Coroutine[Any, Any, None]) -> None:
+        self.in_flight += 1
+        user.in_flight += 1
+        self.idle.clear()
+
+        try:
+            await handling
+        finally:
+            self.in_flight -= 1
+            user.in_flight -= 1
+            # Idle time counts from the end of the last request, not from its frame, which may be long ago
+            user.last_active = time.monotonic()
+            if not self.in_flight:
+                self.idle.set()
+
+    async def _handle_in_background(
         self,
-        user: User,
+        user: UserIface,
+        handling: Coroutine[Any, Any, None],
     ) -> None:
-        data = await user.reader.readuntil(MESSAGE_SEPARATOR)
+        try:
+            await handling
+        except ConnectionError:
+            await self._user_disconnected(user)
 
+    async def _handle_upload(
+        self,
+        user: UserIface,
+        upload: ChunkedUpload,
+    ) -> None:
+        with upload:
+            await self._handle_message(user, upload.view())
+
+    async def _handle_message(
+        self,
+        user: UserIface,
+        data: Buffer,
+    ) -> None:
         response = await self.message_handler.handle(
-            message=data[0:-1],
+            message=data,
             user=user,
         )
 
-        if self.log_messages:
-            self.logger.debug(f'{user.address}: {response}')
-            self.logger.debug(response.payload)
+        if not isinstance(response, Response):
+            await self._send_stream(user, response)
+            return
 
+        self._log_response(user, response)
         await self._send_response(
             user=user,
             response=response,
@@ -136,6 +566,37 @@ class Server:
         self,
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
+    ) -> None:
+        if not await self.admission.admit():
+            await self._reject_connection(writer)
+            return
+
+        task = asyncio.current_task()
+        self.connection_tasks.add(task)  # type:ignore[arg-type]
+
+        try:
+            await self._serve_connection(reader, writer)
+        except asyncio.CancelledError:
+            # Connection task is cancelled only by shutdown, when grace period is over
+            if not self.is_draining:
+                raise
+        finally:
+            self.connection_tasks.discard(task)  # type:ignore[arg-type]
+            self.admission.release()
+
+    async def _reject_connection(self, writer: asyncio.StreamWriter) -> None:
+        self.logger.debug(f'Connection from {Address.describe_peer(writer)} rejected: {self.admission.stats()}')
+
+        try:
+            self.framing.write(writer, self.rejection_message)
+            writer.close()
+        except ConnectionError:
+            return
+
+    async def _serve_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
     ) -> None:
         user = self._make_user(
             reader=reader,
@@ -155,33 +616,169 @@ class Server:
                 await self._user_disconnected(user)
                 break
 
-            except asyncio.LimitOverrunError:
+            except MaxMessageSizeReceivedError as error:
                 self.logger.debug(f'User {user.address} reach max message size')
                 await self._send_error(
                     user=user,
-                    error=MaxMessageSizeReceivedError(
-                        max_message_size=self.max_message_size,
-                    ),
+                    error=error,
                 )
                 await self._user_disconnected(user)
                 break
 
     async def _connect(self) -> None:
-        self.logger.info(f'Starting server on {self.host}:{self.port}')
+        self.logger.info(
+            f'Starting server on {', '.join(map(str, self.addresses))} ({self.framing.mode.value} framing)',
+        )
         self.logger.info(f'Available methods: {list(self.message_handler.methods.keys())}')
+        self.logger.info(f'Available codecs: {list(self.codecs.keys())}')
+        self.logger.info(f'Available compressions: {list(self.compressions.keys())}')
+        self.logger.info(f'Connection limit: {self.admission}')
+        if self.max_in_flight > 1:
+            self.logger.info(f'Pipelining: up to {self.max_in_flight} requests in flight per connection')
+        if self.framing.supports_chunks:
+            self.logger.info(f'Chunked requests: {self.chunk_size} bytes chunks, up to {self.max_upload_size} bytes')
+        if policies := {name: policy.value for name, policy in self.message_handler.policies.items()}:
+            self.logger.info(f'Execution pools: {self.executor}, methods: {policies}')
+        self.logger.info(f'Scheduler: {self.scheduler}')
+        if cached := list(self.message_handler.cache_policies):
+            self.logger.info(f'Response cache: {self.cache}, methods: {cached}')
+        if coalesced := sorted(self.message_handler.coalesced_methods):
+            self.logger.info(f'Coalesced methods: {coalesced}')
+        if self.rate_limiter.enabled:
+            self.logger.info(f'Rate limits: {self.rate_limiter}')
+        if self.idle_timeout:
+            self.logger.info(f'Idle connections are closed after {self.idle_timeout} sec')
+        if self.keepalive_interval:
+            self.logger.info(f'Keepalive: ping after {self.keepalive_interval} sec, timeout {self.keepalive_timeout} sec')
+
+        self.servers = [
+            await address.start_server(
+                client_connected_cb=self._handle_connection,
+                limit=self.max_message_size,
+                sock=self.listen_sockets[index] if self.listen_sockets else None,
+            )
+            for index, address in enumerate(self.addresses)
+        ]
+
+    def _reap_user(self, user: UserIface, now: float) -> None:
+        if user.in_flight:
+            return
 
-        self.server = await asyncio.start_server(
-            client_connected_cb=self._handle_connection,
-            host=self.host,
-            port=self.port,
-            limit=self.max_message_size,
-        )
+        if self.idle_timeout and now - user.last_active >= self.idle_timeout:
+            self.logger.debug(f'User {user.address} is idle for {now - user.last_active:.1f} sec, closing')
+            self.reaped_idle += 1
+            # Connection task reads EOF and finishes disconnection
+            self.users.pop(user.connection_id)
+            self.pubsub.remove(user)
+            user.output.close()
+            return
+
+        if user.ping_sent_at is not None:
+            if now - user.ping_sent_at >= self.keepalive_timeout:
+                self.logger.debug(f'User {user.address} did not answer ping, closing')
+                self.reaped_dead += 1
+                self.users.pop(user.connection_id)
+                self.pubsub.remove(user)
+                # Buffered data can`t be flushed to dead peer, so connection is not closed gracefully
+                user.output.abort()
+            return
+
+        if user.keepalive and self.keepalive_interval and now - user.last_active >= self.keepalive_interval:
+            user.ping_sent_at = now
+            with suppress(ConnectionError):
+                self._write_message(user, ping_frame(user.codec))
+
+    async def _reap_connections(self) -> None:
+        """Closes idle and dead connections, one task checks all users instead of timer per connection."""
+        timeouts = [self.idle_timeout] if self.idle_timeout else []
+        if self.keepalive_interval:
+            timeouts += [self.keepalive_interval, self.keepalive_timeout]
+
+        if not timeouts:
+            return
+
+        while True:
+            await asyncio.sleep(min(timeouts) / 2)
+
+            now = time.monotonic()
+            for user in list(self.users.values()):
+                self._reap_user(user, now)
+
+    def _handle_signals(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            # Signals can be handled only in main thread of Unix process
+            with suppress(NotImplementedError, RuntimeError):
+                loop.add_signal_handler(signum, self.stop)
+
+    def stop(self) -> None:
+        """Starts graceful shutdown, it is also started by SIGINT and SIGTERM."""
+        self.stopping.set()
+
+    async def _drain(self) -> None:
+        """
+        Stops accepting, asks connected clients to stop sending and waits for in-flight requests.
+
+        Requests received while draining are rejected with retryable error,
+        requests not done within shutdown_grace are aborted.
+        """
+        self.is_draining = True
+        for server in self.servers:
+            server.close()
+
+        in_flight = self.in_flight
+        self.logger.info(f'Shutting down, waiting for {in_flight} requests up to {self.shutdown_grace} sec')
+
+        for user in list(self.users.values()):
+            with suppress(ConnectionError):
+                self._write_message(user, drain_notice(user.codec))
+
+        with suppress(TimeoutError):
+            async with asyncio.timeout(self.shutdown_grace):
+                await self.idle.wait()
+
+        aborted = self.in_flight
+        for user in self.users.values():
+            self.pubsub.remove(user)
+
+        tasks = [
+            *self.connection_tasks,
+            *(task for user in self.users.values() for task in user.tasks),
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Closing writer flushes its buffer first
+        for user in self.users.values():
+            user.output.close()
+
+        writers = [user.writer for user in self.users.values()]
+        with suppress(TimeoutError):
+            async with asyncio.timeout(self.shutdown_grace):
+                await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True)
+
+        self.users.clear()
+        self.logger.info(f'Drained {in_flight - aborted} requests, aborted {aborted}')
 
     async def _run(self) -> None:
         await self._connect()
+        self._handle_signals()
+
+        async with AsyncExitStack() as stack:
+            for server in self.servers:
+                await stack.enter_async_context(server)
+
+            reaper = asyncio.create_task(self._reap_connections())
+            await self.stopping.wait()
+            reaper.cancel()
+            await self._drain()
 
-        async with self.server as server:
-            await server.serve_forever()
+        # Socket files of listen_sockets are removed by their owner
+        if not self.listen_sockets:
+            for address in self.addresses:
+                address.cleanup()
 
     async def run(self) -> None:
         try:
@@ -194,3 +791,41 @@ class Server:
         ):
             self.logger.exception('Fatal error')
             self.logger.info('Exiting')
+        finally:
+            self.executor.shutdown()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'users': len(self.users),
+            'in_flight': self.in_flight,
+            'reaped_idle': self.reaped_idle,
+            'reaped_dead': self.reaped_dead,
+            **self.admission.stats(),
+            **self.executor.stats(),
+            **self.scheduler.total_stats(),
+            **self.cache.stats(),
+            **self.message_handler.singleflight.stats(),
+            **self.pubsub.stats(),
+            **self.rate_limiter.stats(),
+        }
+
+    def publish(
+        self,
+        topic: str,
+        payload: BasePayloadSchema | dict[str, Any] | None = None,
+    ) -> int:
+        """
+        Pushes message to every connection subscribed to topic and returns their number.
+
+        It doesn`t wait for writes, so it may be called from sync code, but only in event loop thread.
+        Every worker process has its own subscribers.
+        """
+        return self.pubsub.publish(topic, payload)
+
+    def serve(self, workers: int = 1) -> None:
+        """Blocking entry point, with several workers server is run in forked processes by `Supervisor`."""
+        if workers > 1:
+            Supervisor(server=self, workers=workers).run()
+            return
+
+        asyncio.run(self.run())
@@ -0,0 +1,75 @@
+import asyncio
+from collections.abc import (
+    Callable,
+    Coroutine,
+    Hashable,
+)
+from typing import (
+    Any,
+    Generic,
+    TypeVar,
+)
+
+ResultT = TypeVar('ResultT')
+
+
+class Flight(Generic[ResultT]):
+    __slots__ = ('task', 'waiters')
+
+    task: asyncio.Task[ResultT]
+    waiters: int
+
+    def __init__(self, task: asyncio.Task[ResultT]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+
+    """
+    Shares one execution between concurrent calls with the same key, nothing is kept after it is done.
+
+    Execution runs in its own task, so every caller waits for it within its own deadline.
+    Execution is cancelled, when all its callers are gone.
+    """
+
+    flights: dict[Hashable, Flight[Any]]
+
+    # Counters since server start
+    executions: int
+    coalesced: int
+
+    def __init__(self) -> None:
+        self.flights = {}
+
+        self.executions = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Coroutine[Any, Any, ResultT]]) -> ResultT:
+        if (flight := self.flights.get(key)) is None:
+            flight = self.flights[key] = Flight(asyncio.create_task(call()))
+            flight.task.add_done_callback(lambda _: self._land(key, flight))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Calls with the same key, which come later, start new execution instead of joining cancelled one
+                self._land(key, flight)
+                flight.task.cancel()
+
+    def _land(self, key: Hashable, flight: Flight[Any]) -> None:
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'singleflight_in_flight': len(self.flights),
+            'singleflight_executions': self.executions,
+            'singleflight_coalesced': self.coalesced,
+        }
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from types import FrameType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from shiny_rpc.server import Server
+
+# Worker, which exits faster than this, is restarted with delay to avoid crash loop
+MIN_WORKER_UPTIME = 1.0
+RESTART_DELAY = 1.0
+# Workers, which are still alive after this time since stop signal and server shutdown grace, are killed
+SHUTDOWN_TIMEOUT = 10.0
+
+
+class Supervisor:
+
+    """
+    Runs the same server in several forked processes, which accept connections on one port.
+
+    With SO_REUSEPORT every worker gets its own TCP listening socket and kernel balances connections between them,
+    otherwise all workers share one socket. Unix sockets are always shared.
+    Sockets are bound before fork and kept by supervisor, so restarted worker takes over connections queued to its predecessor.
+
+    Crashed workers are restarted, SIGINT and SIGTERM are forwarded to workers, which shut down gracefully.
+    Workers report their stats to supervisor every `stats_interval` seconds.
+    """
+
+    server: 'Server'
+    workers: int
+    stats_interval: float
+
+    # Listening sockets of every slot, one per server address
+    sockets: list[list[socket.socket]]
+    processes: dict[int, BaseProcess]
+    started_at: dict[int, float]
+    connections: dict[int, Connection]
+    worker_stats: dict[int, dict[str, int]]
+    restarts: int
+    is_running: bool
+
+    logger: logging.Logger
+
+    def __init__(
+        self,
+        server: 'Server',
+        workers: int,
+        *,
+        stats_interval: float = 10.0,
+    ) -> None:
+        self.server = server
+        self.workers = workers
+        self.stats_interval = stats_interval
+
+        self.sockets = []
+        self.processes = {}
+        self.started_at = {}
+        self.connections = {}
+        self.worker_stats = {}
+        self.restarts = 0
+        self.is_running = False
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _bind_sockets(self) -> None:
+        reuse_port = hasattr(socket, 'SO_REUSEPORT')
+        shared = {
+            index: address.bind()
+            for index, address in enumerate(self.server.addresses)
+            if address.is_unix or not reuse_port
+        }
+
+        self.sockets = [
+            [
+                shared[index] if index in shared else address.bind(reuse_port=True)
+                for index, address in enumerate(self.server.addresses)
+            ]
+            for _ in range(self.workers)
+        ]
+
+    def _run_worker(
+        self,
+        slot: int,
+        connection: Connection,
+    ) -> None:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        self.server.listen_sockets = self.sockets[slot]
+        self.server.logger = logging.getLogger(f'{self.server.__class__.__name__}[{slot}]')
+
+        async def report_stats() -> None:
+            while True:
+                await asyncio.sleep(self.stats_interval)
+                connection.send(self.server.stats())
+
+        async def run() -> None:
+            task = asyncio.create_task(report_stats())
+            await self.server.run()
+            task.cancel()
+
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            return
+
+    def _start_worker(self, slot: int) -> None:
+        context = multiprocessing.get_context('fork')
+        receiver, sender = context.Pipe(duplex=False)
+
+        process = context.Process(
+            target=self._run_worker,
+            args=(slot, sender),
+            name=f'{self.server.__class__.__name__}[{slot}]',
+            daemon=False,
+        )
+        process.start()
+        sender.close()
+
+        self.processes[slot] = process
+        self.started_at[slot] = time.monotonic()
+        self.connections[slot] = receiver
+
+        self.logger.info(f'Started worker {slot} (pid {process.pid})')
+
+    def _restart_worker(self, slot: int) -> None:
+        process = self.processes[slot]
+        process.join()
+        self.connections.pop(slot).close()
+        self.worker_stats.pop(slot, None)
+
+        if not self.is_running:
+            return
+
+        self.logger.warning(f'Worker {slot} (pid {process.pid}) exited with code {process.exitcode}, restarting')
+        if time.monotonic() - self.started_at[slot] < MIN_WORKER_UPTIME:
+            time.sleep(RESTART_DELAY)
+
+        self.restarts += 1
+        self._start_worker(slot)
+
+    def _stop(
+        self,
+        signum: int,
+        frame: FrameType | None,  # noqa: ARG002
+    ) -> None:
+        self.logger.info(f'Received {signal.Signals(signum).name}, stopping workers')
+        self.is_running = False
+
+        for process in self.processes.values():
+            if process.is_alive() and process.pid:
+                os.kill(process.pid, signum)
+
+    def stats(self) -> dict[str, int]:
+        total: dict[str, int] = {
+            'workers': sum(process.is_alive() for process in self.processes.values()),
+            'restarts': self.restarts,
+        }
+
+        for worker_stats in self.worker_stats.values():
+            for key, value in worker_stats.items():
+                total[key] = total.get(key, 0) + value
+
+        return total
+
+    def _wait(self, timeout: float) -> None:
+        sentinels = {process.sentinel: slot for slot, process in self.processes.items()}
+        receivers = {connection: slot for slot, connection in self.connections.items()}
+
+        ready = wait([*receivers, *sentinels], timeout=timeout)
+
+        # Stats are read before restarts, which close pipes of exited workers
+        for connection in receivers:
+            if connection in ready:
+                try:
+                    self.worker_stats[receivers[connection]] = connection.recv()
+                except EOFError:
+                    continue
+
+        for sentinel, slot in sentinels.items():
+            if sentinel in ready:
+                self._restart_worker(slot)
+
+    def run(self) -> None:
+        self._bind_sockets()
+        self.is_running = True
+
+        self.logger.info(f'Starting {self.workers} workers on {', '.join(map(str, self.server.addresses))}')
+        for slot in range(self.workers):
+            self._start_worker(slot)
+
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        reported_at = time.monotonic()
+        while self.is_running:
+            self._wait(timeout=self.stats_interval)
+
+            if time.monotonic() - reported_at >= self.stats_interval:
+                reported_at = time.monotonic()
+                self.logger.info(f'Workers stats: {self.stats()}')
+
+        deadline = time.monotonic() + self.server.shutdown_grace + SHUTDOWN_TIMEOUT
+        for process in self.processes.values():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                self.logger.warning(f'Worker {process.name} (pid {process.pid}) is killed')
+                process.kill()
+                process.join()
+
+        for listen_socket in {listen_socket for sockets in self.sockets for listen_socket in sockets}:
+            listen_socket.close()
+
+        for address in self.server.addresses:
+            address.cleanup()
+
+        self.logger.info('Exiting')
@@ -0,0 +1,96 @@
+import asyncio
+import mmap
+import tempfile
+from contextlib import suppress
+from types import TracebackType
+from typing import IO, Self
+
+from shiny_rpc.errors import MaxMessageSizeReceivedError
+
+
+class ChunkedUpload:
+
+    """
+    Reassembles message, received as several chunk frames.
+
+    Chunks are kept in memory up to `spool_size` bytes, bigger messages are spilled to temporary file
+    and mapped back with mmap, so parser and codecs read them without loading the whole message to memory.
+    """
+
+    spool_size: int
+    max_size: int
+    size: int
+
+    buffer: bytearray
+    file: IO[bytes] | None
+    mapping: mmap.mmap | None
+
+    def __init__(
+        self,
+        *,
+        spool_size: int,
+        max_size: int,
+    ) -> None:
+        self.spool_size = spool_size
+        self.max_size = max_size
+        self.size = 0
+
+        self.buffer = bytearray()
+        self.file = None
+        self.mapping = None
+
+    @property
+    def is_spilled(self) -> bool:
+        return self.file is not None
+
+    async def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise MaxMessageSizeReceivedError(
+                max_message_size=self.max_size,
+            )
+
+        if self.file is None and self.size <= self.spool_size:
+            self.buffer += data
+            return
+
+        # Chunk is up to max_message_size, writing it to disk right in event loop would stall other connections
+        await asyncio.get_running_loop().run_in_executor(None, self._spill, data)
+
+    def _spill(self, data: bytes) -> None:
+        if self.file is None:
+            self.file = tempfile.TemporaryFile()
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+
+        self.file.write(data)
+
+    def view(self) -> bytearray | mmap.mmap:
+        if self.file is None:
+            return self.buffer
+
+        if self.mapping is None:
+            self.file.flush()
+            self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return self.mapping
+
+    def close(self) -> None:
+        if self.mapping is not None:
+            # Lazy payload of request may still refer to mapping, it will be unmapped by GC then
+            with suppress(BufferError):
+                self.mapping.close()
+
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
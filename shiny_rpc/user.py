@@ -1,19 +1,61 @@
 import asyncio
+import time
 
+from shiny_rpc.address import UNIX_PREFIX, Address
+from shiny_rpc.codec import JSON_CODEC, BaseCodec
+from shiny_rpc.compression import Compression
 from shiny_rpc.ifaces import UserIface
+from shiny_rpc.writer import CoalescingWriter
 
 
 class User(UserIface):
-    address: str
+    # Attributes are declared in slots of interface
+    __slots__ = ()
+
+    connection_id: int
     reader: asyncio.StreamReader
     writer: asyncio.StreamWriter
+    output: CoalescingWriter
+    codec: BaseCodec
+    compression: Compression | None
+    tasks: set[asyncio.Task[None]]
+    topics: set[str]
+
+    # Requests in progress, user is not idle while it is above zero
+    in_flight: int
+    # Monotonic time of the last frame received from user
+    last_active: float
+    # Agreed in handshake, only such users answer pings
+    keepalive: bool
+    ping_sent_at: float | None
 
     def __init__(
         self,
-        address: str,
+        connection_id: int,
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
     ) -> None:
-        self.address = address
+        self.connection_id = connection_id
         self.reader = reader
         self.writer = writer
+        self.output = CoalescingWriter(writer)
+        self.codec = JSON_CODEC
+        self.compression = None
+        self.tasks = set()
+        self.topics = set()
+
+        self.in_flight = 0
+        self.last_active = time.monotonic()
+        self.keepalive = False
+        self.ping_sent_at = None
+
+    @property
+    def address(self) -> str:
+        # Formatted on demand instead of being stored, it is needed only for logs
+        address = Address.describe_peer(self.writer)
+
+        if address.startswith(UNIX_PREFIX):
+            # Unix socket clients are usually unnamed, connection id keeps user addresses unique
+            return f'{address}#{self.connection_id}'
+
+        return address
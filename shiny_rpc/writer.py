@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import Iterable
+
+# Collected frames are sent at once, when they reach this size, not waiting for the end of loop iteration
+FLUSH_THRESHOLD = 2**16  # 64 KB
+
+
+class CoalescingWriter:
+
+    """
+    Collects frames written during one event loop iteration and sends them with one vectored write.
+
+    Framing writes header and body as separate fragments, they are not concatenated.
+    `drain` waits only while transport buffer is above its high-water mark, below it drain returns at once anyway.
+    """
+
+    # One per connection, so it has no __dict__
+    __slots__ = (
+        'flush_handle',
+        'fragments',
+        'size',
+        'writer',
+    )
+
+    writer: asyncio.StreamWriter
+    fragments: list[bytes]
+    size: int
+    flush_handle: asyncio.Handle | None
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.fragments = []
+        self.size = 0
+        self.flush_handle = None
+
+    def writelines(self, fragments: Iterable[bytes]) -> None:
+        for fragment in fragments:
+            self.fragments.append(fragment)
+            self.size += len(fragment)
+
+        if self.size >= FLUSH_THRESHOLD:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self) -> None:
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        if not self.fragments:
+            return
+
+        fragments = self.fragments
+        self.fragments = []
+        self.size = 0
+        self.writer.writelines(fragments)
+
+    @property
+    def is_congested(self) -> bool:
+        transport = self.writer.transport
+        _, high_water = transport.get_write_buffer_limits()
+
+        # Closing transport is drained to raise connection error
+        return transport.is_closing() or transport.get_write_buffer_size() + self.size > high_water
+
+    async def drain(self) -> None:
+        if self.is_congested:
+            self.flush()
+            await self.writer.drain()
+
+    def close(self) -> None:
+        self.flush()
+        self.writer.close()
+
+    def abort(self) -> None:
+        # Collected frames are dropped, e.g. when peer is dead
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        self.fragments = []
+        self.size = 0
+        self.writer.transport.abort()
@@ -0,0 +1,25 @@
+import asyncio
+import inspect
+
+import pytest
+
+from shiny_rpc.message_hander import MessageHandler
+from tests.helpers import echo
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> bool | None:
+    # Coroutine tests run in their own event loop, so no async plugin is required
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    asyncio.run(pyfuncitem.obj(**arguments))
+    return True
+
+
+@pytest.fixture
+def message_handler() -> MessageHandler:
+    message_handler = MessageHandler()
+    message_handler.add_method('echo', echo)  # type:ignore[arg-type]
+    return message_handler
@@ -0,0 +1,103 @@
+import asyncio
+import socket
+from collections.abc import AsyncIterator
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+    suppress,
+)
+from typing import Any, TypeVar
+from unittest.mock import Mock
+
+from shiny_rpc.client import BaseClient
+from shiny_rpc.examples import (
+    ExampleRequest,
+    ExampleResponse,
+    example_request_values,
+)
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.server import Server
+from shiny_rpc.user import User
+
+ServerT = TypeVar('ServerT', bound=Server)
+
+
+class LazyExampleRequest(ExampleRequest):
+    lazy_payload = True
+
+
+async def echo(request: ExampleRequest, user: User) -> ExampleResponse:  # noqa: ARG001
+    return ExampleResponse(
+        method_name=request.method_name,
+        trace_id=request.trace_id,
+        success=True,
+        payload={'some_param': 'echo', **request.payload.model_dump()},
+    )
+
+
+async def count(request: ExampleRequest, user: User) -> AsyncIterator[ExampleResponse]:  # noqa: ARG001
+    for index in range(3):
+        yield ExampleResponse(
+            method_name=request.method_name,
+            trace_id=request.trace_id,
+            success=True,
+            payload={**request.payload.model_dump(), 'some_param': str(index)},
+        )
+
+
+def example_request(method_name: str = 'echo', **values: Any) -> ExampleRequest:  # noqa:ANN401
+    return ExampleRequest(method_name=method_name, payload={**example_request_values, **values})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def make_user(connection_id: int = 1) -> User:
+    """User without connection, for message handler called directly."""
+    return User(
+        connection_id=connection_id,
+        reader=asyncio.StreamReader(),
+        writer=Mock(spec=asyncio.StreamWriter),
+    )
+
+
+@asynccontextmanager
+async def running(server: ServerT) -> AsyncIterator[ServerT]:
+    """Runs server until context exit, then drains it, port 0 is replaced with the bound one."""
+    task = asyncio.create_task(server._run())
+
+    while not server.servers:
+        if task.done():
+            await task
+        await asyncio.sleep(0)
+
+    server.port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield server
+    finally:
+        server.stop()
+        await task
+        server.executor.shutdown()
+
+
+def serving(message_handler: MessageHandler, **kwargs: Any) -> AbstractAsyncContextManager[Server]:  # noqa:ANN401
+    return running(Server('127.0.0.1', 0, message_handler, **kwargs))
+
+
+@asynccontextmanager
+async def connected(server: Server, **kwargs: Any) -> AsyncIterator[BaseClient]:  # noqa:ANN401
+    client = BaseClient(server.host, server.port, **kwargs)
+    await client.connect()
+    try:
+        yield client
+    finally:
+        if client.read_task is not None:
+            client.read_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await client.read_task
+
+        if client.is_connected:
+            client.output.close()
@@ -0,0 +1,61 @@
+import os
+import socket
+from pathlib import Path
+
+import pytest
+
+from shiny_rpc.address import Address
+from shiny_rpc.client import BaseClient
+from shiny_rpc.examples import ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Response
+from tests.helpers import example_request, serving
+
+
+@pytest.mark.parametrize(
+    ('address', 'host', 'port', 'path'),
+    [
+        ('localhost:8000', 'localhost', 8000, None),
+        ('[::1]:8000', '::1', 8000, None),
+        ('unix:/run/rpc.sock', 'unix:/run/rpc.sock', 0, '/run/rpc.sock'),
+        ('unix:@rpc', 'unix:@rpc', 0, '\0rpc'),
+    ],
+)
+def test_parse_address(address: str, host: str, port: int, path: str | None) -> None:
+    parsed = Address.parse(address)
+
+    assert (parsed.host, parsed.port, parsed.path) == (host, port, path)
+    assert str(parsed) == address
+
+
+async def send_echo(address: str) -> Response:
+    client = BaseClient(address)
+    await client.connect()
+    try:
+        return await client.send(example_request(), ExampleResponse)
+    finally:
+        client.output.close()
+
+
+async def test_server_listens_on_unix_socket(message_handler: MessageHandler, tmp_path: Path) -> None:
+    socket_path = tmp_path / 'rpc.sock'
+    # Socket file left by crashed server doesn`t prevent bind
+    with socket.socket(socket.AF_UNIX) as stale:
+        stale.bind(str(socket_path))
+
+    abstract_address = f'unix:@shiny_rpc_{os.getpid()}'
+
+    async with serving(message_handler, listen=[f'unix:{socket_path}', abstract_address]):
+        assert (await send_echo(f'unix:{socket_path}')).success
+        assert (await send_echo(abstract_address)).success
+
+    assert not socket_path.exists()
+
+
+def test_cleanup_keeps_regular_file(tmp_path: Path) -> None:
+    path = tmp_path / 'rpc.sock'
+    path.write_text('not a socket')
+
+    Address(f'unix:{path}').cleanup()
+
+    assert path.exists()
@@ -0,0 +1,51 @@
+import asyncio
+
+from shiny_rpc.admission import AdmissionControl
+from shiny_rpc.examples import ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from tests.helpers import (
+    connected,
+    example_request,
+    serving,
+)
+
+
+async def test_connections_above_soft_limit_wait_in_queue() -> None:
+    admission = AdmissionControl(soft_limit=1, hard_limit=2, timeout=1)
+
+    assert await admission.admit()
+    waiting = asyncio.create_task(admission.admit())
+    await asyncio.sleep(0)
+
+    # Queue is full as well
+    assert not await admission.admit()
+
+    admission.release()
+    assert await waiting
+    assert admission.stats() == {
+        'active': 1,
+        'waiting': 0,
+        'accepted': 2,
+        'queued': 1,
+        'rejected': 1,
+        'timed_out': 0,
+    }
+
+
+async def test_queued_connection_times_out() -> None:
+    admission = AdmissionControl(soft_limit=1, hard_limit=2, timeout=0.01)
+
+    assert await admission.admit()
+    assert not await admission.admit()
+    assert admission.timed_out == 1
+
+
+async def test_connection_above_limit_is_rejected(message_handler: MessageHandler) -> None:
+    async with serving(message_handler, connection_limit=1) as server, connected(server) as client:
+        assert (await client.send(example_request(), ExampleResponse)).success
+
+        async with connected(server) as rejected_client:
+            response = await rejected_client.send(example_request())
+
+        assert response.payload.error_code == 'ConnectionLimit'  # type:ignore[attr-defined]
+        assert server.admission.rejected == 1
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from shiny_rpc.constants import BATCH_METHOD
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Request, Response
+from shiny_rpc.user import User
+from tests.helpers import (
+    connected,
+    count,
+    echo,
+    example_request,
+    serving,
+)
+
+
+@pytest.fixture
+def finished(message_handler: MessageHandler) -> list[str]:
+    finished: list[str] = []
+
+    async def sleep(request: ExampleRequest, user: User) -> ExampleResponse:
+        await asyncio.sleep(float(request.payload.send_this))  # type:ignore[attr-defined]
+        finished.append(request.payload.send_this)  # type:ignore[attr-defined]
+        return await echo(request, user)
+
+    message_handler.add_method('sleep', sleep)  # type:ignore[arg-type]
+    message_handler.add_method('count', count)  # type:ignore[arg-type]
+    return finished
+
+
+async def test_responses_keep_order_of_requests(message_handler: MessageHandler, finished: list[str]) -> None:
+    requests: list[tuple[Request, type[Response]]] = [
+        (example_request('sleep', send_this='0.05'), ExampleResponse),
+        (example_request('unknown'), ExampleResponse),
+        (example_request('count'), ExampleResponse),
+        (example_request('sleep', send_this='0'), ExampleResponse),
+    ]
+
+    async with serving(message_handler) as server, connected(server) as client:
+        responses = await client.send_batch(requests)
+
+    assert [response.trace_id for response in responses] == [request.trace_id for request, _ in requests]
+    assert [response.success for response in responses] == [True, False, False, True]
+    assert responses[1].payload.error_code == 'UnknownMethod'  # type:ignore[attr-defined]
+    # Stream has many responses, so it can`t be batched
+    assert responses[2].payload.error_code == 'NotBatchable'  # type:ignore[attr-defined]
+    # Requests are handled concurrently by default
+    assert finished == ['0', '0.05']
+
+
+async def test_sequential_batch(message_handler: MessageHandler, finished: list[str]) -> None:
+    requests: list[tuple[Request, type[Response]]] = [
+        (example_request('sleep', send_this=delay), ExampleResponse) for delay in ('0.05', '0')
+    ]
+
+    async with serving(message_handler) as server, connected(server) as client:
+        responses = await client.send_batch(requests, sequential=True)
+
+    assert all(response.success for response in responses)
+    assert finished == ['0.05', '0']
+
+
+async def test_concurrent_requests_are_sent_in_one_envelope(message_handler: MessageHandler) -> None:
+    async with serving(message_handler) as server, connected(server) as client:
+        envelopes: list[Request] = []
+        send = client._send
+
+        async def recorded_send(request: Request, response_class: type[Response]) -> Response:
+            envelopes.append(request)
+            return await send(request, response_class)
+
+        client._send = recorded_send  # type:ignore[method-assign]
+
+        async with client.batch():
+            responses = await asyncio.gather(
+                *(client.send(example_request(send_this=send_this), ExampleResponse) for send_this in 'abc'),
+            )
+
+        # Request sent after the context is not batched
+        assert (await client.send(example_request(), ExampleResponse)).success
+
+    assert [response.payload.send_this for response in responses] == ['a', 'b', 'c']  # type:ignore[attr-defined]
+    assert [envelope.method_name for envelope in envelopes] == [BATCH_METHOD, 'echo']
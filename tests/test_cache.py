@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from shiny_rpc.cache import (
+    CachedResponse,
+    CachePolicy,
+    ResponseCache,
+)
+from shiny_rpc.codec import JSON_CODEC
+from shiny_rpc.errors import ServerFatalError
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Response
+from shiny_rpc.user import User
+from tests.helpers import (
+    echo,
+    example_request,
+    make_user,
+)
+
+
+@pytest.fixture
+def calls(message_handler: MessageHandler) -> list[str]:
+    calls: list[str] = []
+
+    async def read(request: ExampleRequest, user: User) -> ExampleResponse:
+        calls.append(request.payload.send_this)  # type:ignore[attr-defined]
+        return await echo(request, user)
+
+    async def write(request: ExampleRequest, user: User) -> ExampleResponse:
+        return await echo(request, user)
+
+    async def failing(request: ExampleRequest, user: User) -> ExampleResponse:  # noqa: ARG001
+        calls.append(request.payload.send_this)  # type:ignore[attr-defined]
+        raise RuntimeError
+
+    message_handler.add_method('read', read, cache=CachePolicy(ttl=10, key=['send_this'], tags=['item:{send_this}']))  # type:ignore[arg-type]
+    message_handler.add_method('short_read', read, cache=CachePolicy(ttl=0.05))  # type:ignore[arg-type]
+    message_handler.add_method('write', write, invalidates=['item:{send_this}'])  # type:ignore[arg-type]
+    message_handler.add_method('failing', failing, cache=CachePolicy(ttl=10))  # type:ignore[arg-type]
+    return calls
+
+
+async def call(message_handler: MessageHandler, method_name: str, **values: str) -> Response:
+    request = example_request(method_name, **values)
+    response = await message_handler.handle(request.dump(), make_user())
+
+    assert isinstance(response, Response)
+    # Cached response is sent with trace_id of its own request
+    assert Response.from_bytes(response.dump()).trace_id == request.trace_id
+    return response
+
+
+async def test_response_is_cached_by_key_fields(message_handler: MessageHandler, calls: list[str]) -> None:
+    first = await call(message_handler, 'read', send_this='a')
+    second = await call(message_handler, 'read', send_this='a')
+    other = await call(message_handler, 'read', send_this='b')
+
+    assert calls == ['a', 'b']
+    assert isinstance(second, CachedResponse)
+    assert ExampleResponse.from_bytes(second.dump()).payload == ExampleResponse.from_bytes(first.dump()).payload
+    assert ExampleResponse.from_bytes(other.dump()).payload.send_this == 'b'  # type:ignore[attr-defined]
+    assert message_handler.cache.stats()['cache_hits'] == 1
+
+
+async def test_cached_response_expires(message_handler: MessageHandler, calls: list[str]) -> None:
+    await call(message_handler, 'short_read')
+    await asyncio.sleep(0.1)
+    await call(message_handler, 'short_read')
+
+    assert calls == ['back', 'back']
+
+
+async def test_write_invalidates_its_tags(message_handler: MessageHandler, calls: list[str]) -> None:
+    await call(message_handler, 'read', send_this='a')
+    await call(message_handler, 'read', send_this='b')
+    await call(message_handler, 'write', send_this='a')
+    await call(message_handler, 'read', send_this='a')
+    await call(message_handler, 'read', send_this='b')
+
+    assert calls == ['a', 'b', 'a']
+    assert message_handler.cache.invalidations == 1
+
+
+async def test_failed_response_is_not_cached(message_handler: MessageHandler, calls: list[str]) -> None:
+    for _ in range(2):
+        response = await call(message_handler, 'failing')
+        assert not response.success
+
+    assert calls == ['back', 'back']
+
+
+async def test_trace_id_of_other_length_is_cache_miss(message_handler: MessageHandler, calls: list[str]) -> None:
+    await call(message_handler, 'read')
+
+    request = example_request('read')
+    request.trace_id = request.headers.trace_id = 'short'
+    response = await message_handler.handle(request.dump(), make_user())
+
+    assert calls == ['back', 'back']
+    assert isinstance(response, Response)
+    assert response.trace_id == 'short'
+
+
+def test_entries_are_evicted_above_max_size() -> None:
+    cache = ResponseCache(max_size=2**10)
+    policy = CachePolicy(ttl=10)
+    keys = []
+
+    for send_this in ('a', 'b', 'c'):
+        request = example_request('read', send_this=send_this)
+        response = ExampleResponse(
+            method_name='read',
+            trace_id=request.trace_id,
+            success=True,
+            payload={**request.payload.model_dump(), 'some_param': 'x' * 2**8},
+        )
+        keys.append(key := cache.make_key(policy, request, JSON_CODEC))
+        cache.put(key, policy, request, response, JSON_CODEC, cache.version)
+
+    assert cache.size <= cache.max_size
+    assert cache.evictions
+    # Least recently used entry goes first
+    assert keys[0] not in cache.entries
+    assert keys[-1] in cache.entries
+
+
+def test_unknown_cache_field_fails_at_start(message_handler: MessageHandler) -> None:
+    with pytest.raises(ServerFatalError):
+        message_handler.add_method('read', echo, cache=CachePolicy(ttl=10, tags=['item:{unknown}']))  # type:ignore[arg-type]
+
+    with pytest.raises(ServerFatalError):
+        message_handler.add_method('write', echo, invalidates=['item:{unknown}'])  # type:ignore[arg-type]
@@ -0,0 +1,173 @@
+from collections.abc import Iterator
+from datetime import date
+from uuid import UUID, uuid4
+
+import pytest
+
+from shiny_rpc.client import BaseClient
+from shiny_rpc.codec import (
+    BINARY_CODEC,
+    CODECS,
+    JSON_CODEC,
+    JsonCodec,
+    get_codec,
+    register_codec,
+)
+from shiny_rpc.errors import (
+    ClientFatalError,
+    InvalidMessageFormatError,
+    UnknownCodecError,
+)
+from shiny_rpc.examples import (
+    ExampleRequest,
+    ExampleResponse,
+    example_response_values,
+)
+from shiny_rpc.framing import FramingMode
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Request
+from shiny_rpc.schema import BasePayloadSchema
+from tests.helpers import (
+    connected,
+    example_request,
+    serving,
+)
+
+TRACE_ID = '9f6a4a56-4c46-4c0c-9e4a-8d6b2a6f1d3e'
+
+
+class TypedRequest(Request):
+    class PayloadSchema(BasePayloadSchema):
+        ids: list[UUID]
+        day: date
+        big: int
+        raw: bytes
+        nested: dict[str, list[float | None]]
+        text: str
+
+
+class ServiceRequest(Request):
+    class PayloadSchema(BasePayloadSchema):
+        service_id: str
+
+
+class OtherJsonCodec(JsonCodec):
+    name = 'other_json'
+
+
+@pytest.fixture
+def other_codec() -> Iterator[OtherJsonCodec]:
+    codec = OtherJsonCodec()
+    register_codec(codec)
+    yield codec
+    CODECS.pop(codec.name)
+
+
+def test_get_codec() -> None:
+    assert get_codec('json') is JSON_CODEC
+
+    with pytest.raises(UnknownCodecError):
+        get_codec('unknown')
+
+
+async def test_codec_is_negotiated_in_handshake(message_handler: MessageHandler, other_codec: OtherJsonCodec) -> None:
+    async with serving(message_handler) as server, connected(server, codec=other_codec.name) as client:
+        response = await client.send(example_request(), ExampleResponse)
+
+        assert client.codec is other_codec
+        assert response.success
+
+
+async def test_server_falls_back_to_json(message_handler: MessageHandler, other_codec: OtherJsonCodec) -> None:
+    async with serving(message_handler, codecs=['json']) as server, connected(server, codec=other_codec.name) as client:
+        response = await client.send(example_request(), ExampleResponse)
+
+        assert client.codec is JSON_CODEC
+        assert response.success
+
+
+def test_binary_request_round_trip() -> None:
+    request = TypedRequest(
+        method_name='typed',
+        trace_id=TRACE_ID,
+        payload={
+            'ids': [uuid4(), uuid4()],
+            'day': date(2024, 2, 29),
+            'big': 2**70,
+            'raw': bytes(range(256)),
+            'nested': {'a': [1.5, None], 'b': []},
+            # Longer than short string
+            'text': 'x' * 300,
+        },
+    )
+
+    loaded = TypedRequest.from_bytes(request.dump(BINARY_CODEC), codec=BINARY_CODEC)
+
+    assert loaded.method_name == 'typed'
+    assert loaded.trace_id == TRACE_ID
+    assert loaded.payload == request.payload
+    assert BINARY_CODEC.find_method_name(request.dump(BINARY_CODEC)) == 'typed'
+
+
+@pytest.mark.parametrize(('sequence', 'end_of_stream'), [(None, False), (3, False), (4, True)])
+def test_binary_response_round_trip(sequence: int | None, end_of_stream: bool) -> None:  # noqa: FBT001
+    response = ExampleResponse(
+        method_name='echo',
+        trace_id=TRACE_ID,
+        success=True,
+        payload=example_response_values,
+        sequence=sequence,
+        end_of_stream=end_of_stream,
+    )
+    data = response.dump(BINARY_CODEC)
+
+    loaded = ExampleResponse.from_bytes(data, codec=BINARY_CODEC)
+
+    assert BINARY_CODEC.find_stream_marker(data) == (True, sequence, end_of_stream)
+    assert BINARY_CODEC.find_trace_id(data, is_response=True) == TRACE_ID
+    assert (loaded.sequence, loaded.end_of_stream) == (sequence, end_of_stream)
+    # Enum and aware datetime are restored from binary values
+    assert loaded.payload == response.payload
+
+
+def test_binary_frame_is_smaller_than_json() -> None:
+    response = ExampleResponse(method_name='echo', trace_id=TRACE_ID, success=True, payload=example_response_values)
+
+    assert len(response.dump(BINARY_CODEC)) < len(response.dump(JSON_CODEC))
+
+
+def test_binary_headers_are_found_without_payload() -> None:
+    data = ServiceRequest(method_name='echo', trace_id=TRACE_ID, payload={'service_id': 'payload'}).dump(BINARY_CODEC)
+
+    assert BINARY_CODEC.find_raw_header(data, 'trace_id') == TRACE_ID
+    assert BINARY_CODEC.find_raw_header(data, 'service_id') is None
+
+    lazy = ServiceRequest.from_bytes(data, codec=BINARY_CODEC, lazy_payload=True)
+    assert lazy.raw_payload is not None
+    assert lazy.payload.service_id == 'payload'  # type:ignore[attr-defined]
+
+
+@pytest.mark.parametrize(
+    'data',
+    [b'', b'\x00', b'\x04echo', b'\x04echo\x00\x00\x00\x02\x0c\x00', b'\x04echo\x00\x00\x00\x00\x0c\xff\xff\xff\xff'],
+)
+def test_invalid_binary_request_is_rejected(data: bytes) -> None:
+    with pytest.raises(InvalidMessageFormatError):
+        ExampleRequest.from_bytes(data, codec=BINARY_CODEC)
+
+
+async def test_binary_codec_over_connection(message_handler: MessageHandler) -> None:
+    async with (
+        serving(message_handler, framing_mode=FramingMode.LENGTH_PREFIXED) as server,
+        connected(server, framing_mode=FramingMode.LENGTH_PREFIXED, codec=BINARY_CODEC.name) as client,
+    ):
+        response = await client.send(example_request(), ExampleResponse)
+
+        assert client.codec is BINARY_CODEC
+        assert response.success
+        assert response.payload.object_field.datetime_field.tzinfo is not None  # type:ignore[attr-defined]
+
+
+def test_binary_codec_requires_length_prefix() -> None:
+    with pytest.raises(ClientFatalError):
+        BaseClient('127.0.0.1', codec=BINARY_CODEC.name)
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from shiny_rpc.client import BaseClient
+from shiny_rpc.compression import (
+    COMPRESSED_MARKER,
+    ZLIB,
+    Compression,
+    make_compression_dictionary,
+)
+from shiny_rpc.errors import (
+    ClientFatalError,
+    InvalidMessageFormatError,
+    MaxMessageSizeReceivedError,
+)
+from shiny_rpc.examples import ExampleResponse
+from shiny_rpc.framing import FramingMode
+from shiny_rpc.message_hander import MessageHandler
+from tests.helpers import (
+    connected,
+    example_request,
+    serving,
+)
+
+DICTIONARY = make_compression_dictionary(field_names=['send_this', 'object_field'], values=['second'])
+MESSAGE = b'echo{"send_this":"' + b'back' * 500 + b'"}{"trace_id":"x"}'
+
+
+def test_make_compression_dictionary() -> None:
+    assert DICTIONARY == b'"second""send_this":"object_field":'
+
+
+@pytest.mark.parametrize('dictionary', [None, DICTIONARY])
+def test_compress_round_trip(dictionary: bytes | None) -> None:
+    compression = Compression(max_message_size=2**20, dictionary=dictionary)
+    compressed = compression.compress(MESSAGE)
+
+    assert compressed.startswith(COMPRESSED_MARKER)
+    assert len(compressed) < len(MESSAGE)
+    assert compression.decompress(compressed) == MESSAGE
+
+
+def test_small_and_incompressible_messages_are_sent_as_is() -> None:
+    compression = Compression(max_message_size=2**20, threshold=64)
+    random_message = os.urandom(256)
+
+    assert compression.compress(b'echo{}{}') == b'echo{}{}'
+    assert compression.compress(random_message) == random_message
+    assert compression.decompress(b'echo{}{}') == b'echo{}{}'
+
+
+def test_dictionary_is_part_of_name() -> None:
+    assert Compression(max_message_size=2**20).name == ZLIB
+    assert Compression(max_message_size=2**20, dictionary=DICTIONARY).name.startswith(f'{ZLIB}:')
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        COMPRESSED_MARKER + b'not zlib',
+        # Truncated stream
+        Compression(max_message_size=2**20).compress(MESSAGE)[:-8],
+        # Compressed with dictionary, which other side doesn`t have
+        Compression(max_message_size=2**20, dictionary=DICTIONARY).compress(MESSAGE),
+    ],
+)
+def test_decompress_rejects_invalid_frame(data: bytes) -> None:
+    with pytest.raises(InvalidMessageFormatError):
+        Compression(max_message_size=2**20).decompress(data)
+
+
+def test_decompress_limits_message_size() -> None:
+    data = Compression(max_message_size=2**20).compress(MESSAGE)
+
+    with pytest.raises(MaxMessageSizeReceivedError):
+        Compression(max_message_size=len(MESSAGE) - 1).decompress(data)
+
+
+@pytest.mark.parametrize(('server_dictionary', 'expected_dictionary'), [(DICTIONARY, DICTIONARY), (None, None)])
+async def test_compression_is_negotiated_in_handshake(
+    message_handler: MessageHandler,
+    server_dictionary: bytes | None,
+    expected_dictionary: bytes | None,
+) -> None:
+    async with (
+        serving(
+            message_handler,
+            framing_mode=FramingMode.LENGTH_PREFIXED,
+            compression_dictionary=server_dictionary,
+        ) as server,
+        connected(
+            server,
+            framing_mode=FramingMode.LENGTH_PREFIXED,
+            compression=True,
+            compression_dictionary=DICTIONARY,
+        ) as client,
+    ):
+        response = await client.send(example_request(send_this='back' * 500), ExampleResponse)
+
+        assert client.compression is not None
+        assert client.compression.dictionary == expected_dictionary
+        assert response.success
+        assert response.payload.send_this == 'back' * 500  # type:ignore[attr-defined]
+
+
+def test_compression_requires_length_prefix() -> None:
+    with pytest.raises(ClientFatalError):
+        BaseClient('127.0.0.1', compression=True)
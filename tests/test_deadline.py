@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Response
+from shiny_rpc.user import User
+from tests.helpers import (
+    connected,
+    echo,
+    example_request,
+    make_user,
+    serving,
+)
+
+TIMEOUT_MS = 50
+
+
+@pytest.fixture
+def slow_handler(message_handler: MessageHandler) -> MessageHandler:
+    async def slow(request: ExampleRequest, user: User) -> ExampleResponse:
+        await asyncio.sleep(1)
+        return await echo(request, user)
+
+    message_handler.add_method('slow', slow)  # type:ignore[arg-type]
+    return message_handler
+
+
+def test_time_left() -> None:
+    request = example_request()
+    assert request.time_left is None
+
+    request.headers.deadline = time.time() + 10
+    assert request.time_left == pytest.approx(10, abs=1)
+
+
+async def test_expired_request_is_dropped_before_decode(message_handler: MessageHandler) -> None:
+    calls: list[ExampleRequest] = []
+
+    async def recorded(request: ExampleRequest, user: User) -> ExampleResponse:
+        calls.append(request)
+        return await echo(request, user)
+
+    message_handler.add_method('recorded', recorded)  # type:ignore[arg-type]
+    # Invalid payload would be ValidationError, if it was decoded
+    message = b'recorded{"send_this":1}{"trace_id":"x","deadline":%d}' % (time.time() - 1)
+
+    response = await message_handler.handle(message, make_user())
+
+    assert isinstance(response, Response)
+    assert response.payload.error_code == 'DeadlineExceeded'  # type:ignore[attr-defined]
+    assert response.trace_id == 'x'
+    assert not calls
+
+
+async def test_method_is_stopped_at_deadline(slow_handler: MessageHandler) -> None:
+    request = example_request('slow')
+    request.headers.deadline = time.time() + TIMEOUT_MS / 1000
+
+    started_at = time.monotonic()
+    response = await slow_handler.handle(request.dump(), make_user())
+
+    assert time.monotonic() - started_at < 1
+    assert isinstance(response, Response)
+    assert response.payload.error_code == 'DeadlineExceeded'  # type:ignore[attr-defined]
+
+
+async def test_client_timeout_is_sent_to_server(slow_handler: MessageHandler) -> None:
+    async with serving(slow_handler) as server, connected(server, timeout_ms=TIMEOUT_MS) as client:
+        response = await client.send(example_request('slow'), ExampleResponse)
+
+        assert not response.success
+        assert response.payload.error_code == 'DeadlineExceeded'  # type:ignore[attr-defined]
+        # Connection is still usable
+        assert (await client.send(example_request(), ExampleResponse)).success
+
+
+async def test_pipelined_client_doesnt_wait_after_deadline(message_handler: MessageHandler) -> None:
+    release = asyncio.Event()
+
+    async def stuck(request: ExampleRequest, user: User) -> ExampleResponse:
+        # Ignores deadline, so only client can stop waiting
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            await release.wait()
+        return await echo(request, user)
+
+    message_handler.add_method('stuck', stuck)  # type:ignore[arg-type]
+
+    async with (
+        serving(message_handler, max_in_flight=8) as server,
+        connected(server, max_in_flight=8, timeout_ms=TIMEOUT_MS) as client,
+    ):
+        response = await client.send(example_request('stuck'), ExampleResponse)
+        assert response.payload.error_code == 'DeadlineExceeded'  # type:ignore[attr-defined]
+        assert not client.pending
+
+        # Late response is skipped as one with unknown trace_id
+        release.set()
+        assert (await client.send(example_request(), ExampleResponse)).success
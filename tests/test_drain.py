@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from shiny_rpc.errors import ClientFatalError
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import ErrorResponse
+from shiny_rpc.server import Server
+from shiny_rpc.user import User
+from tests.helpers import (
+    connected,
+    echo,
+    example_request,
+    running,
+    serving,
+)
+
+
+async def sleep(request: ExampleRequest, user: User) -> ExampleResponse:
+    await asyncio.sleep(float(request.payload.send_this))  # type:ignore[attr-defined]
+    return await echo(request, user)
+
+
+@pytest.fixture
+def sleep_handler(message_handler: MessageHandler) -> MessageHandler:
+    message_handler.add_method('sleep', sleep)  # type:ignore[arg-type]
+    return message_handler
+
+
+async def test_in_flight_request_is_completed(sleep_handler: MessageHandler) -> None:
+    async with serving(sleep_handler, max_in_flight=8) as server, connected(server, max_in_flight=8) as client:
+        pending = asyncio.create_task(client.send(example_request('sleep', send_this='0.2'), ExampleResponse))
+        await asyncio.sleep(0.05)
+        server.stop()
+
+        response = await pending
+
+        assert response.success
+        assert client.is_draining
+
+        with pytest.raises(ClientFatalError):
+            await client.send(example_request(), ExampleResponse)
+
+
+async def test_request_is_rejected_while_draining(sleep_handler: MessageHandler) -> None:
+    async with (
+        serving(sleep_handler, max_in_flight=8) as server,
+        connected(server, max_in_flight=8) as busy_client,
+        connected(server) as client,
+    ):
+        pending = asyncio.create_task(busy_client.send(example_request('sleep', send_this='0.2'), ExampleResponse))
+        await asyncio.sleep(0.05)
+        server.stop()
+        await asyncio.sleep(0.05)
+
+        # Client which has not read drain notice yet still sends requests
+        await client._write_message(example_request().dump())
+        response = ErrorResponse.from_bytes(await client._read_frame())
+
+        assert client.is_draining
+        assert response.payload.error_code == 'ServerShuttingDown'  # type:ignore[attr-defined]
+        assert response.payload.details['details']['retryable']  # type:ignore[attr-defined]
+        assert (await pending).success
+
+
+async def test_request_above_grace_is_aborted(sleep_handler: MessageHandler) -> None:
+    async with (
+        serving(sleep_handler, max_in_flight=8, shutdown_grace_ms=50) as server,
+        connected(server, max_in_flight=8) as client,
+    ):
+        pending = asyncio.create_task(client.send(example_request('sleep', send_this='1'), ExampleResponse))
+        await asyncio.sleep(0.05)
+        server.stop()
+
+        with pytest.raises(ClientFatalError):
+            await pending
+
+
+async def test_client_reconnects_to_new_server(sleep_handler: MessageHandler) -> None:
+    async with (
+        serving(sleep_handler, max_in_flight=8) as server,
+        connected(server, max_in_flight=8) as busy_client,
+        connected(server, max_in_flight=8) as client,
+    ):
+        pending = asyncio.create_task(busy_client.send(example_request('sleep', send_this='0.2'), ExampleResponse))
+        await asyncio.sleep(0.05)
+        server.stop()
+        await asyncio.sleep(0.05)
+        assert client.is_draining
+
+        # Draining server doesn`t listen anymore, so its replacement can take the port,
+        # it gets own message handler, because server sets its scheduler to message handler
+        replacement_handler = MessageHandler()
+        replacement_handler.add_method('echo', echo)  # type:ignore[arg-type]
+
+        async with running(Server(server.host, server.port, replacement_handler)):
+            await client.connect()
+
+            assert not client.is_draining
+            assert (await client.send(example_request(), ExampleResponse)).success
+            assert (await pending).success
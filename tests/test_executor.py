@@ -0,0 +1,96 @@
+import asyncio
+import os
+import threading
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+
+from shiny_rpc.errors import ServerFatalError
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.executor import ExecutionPolicy
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Response
+from shiny_rpc.user import User
+from tests.helpers import (
+    count,
+    example_request,
+    make_user,
+)
+
+
+def where(request: ExampleRequest, user: User | None) -> ExampleResponse:  # noqa: ARG001
+    # Pid and thread, where method is called, and whether it has event loop
+    try:
+        asyncio.get_running_loop()
+        has_loop = True
+    except RuntimeError:
+        has_loop = False
+
+    return ExampleResponse(
+        method_name=request.method_name,
+        trace_id=request.trace_id,
+        success=True,
+        payload={**request.payload.model_dump(), 'some_param': f'{os.getpid()}:{threading.get_ident()}:{has_loop}'},
+    )
+
+
+async def async_where(request: ExampleRequest, user: User | None) -> ExampleResponse:
+    return where(request, user)
+
+
+def failing(request: ExampleRequest, user: User | None) -> ExampleResponse:  # noqa: ARG001
+    raise RuntimeError
+
+
+@pytest.fixture
+def pool_handler(message_handler: MessageHandler) -> Iterator[MessageHandler]:
+    message_handler.add_method('sync', where)  # type:ignore[arg-type]
+    message_handler.add_method('loop', async_where)  # type:ignore[arg-type]
+    message_handler.add_method('thread', async_where, ExecutionPolicy.THREAD)  # type:ignore[arg-type]
+    message_handler.add_method('process', where, ExecutionPolicy.PROCESS)  # type:ignore[arg-type]
+    message_handler.add_method('failing_process', failing, ExecutionPolicy.PROCESS)  # type:ignore[arg-type]
+    yield message_handler
+    message_handler.executor.shutdown()
+
+
+async def call_where(message_handler: MessageHandler, method_name: str) -> tuple[int, int, bool]:
+    response = await message_handler.handle(example_request(method_name).dump(), make_user())
+    assert isinstance(response, Response)
+    assert response.success
+
+    pid, thread, has_loop = response.payload.some_param.split(':')  # type:ignore[attr-defined]
+    return int(pid), int(thread), has_loop == 'True'
+
+
+async def test_sync_method_is_called_in_thread(pool_handler: MessageHandler) -> None:
+    pid, thread, has_loop = await call_where(pool_handler, 'sync')
+
+    assert (pid, has_loop) == (os.getpid(), False)
+    assert thread != threading.get_ident()
+
+
+async def test_async_method_is_called_in_loop_or_thread(pool_handler: MessageHandler) -> None:
+    assert await call_where(pool_handler, 'loop') == (os.getpid(), threading.get_ident(), True)
+
+    pid, thread, has_loop = await call_where(pool_handler, 'thread')
+
+    assert (pid, has_loop) == (os.getpid(), True)
+    assert thread != threading.get_ident()
+
+
+async def test_method_is_called_in_process(pool_handler: MessageHandler) -> None:
+    pid, _, _ = await call_where(pool_handler, 'process')
+    response = await pool_handler.handle(example_request('failing_process').dump(), make_user())
+
+    assert pid != os.getpid()
+    assert isinstance(response, Response)
+    assert response.payload.error_code == 'MethodInternal'  # type:ignore[attr-defined]
+
+
+def test_streaming_method_is_called_in_loop(message_handler: MessageHandler) -> None:
+    async def stream(request: ExampleRequest, user: User) -> AsyncIterator[ExampleResponse]:
+        async for response in count(request, user):
+            yield response
+
+    with pytest.raises(ServerFatalError):
+        message_handler.add_method('stream', stream, ExecutionPolicy.THREAD)  # type:ignore[arg-type]
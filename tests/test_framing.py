@@ -0,0 +1,89 @@
+import asyncio
+from collections.abc import Iterable
+
+import pytest
+
+from shiny_rpc.errors import InvalidMessageFormatError, MaxMessageSizeReceivedError
+from shiny_rpc.examples import ExampleResponse
+from shiny_rpc.framing import (
+    LENGTH_HEADER,
+    FramingMode,
+    make_framing,
+)
+from shiny_rpc.message_hander import MessageHandler
+from tests.helpers import (
+    connected,
+    example_request,
+    serving,
+)
+
+
+class BufferWriter:
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writelines(self, fragments: Iterable[bytes], /) -> None:
+        for fragment in fragments:
+            self.data += fragment
+
+
+def make_reader(data: bytes, limit: int = 2**16) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader(limit=limit)
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+@pytest.mark.parametrize('mode', list(FramingMode))
+async def test_frames_round_trip(mode: FramingMode) -> None:
+    framing = make_framing(mode=mode, max_message_size=2**10)
+    writer = BufferWriter()
+    messages = [b'first{}{}', b'', b'third{"a":1}{}']
+
+    for message in messages:
+        framing.write(writer, message)  # type:ignore[arg-type]
+
+    reader = make_reader(bytes(writer.data))
+    assert [await framing.read(reader) for _ in messages] == messages
+    assert reader.at_eof()
+
+
+async def test_length_prefix_allows_any_byte() -> None:
+    framing = make_framing(mode=FramingMode.LENGTH_PREFIXED, max_message_size=2**10)
+    writer = BufferWriter()
+    framing.write(writer, bytes(range(256)))  # type:ignore[arg-type]
+
+    assert writer.data[:LENGTH_HEADER.size] == LENGTH_HEADER.pack(256)
+    assert await framing.read(make_reader(bytes(writer.data))) == bytes(range(256))
+
+
+async def test_length_prefix_rejects_frame_above_max_size() -> None:
+    framing = make_framing(mode=FramingMode.LENGTH_PREFIXED, max_message_size=8)
+
+    with pytest.raises(MaxMessageSizeReceivedError):
+        await framing.read(make_reader(LENGTH_HEADER.pack(9) + b'x' * 9))
+
+
+async def test_separator_rejects_frame_above_reader_limit() -> None:
+    framing = make_framing(mode=FramingMode.SEPARATOR, max_message_size=8)
+
+    with pytest.raises(MaxMessageSizeReceivedError):
+        await framing.read(make_reader(b'x' * 64 + b'\x1a', limit=8))
+
+
+async def test_separator_framing_has_no_chunks() -> None:
+    framing = make_framing(mode=FramingMode.SEPARATOR, max_message_size=2**10)
+
+    with pytest.raises(InvalidMessageFormatError):
+        framing.write_chunk(BufferWriter(), b'chunk', more=True)  # type:ignore[arg-type]
+
+
+@pytest.mark.parametrize('mode', list(FramingMode))
+async def test_client_and_server_agree_on_framing(message_handler: MessageHandler, mode: FramingMode) -> None:
+    async with serving(message_handler, framing_mode=mode) as server, connected(server, framing_mode=mode) as client:
+        for send_this in ('first', 'second'):
+            client.framing.write(client.output, example_request(send_this=send_this).dump())
+            response = ExampleResponse.load(await client.framing.read(client.reader))
+
+            assert response.success
+            assert response.payload.send_this == send_this  # type:ignore[attr-defined]
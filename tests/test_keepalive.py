@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.user import User
+from tests.helpers import (
+    connected,
+    echo,
+    example_request,
+    serving,
+)
+
+INTERVAL_MS = 50
+# Reaper checks connections every half of the shortest timeout
+WAIT = INTERVAL_MS * 6 / 1000
+
+
+async def test_idle_connection_is_closed(message_handler: MessageHandler) -> None:
+    async with serving(message_handler, idle_timeout_ms=INTERVAL_MS) as server, connected(server) as client:
+        assert (await client.send(example_request(), ExampleResponse)).success
+        await asyncio.sleep(WAIT)
+
+        assert server.reaped_idle == 1
+        assert not server.users
+
+        with pytest.raises(asyncio.IncompleteReadError):
+            await client.send(example_request(), ExampleResponse)
+
+        await client.connect()
+        assert (await client.send(example_request(), ExampleResponse)).success
+
+
+async def test_connection_with_request_in_progress_is_not_idle(message_handler: MessageHandler) -> None:
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow(request: ExampleRequest, user: User) -> ExampleResponse:
+        started.set()
+        await release.wait()
+        return await echo(request, user)
+
+    message_handler.add_method('slow', slow)  # type:ignore[arg-type]
+
+    # Reaper doesn`t fire during test, connection is checked explicitly with shifted clock
+    async with serving(message_handler, idle_timeout_ms=60_000) as server, connected(server) as client:
+        sending = asyncio.ensure_future(client.send(example_request('slow'), ExampleResponse))
+        await started.wait()
+
+        user, = server.users.values()
+        server._reap_user(user, time.monotonic() + 2 * server.idle_timeout)  # type:ignore[operator]
+        assert server.reaped_idle == 0
+
+        released_at = time.monotonic()
+        release.set()
+        assert (await sending).success
+        await server.idle.wait()
+
+        # Handler may run longer than idle timeout, so connection is not reaped right after it
+        assert user.last_active >= released_at
+
+
+async def test_client_answers_ping(message_handler: MessageHandler) -> None:
+    async with (
+        serving(message_handler, keepalive_interval_ms=INTERVAL_MS, keepalive_timeout_ms=INTERVAL_MS) as server,
+        connected(server, max_in_flight=8) as client,
+    ):
+        await asyncio.sleep(WAIT)
+
+        assert server.reaped_dead == 0
+        assert (await client.send(example_request(), ExampleResponse)).success
+
+
+async def test_dead_connection_is_aborted(message_handler: MessageHandler) -> None:
+    async with (
+        serving(message_handler, keepalive_interval_ms=INTERVAL_MS, keepalive_timeout_ms=INTERVAL_MS) as server,
+        connected(server, max_in_flight=8) as client,
+    ):
+        # Client doesn`t answer ping, while it is writing request
+        async with client.lock:
+            await asyncio.sleep(WAIT)
+
+        assert server.reaped_dead == 1
+        assert not server.users
+
+
+async def test_client_without_keepalive_is_not_pinged(message_handler: MessageHandler) -> None:
+    async with (
+        serving(message_handler, keepalive_interval_ms=INTERVAL_MS, keepalive_timeout_ms=INTERVAL_MS) as server,
+        connected(server) as client,
+    ):
+        await asyncio.sleep(WAIT)
+
+        assert server.reaped_dead == 0
+        assert (await client.send(example_request(), ExampleResponse)).success
@@ -0,0 +1,63 @@
+from shiny_rpc.examples import ExampleRequest
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Response
+from shiny_rpc.user import User
+from tests.helpers import (
+    LazyExampleRequest,
+    example_request,
+    make_user,
+)
+
+INVALID_PAYLOAD = b'{"send_this":1}{"trace_id":"x"}'
+
+
+async def handle(message_handler: MessageHandler, message: bytes) -> Response:
+    response = await message_handler.handle(message, make_user())
+    assert isinstance(response, Response)
+    return response
+
+
+async def test_unknown_method(message_handler: MessageHandler) -> None:
+    response = await handle(message_handler, b'unknown' + INVALID_PAYLOAD)
+
+    assert not response.success
+    assert response.trace_id == 'x'
+    assert response.payload.error_code == 'UnknownMethod'  # type:ignore[attr-defined]
+
+
+async def test_invalid_payload_of_eager_request(message_handler: MessageHandler) -> None:
+    response = await handle(message_handler, b'echo' + INVALID_PAYLOAD)
+
+    assert not response.success
+    assert response.trace_id == 'x'
+    assert response.payload.error_code == 'ValidationError'  # type:ignore[attr-defined]
+
+
+async def test_lazy_payload_is_not_validated_until_access(message_handler: MessageHandler) -> None:
+    async def headers_only(request: LazyExampleRequest, user: User) -> Response:  # noqa: ARG001
+        return Response(method_name=request.method_name, trace_id=request.trace_id, success=True)
+
+    async def touches_payload(request: LazyExampleRequest, user: User) -> Response:  # noqa: ARG001
+        request.payload  # noqa: B018
+        return Response(method_name=request.method_name, trace_id=request.trace_id, success=True)
+
+    message_handler.add_method('headers_only', headers_only)  # type:ignore[arg-type]
+    message_handler.add_method('touches_payload', touches_payload)  # type:ignore[arg-type]
+
+    assert (await handle(message_handler, b'headers_only' + INVALID_PAYLOAD)).success
+
+    response = await handle(message_handler, b'touches_payload' + INVALID_PAYLOAD)
+    assert not response.success
+    # Error of lazy payload is the same as of eager one, not a failure of method
+    assert response.payload.error_code == 'ValidationError'  # type:ignore[attr-defined]
+
+
+async def test_handler_exception_is_internal_error(message_handler: MessageHandler) -> None:
+    async def failing(request: ExampleRequest, user: User) -> Response:  # noqa: ARG001
+        raise RuntimeError
+
+    message_handler.add_method('failing', failing)  # type:ignore[arg-type]
+    response = await handle(message_handler, example_request('failing').dump())
+
+    assert not response.success
+    assert response.payload.error_code == 'MethodInternal'  # type:ignore[attr-defined]
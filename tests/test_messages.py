@@ -0,0 +1,153 @@
+import pytest
+
+from shiny_rpc import messages
+from shiny_rpc.errors import InvalidMessageFormatError, ValidationError
+from shiny_rpc.examples import (
+    ExampleRequest,
+    ExampleResponse,
+    example_request_values,
+    example_response_values,
+)
+from shiny_rpc.messages import (
+    ErrorResponse,
+    Request,
+    Response,
+)
+from tests.helpers import LazyExampleRequest
+
+TRACE_ID = '9f6a4a56-4c46-4c0c-9e4a-8d6b2a6f1d3e'
+
+
+def test_request_from_bytes_equals_loaded_one() -> None:
+    data = ExampleRequest(method_name='echo', trace_id=TRACE_ID, payload=example_request_values).dump()
+
+    request = ExampleRequest.from_bytes(data)
+    loaded = ExampleRequest.load(data)
+
+    assert request.method_name == loaded.method_name == 'echo'
+    assert request.trace_id == loaded.trace_id == TRACE_ID
+    assert request.payload == loaded.payload
+    assert request.headers == loaded.headers
+
+
+def test_response_from_bytes_equals_loaded_one() -> None:
+    data = ExampleResponse(
+        method_name='echo',
+        trace_id=TRACE_ID,
+        success=True,
+        payload=example_response_values,
+    ).dump()
+
+    response = ExampleResponse.from_bytes(data)
+    loaded = ExampleResponse.load(data)
+
+    assert response.success is loaded.success is True
+    assert response.trace_id == loaded.trace_id == TRACE_ID
+    assert response.payload == loaded.payload
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'echo{"send_this":"back"}{"trace_id":"x"}',
+        b'echo{"send_this":1,"object_field":{}}{"trace_id":"x"}',
+        b'echo{"send_this":}{"trace_id":"x"}',
+        b'echo{}{"trace_id":1}',
+    ],
+)
+def test_request_from_bytes_rejects_invalid_message(data: bytes) -> None:
+    with pytest.raises(ValidationError):
+        ExampleRequest.from_bytes(data)
+
+
+def test_response_from_bytes_requires_trace_id() -> None:
+    with pytest.raises(InvalidMessageFormatError):
+        Response.from_bytes(b'echo:ok{}{}')
+
+
+def test_error_response_from_bytes() -> None:
+    response = ErrorResponse.from_bytes(b'echo:err{"error_code":"Failed"}{"trace_id":"x"}')
+
+    assert not response.success
+    assert response.payload.error_code == 'Failed'  # type:ignore[attr-defined]
+    assert response.payload.details == {}  # type:ignore[attr-defined]
+
+
+def test_find_method_name_without_decoding() -> None:
+    assert Request.find_method_name(b'echo{"broken":}{"trace_id":"x"}') == 'echo'
+
+
+def test_dump_round_trip() -> None:
+    request = ExampleRequest(method_name='echo', trace_id=TRACE_ID, payload=example_request_values)
+    data = request.dump()
+
+    assert data.startswith(b'echo{"send_this":"back",')
+    assert data.endswith(f'{{"trace_id":"{TRACE_ID}","deadline":null}}'.encode())
+    assert ExampleRequest.from_bytes(data).payload == request.payload
+
+
+def test_dump_payload_of_schema_subclass() -> None:
+    class ExtendedPayload(ExampleRequest.PayloadSchema):
+        extra: int = 1
+
+    payload = ExtendedPayload.model_validate(example_request_values)
+    data = ExampleRequest(method_name='echo', trace_id=TRACE_ID, payload=payload).dump()
+
+    assert b'"extra":1' in data
+
+
+@pytest.mark.parametrize(
+    ('success', 'sequence', 'end_of_stream', 'prefix'),
+    [
+        (True, None, False, b'echo:ok{'),
+        (False, None, False, b'echo:err{'),
+        (True, 2, False, b'echo:ok@2{'),
+        (True, 3, True, b'echo:end@3{'),
+    ],
+)
+def test_dump_response_prefix(success: bool, sequence: int | None, end_of_stream: bool, prefix: bytes) -> None:  # noqa: FBT001
+    response = Response(
+        method_name='echo',
+        trace_id=TRACE_ID,
+        success=success,
+        sequence=sequence,
+        end_of_stream=end_of_stream,
+    )
+
+    assert response.dump().startswith(prefix)
+
+
+def test_lazy_payload_is_validated_on_access() -> None:
+    request = LazyExampleRequest.from_bytes(b'echo{"send_this":1}{"trace_id":"x"}')
+
+    assert not request.is_payload_loaded
+    assert request.trace_id == 'x'
+    assert bytes(request.raw_payload or b'') == b'{"send_this":1}'
+
+    with pytest.raises(ValidationError):
+        request.payload  # noqa: B018
+
+
+def test_lazy_payload_is_loaded_once() -> None:
+    request = LazyExampleRequest.from_bytes(
+        ExampleRequest(method_name='echo', trace_id=TRACE_ID, payload=example_request_values).dump(),
+    )
+
+    assert request.payload is request.payload
+    assert request.is_payload_loaded
+    assert request.raw_payload is None
+
+
+def test_payload_is_deferred_on_demand() -> None:
+    data = ExampleRequest(method_name='echo', trace_id=TRACE_ID, payload=example_request_values).dump()
+
+    assert not ExampleRequest.from_bytes(data, lazy_payload=True).is_payload_loaded
+    assert LazyExampleRequest.from_bytes(data, lazy_payload=False).is_payload_loaded
+
+
+def test_method_name_prefixes_are_bounded() -> None:
+    for index in range(messages.MAX_CACHED_PREFIXES + 1):
+        Response(method_name=f'unknown_{index}', trace_id=TRACE_ID, success=False).dump()
+
+    assert messages._response_prefix.cache_info().currsize == messages.MAX_CACHED_PREFIXES
+    assert Response.method_name_prefix('echo', success=False) == b'echo:err'
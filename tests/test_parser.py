@@ -0,0 +1,146 @@
+import mmap
+from typing import Any
+
+import orjson
+import pytest
+
+from shiny_rpc.errors import InvalidMessageFormatError
+from shiny_rpc.parser import (
+    find_header_value,
+    find_method_name,
+    parse_request,
+    parse_response,
+)
+
+# (raw message, expected (method_name, payload, headers)) or None if message must be rejected
+MESSAGE_CORPUS: list[tuple[bytes, tuple[str, Any, Any] | None]] = [
+    (
+        b'method{"a":1}{"trace_id":"x"}',
+        ('method', {'a': 1}, {'trace_id': 'x'}),
+    ),
+    (
+        b'method{}{}',
+        ('method', {}, {}),
+    ),
+    (
+        b'nested{"a":{"b":{"c":[{"d":{}}]}}}{"trace_id":"x"}',
+        ('nested', {'a': {'b': {'c': [{'d': {}}]}}}, {'trace_id': 'x'}),
+    ),
+    (
+        b'nested_headers{"a":1}{"trace_id":"x","meta":{"inner":{"deep":true}}}',
+        ('nested_headers', {'a': 1}, {'trace_id': 'x', 'meta': {'inner': {'deep': True}}}),
+    ),
+    (
+        b'braces_in_strings{"a":"}{"}{"trace_id":"{{","b":"}}"}',
+        ('braces_in_strings', {'a': '}{'}, {'trace_id': '{{', 'b': '}}'}),
+    ),
+    (
+        b'escaped_quotes{"a":"\\"{"}{"b":"\\"}\\\\","c":"\\\\\\"{"}',
+        ('escaped_quotes', {'a': '"{'}, {'b': '"}\\', 'c': '\\"{'}),
+    ),
+    (
+        'юникод{"a":"☃"}{"b":"☃{"}'.encode(),
+        ('юникод', {'a': '☃'}, {'b': '☃{'}),
+    ),
+    (b'', None),
+    (b'method', None),
+    (b'{"a":1}{"b":2}', None),
+    (b'method{"a":1}', None),
+    (b'method{"a":1}{"b":2', None),
+    (b'method{"a":1}{"b":"}', None),
+    (b'method{"a":1}}', None),
+    (b'method{"a":1}{"b":2}trailing', None),
+    (b'method{"a":1}"}{"b":2}', None),
+    (b'\xff\xfe{"a":1}{"b":2}', None),
+    (b'method{"a":"' + b'{' * 10_000 + b'"}{"b":2}', ('method', {'a': '{' * 10_000}, {'b': 2})),
+    (b'method{' + b'"' * 10_000 + b'}', None),
+]
+
+
+def parse(data: Any) -> tuple[str, Any, Any] | None:  # noqa:ANN401
+    try:
+        message = parse_request(data)
+        return message.method_name, orjson.loads(message.payload), orjson.loads(message.headers)
+    except (InvalidMessageFormatError, orjson.JSONDecodeError):
+        return None
+
+
+@pytest.mark.parametrize(('raw_message', 'expected'), MESSAGE_CORPUS, ids=lambda value: repr(value)[:40])
+def test_parse_request(raw_message: bytes, expected: tuple[str, Any, Any] | None) -> None:
+    assert parse(raw_message) == expected
+
+
+@pytest.mark.parametrize(('raw_message', 'expected'), MESSAGE_CORPUS[:7], ids=lambda value: repr(value)[:40])
+def test_parse_request_from_any_buffer(raw_message: bytes, expected: tuple[str, Any, Any]) -> None:
+    assert parse(bytearray(raw_message)) == expected
+    assert parse(memoryview(raw_message)) == expected
+    assert parse(raw_message.decode()) == expected
+
+    with mmap.mmap(-1, len(raw_message)) as mapping:
+        mapping.write(raw_message)
+        # Upload mapping is read from its start, see `ChunkedUpload`
+        mapping.seek(0)
+        assert parse(mapping) == expected
+
+
+def test_payload_and_headers_are_not_copied() -> None:
+    raw_message = bytearray(b'method{"a":1}{"b":2}')
+    message = parse_request(raw_message)
+    raw_message[-2:-1] = b'3'
+
+    assert bytes(message.payload) == b'{"a":1}'
+    assert bytes(message.headers) == b'{"b":3}'
+
+
+def test_find_method_name() -> None:
+    assert find_method_name(b'method{"a":"}"}{"b":2}') == 'method'
+
+    with pytest.raises(InvalidMessageFormatError):
+        find_method_name(b'{}{}')
+
+
+@pytest.mark.parametrize(
+    ('raw_message', 'expected'),
+    [
+        (b'method:ok{"a":1}{"b":2}', ('method', True, None, False)),
+        (b'method:err{}{}', ('method', False, None, False)),
+        (b'method:ok@3{}{}', ('method', True, 3, False)),
+        (b'method:end@4{}{}', ('method', True, 4, True)),
+        (b'method:err@5{}{}', ('method', False, 5, True)),
+    ],
+)
+def test_parse_response(raw_message: bytes, expected: tuple[str, bool, int | None, bool]) -> None:
+    message = parse_response(raw_message)
+
+    assert (message.method_name, message.success, message.sequence, message.end_of_stream) == expected
+
+
+@pytest.mark.parametrize(
+    'raw_message',
+    [b'method{}{}', b'method:{}{}', b'method:maybe{}{}', b'method:end{}{}', b'method:ok@{}{}', b'method:ok@x{}{}'],
+)
+def test_parse_response_rejects_invalid_marker(raw_message: bytes) -> None:
+    with pytest.raises(InvalidMessageFormatError):
+        parse_response(raw_message)
+
+
+@pytest.mark.parametrize(
+    ('raw_message', 'expected'),
+    [
+        (b'method{"id":1}{"id":2}', b'2'),
+        # Key of payload is not a header
+        (b'method{"id":1}{"other":2}', None),
+        (b'method{"id":1}{"a":"}","other":2}', None),
+        (b'method{"a":"\\"id\\":3"}{"id" : "x"}', b'"x"'),
+        (b'method{}{"b":"\\"id\\":3"}', None),
+    ],
+)
+def test_find_header_value(raw_message: bytes, expected: bytes | None) -> None:
+    value = find_header_value(raw_message, 'id')
+
+    assert (bytes(value) if value is not None else None) == expected
+
+
+def test_find_header_value_rejects_invalid_message() -> None:
+    with pytest.raises(InvalidMessageFormatError):
+        find_header_value(b'method{"id":1}', 'id')
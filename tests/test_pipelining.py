@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from shiny_rpc.errors import ClientFatalError
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.user import User
+from tests.helpers import (
+    connected,
+    echo,
+    example_request,
+    serving,
+)
+
+
+async def sleep(request: ExampleRequest, user: User) -> ExampleResponse:
+    await asyncio.sleep(float(request.payload.send_this))  # type:ignore[attr-defined]
+    return await echo(request, user)
+
+
+@pytest.fixture
+def sleep_handler(message_handler: MessageHandler) -> MessageHandler:
+    message_handler.add_method('sleep', sleep)  # type:ignore[arg-type]
+    return message_handler
+
+
+async def test_responses_are_matched_by_trace_id(sleep_handler: MessageHandler) -> None:
+    completed: list[str] = []
+
+    async with serving(sleep_handler, max_in_flight=8) as server, connected(server, max_in_flight=8) as client:
+
+        async def send(delay: str) -> None:
+            response = await client.send(example_request('sleep', send_this=delay), ExampleResponse)
+            assert response.payload.send_this == delay  # type:ignore[attr-defined]
+            completed.append(delay)
+
+        await asyncio.gather(send('0.2'), send('0.1'), send('0'))
+
+    # Slow request doesn`t hold responses of fast ones
+    assert completed == ['0', '0.1', '0.2']
+
+
+async def test_pipelined_client_with_sequential_server(sleep_handler: MessageHandler) -> None:
+    async with serving(sleep_handler) as server, connected(server, max_in_flight=8) as client:
+        responses = await asyncio.gather(
+            *(client.send(example_request('sleep', send_this=delay), ExampleResponse) for delay in ('0.1', '0')),
+        )
+
+        assert [response.payload.send_this for response in responses] == ['0.1', '0']  # type:ignore[attr-defined]
+
+
+async def test_response_without_trace_id_fails_pending_requests(sleep_handler: MessageHandler) -> None:
+    async with serving(sleep_handler, max_in_flight=8) as server, connected(server, max_in_flight=8) as client:
+        pending = asyncio.create_task(client.send(example_request('sleep', send_this='0.2'), ExampleResponse))
+        await asyncio.sleep(0.05)
+
+        # Server can`t tell, which request has failed, when it can`t read trace_id
+        client.framing.write(client.output, b'not a message')
+
+        with pytest.raises(ClientFatalError):
+            await pending
+        assert not client.is_connected
+
+        await client.connect()
+        assert (await client.send(example_request(), ExampleResponse)).success
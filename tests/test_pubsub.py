@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from shiny_rpc.errors import ClientFatalError
+from shiny_rpc.examples import ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.pubsub import PubSub, PushMessage
+from shiny_rpc.user import User
+from tests.helpers import (
+    connected,
+    example_request,
+    make_user,
+    serving,
+)
+
+
+def make_subscriber(connection_id: int, buffer_size: int = 0) -> User:
+    user = make_user(connection_id)
+    transport = user.writer.transport
+    assert isinstance(transport, Mock)
+    transport.get_write_buffer_limits.return_value = (0, 2**16)
+    transport.get_write_buffer_size.return_value = buffer_size
+    transport.is_closing.return_value = False
+    return user
+
+
+async def test_message_is_pushed_to_subscribers() -> None:
+    pubsub = PubSub()
+    first, second = make_subscriber(1), make_subscriber(2)
+    pubsub.subscribe(first, ['a', 'b'])
+    pubsub.subscribe(second, ['a'])
+
+    assert pubsub.publish('a', {'value': 1}) == len([first, second])
+    assert pubsub.publish('b') == 1
+    assert pubsub.publish('c') == 0
+
+    pubsub.unsubscribe(first, ['a'])
+    pubsub.remove(second)
+    assert pubsub.publish('a') == 0
+    assert first.topics == {'b'}
+    assert pubsub.stats() == {'pubsub_topics': 1, 'pubsub_published': 4, 'pubsub_pushed': 3, 'pubsub_dropped': 0}
+
+
+async def test_slow_subscriber_drops_oldest_frames() -> None:
+    pubsub = PubSub(max_queue=2)
+    user = make_subscriber(1, buffer_size=2**17)
+    pubsub.subscribe(user, ['a'])
+
+    for value in range(3):
+        pubsub.publish('a', {'value': value})
+
+    assert pubsub.dropped == 1
+    assert [PushMessage.from_bytes(frame).payload.data for frame in pubsub.queues[user.connection_id]] == [  # type:ignore[attr-defined]
+        {'value': 1},
+        {'value': 2},
+    ]
+
+    pubsub.remove(user)
+    assert not pubsub.queues
+    assert not pubsub.senders
+
+
+async def test_client_receives_published_messages(message_handler: MessageHandler) -> None:
+    async with serving(message_handler) as server, connected(server, max_in_flight=8) as client:
+        messages = client.subscribe('a', 'b')
+        received = asyncio.ensure_future(anext(messages))
+        await asyncio.sleep(0)
+        # Sequential server answers after subscribe request is handled
+        assert (await client.send(example_request(), ExampleResponse)).success
+
+        assert server.publish('b', {'value': 1}) == 1
+        message = await received
+
+        assert message.payload.topic == 'b'  # type:ignore[attr-defined]
+        assert message.payload.data == {'value': 1}  # type:ignore[attr-defined]
+
+        await messages.aclose()
+        assert (await client.send(example_request(), ExampleResponse)).success
+        assert not server.pubsub.subscribers
+
+
+async def test_subscribe_requires_pipelined_client(message_handler: MessageHandler) -> None:
+    async with serving(message_handler) as server, connected(server) as client:
+        with pytest.raises(ClientFatalError):
+            await anext(client.subscribe('a'))
@@ -0,0 +1,155 @@
+import pytest
+
+from shiny_rpc import ratelimit
+from shiny_rpc.constants import ZERO_TRACE_ID
+from shiny_rpc.errors import ServerFatalError
+from shiny_rpc.examples import ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import (
+    ErrorResponse,
+    Request,
+    Response,
+)
+from shiny_rpc.ratelimit import RateLimit, RateLimiter
+from shiny_rpc.user import User
+from tests.helpers import (
+    connected,
+    example_request,
+    make_user,
+    serving,
+)
+
+TRACE_ID = '9f6a4a56-4c46-4c0c-9e4a-8d6b2a6f1d3e'
+# Bucket is not refilled within test
+SLOW = RateLimit(rate=0.001, burst=1)
+
+
+def message(method_name: str = 'echo', trace_id: str = TRACE_ID, service_id: str | None = None) -> bytes:
+    service = b'' if service_id is None else b',"service_id":"%s"' % service_id.encode()
+    return b'%s{}{"trace_id":"%s"%s}' % (method_name.encode(), trace_id.encode(), service)
+
+
+def check(limiter: RateLimiter, user: User, data: bytes) -> ErrorResponse | None:
+    rejection = limiter.check(user, data)
+    return None if rejection is None else ErrorResponse.from_bytes(rejection)
+
+
+def test_invalid_limits_fail_at_start() -> None:
+    with pytest.raises(ServerFatalError):
+        RateLimit(rate=0)
+
+    with pytest.raises(ServerFatalError):
+        RateLimiter(per_identity=SLOW)
+
+    assert RateLimit(rate=0.5).burst == 1
+
+
+async def test_connection_limit() -> None:
+    limiter = RateLimiter(per_connection=SLOW)
+    user, other_user = make_user(1), make_user(2)
+
+    assert check(limiter, user, message()) is None
+    assert check(limiter, other_user, message()) is None
+
+    rejection = check(limiter, user, message())
+    assert rejection is not None
+    assert rejection.trace_id == TRACE_ID
+    assert rejection.payload.error_code == 'RateLimited'  # type:ignore[attr-defined]
+    assert rejection.payload.details['details'] == {'scope': 'connection', 'retry_after': 1000, 'retryable': True}  # type:ignore[attr-defined]
+
+    # Reconnected user gets a new bucket
+    limiter.remove(user)
+    assert check(limiter, user, message()) is None
+    assert limiter.stats() == {'rate_limited_connection': 1, 'rate_limited_identity': 0, 'rate_limited_method': 0}
+
+
+async def test_identity_is_shared_by_connections() -> None:
+    limiter = RateLimiter(per_identity=SLOW, identity_header='service_id')
+
+    assert check(limiter, make_user(1), message(service_id='a')) is None
+    assert check(limiter, make_user(2), message(service_id='a')) is not None
+    assert check(limiter, make_user(2), message(service_id='b')) is None
+    # Request without identity is not limited by it
+    assert check(limiter, make_user(2), message()) is None
+
+
+async def test_identity_is_not_taken_from_payload() -> None:
+    limiter = RateLimiter(per_identity=SLOW, identity_header='service_id')
+    user = make_user()
+
+    for _ in range(2):
+        assert check(limiter, user, b'echo{"service_id":"a"}{"trace_id":"%s"}' % TRACE_ID.encode()) is None
+
+    assert not limiter.identities
+
+
+async def test_least_recently_seen_identity_is_dropped(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ratelimit, 'MAX_IDENTITIES', 2)
+    limiter = RateLimiter(per_identity=SLOW, identity_header='service_id')
+    user = make_user()
+
+    for service_id in ('a', 'b', 'c'):
+        assert check(limiter, user, message(service_id=service_id)) is None
+
+    assert list(limiter.identities) == ['b', 'c']
+    # Dropped identity starts with full bucket
+    assert check(limiter, user, message(service_id='a')) is None
+
+
+async def test_rejected_request_takes_no_tokens() -> None:
+    limiter = RateLimiter(per_connection=RateLimit(rate=0.001, burst=2), per_method={'slow': SLOW})
+    user = make_user()
+
+    assert check(limiter, user, message('slow')) is None
+    rejection = check(limiter, user, message('slow'))
+    assert rejection is not None
+    assert rejection.payload.details['details']['scope'] == 'method'  # type:ignore[attr-defined]
+
+    # Method without limit still has connection token left
+    assert check(limiter, user, message()) is None
+    assert check(limiter, user, message()) is not None
+
+
+@pytest.mark.parametrize(
+    ('data', 'trace_id'),
+    [
+        (message(trace_id='short'), 'short'),
+        (message(trace_id='"quoted"'.replace('"', '\\"')), '"quoted"'),
+        (b'echo{}{', ZERO_TRACE_ID),
+    ],
+)
+async def test_rejection_keeps_any_trace_id(data: bytes, trace_id: str) -> None:
+    limiter = RateLimiter(per_connection=SLOW)
+    user = make_user()
+    limiter.check(user, message())
+
+    rejection = check(limiter, user, data)
+
+    assert rejection is not None
+    assert rejection.trace_id == trace_id
+
+
+async def test_rate_limited_response(message_handler: MessageHandler) -> None:
+    async with serving(message_handler, rate_limit=SLOW) as server, connected(server) as client:
+        assert (await client.send(example_request(), ExampleResponse)).success
+
+        response = await client.send(example_request(), ExampleResponse)
+        assert response.payload.error_code == 'RateLimited'  # type:ignore[attr-defined]
+        assert server.stats()['rate_limited_connection'] == 1
+
+
+async def test_batch_requests_are_limited_one_by_one(message_handler: MessageHandler) -> None:
+    # Batch is larger than burst, while envelope itself takes no token
+    burst = 3
+    requests: list[tuple[Request, type[Response]]] = [(example_request(), ExampleResponse) for _ in range(burst + 2)]
+
+    async with (
+        serving(message_handler, rate_limit=RateLimit(rate=0.001, burst=burst)) as server,
+        connected(server) as client,
+    ):
+        responses = await client.send_batch(requests)
+
+        assert [response.success for response in responses] == [True] * burst + [False] * 2
+        assert [response.trace_id for response in responses] == [request.trace_id for request, _ in requests]
+        assert responses[-1].payload.details['details']['retryable']  # type:ignore[attr-defined]
+        assert server.stats()['rate_limited_connection'] == len(requests) - burst
@@ -0,0 +1,75 @@
+from shiny_rpc.examples import ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.router import Router, RouterServer
+from shiny_rpc.server import Server
+from tests.helpers import (
+    connected,
+    count,
+    example_request,
+    free_port,
+    running,
+    serving,
+)
+
+
+def test_longest_prefix_wins() -> None:
+    router = Router()
+    router.add_route('todo', [('127.0.0.1', 1)])
+    router.add_route('todo_list', [('127.0.0.1', 2)])
+
+    assert router.find_pool('todo_list_tasks') is router.routes['todo_list']
+    assert router.find_pool('todo_task') is router.routes['todo']
+    assert router.find_pool('user') is None
+
+    # Cached lookups are dropped with routing table changes
+    router.add_route('todo_task', [('127.0.0.1', 3)])
+    assert router.find_pool('todo_task') is router.routes['todo_task']
+
+
+def make_router_server(routes: dict[str, list[tuple[str, int]]]) -> RouterServer:
+    router = Router()
+    for prefix, upstreams in routes.items():
+        router.add_route(prefix, upstreams)
+
+    return RouterServer('127.0.0.1', 0, router, max_in_flight=8)
+
+
+def upstream_of(server: Server) -> list[tuple[str, int]]:
+    return [(server.host, server.port)]
+
+
+async def test_requests_are_forwarded(message_handler: MessageHandler) -> None:
+    message_handler.add_method('count', count)  # type:ignore[arg-type]
+
+    async with (
+        serving(message_handler, max_in_flight=8) as backend,
+        running(make_router_server({'': upstream_of(backend)})) as router_server,
+        connected(router_server) as client,
+    ):
+        response = await client.send(example_request(send_this='routed'), ExampleResponse)
+        assert response.success
+        assert response.payload.send_this == 'routed'  # type:ignore[attr-defined]
+
+        responses = [response async for response in client.stream(example_request('count'), ExampleResponse)]
+        assert [response.payload.some_param for response in responses] == ['0', '1', '2']  # type:ignore[attr-defined]
+
+
+async def test_unknown_route() -> None:
+    async with (
+        running(make_router_server({'todo': [('127.0.0.1', free_port())]})) as router_server,
+        connected(router_server) as client,
+    ):
+        response = await client.send(example_request())
+
+        assert response.payload.error_code == 'UnknownMethod'  # type:ignore[attr-defined]
+
+
+async def test_unavailable_upstream() -> None:
+    async with (
+        running(make_router_server({'': [('127.0.0.1', free_port())]})) as router_server,
+        connected(router_server) as client,
+    ):
+        response = await client.send(example_request())
+
+        assert not response.success
+        assert response.payload.error_code == 'UpstreamUnavailable'  # type:ignore[attr-defined]
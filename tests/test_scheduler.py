@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from shiny_rpc.errors import MethodOverloadedError
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Response
+from shiny_rpc.scheduler import (
+    MethodLimits,
+    Priority,
+    Scheduler,
+)
+from shiny_rpc.user import User
+from tests.helpers import (
+    echo,
+    example_request,
+    make_user,
+)
+
+
+async def started(scheduler: Scheduler, method_name: str) -> asyncio.Task[None]:
+    task = asyncio.create_task(scheduler.acquire(method_name))
+    # Let task reach its waiter
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_method_concurrency_is_limited() -> None:
+    scheduler = Scheduler({'limited': MethodLimits(max_concurrency=1)})
+    await scheduler.acquire('limited')
+    # Methods without limits are not blocked by limited one
+    await scheduler.acquire('free')
+
+    waiting = await started(scheduler, 'limited')
+    assert not waiting.done()
+    assert scheduler.total_stats() == {'scheduled_running': 2, 'scheduled_waiting': 1, 'scheduled_rejected': 0}
+
+    scheduler.release('limited')
+    await waiting
+    assert scheduler.stats()['limited']['started'] == scheduler.stats()['limited']['queued'] + 1
+
+
+async def test_total_concurrency_is_limited() -> None:
+    scheduler = Scheduler({}, max_concurrency=1)
+    await scheduler.acquire('first')
+
+    waiting = await started(scheduler, 'second')
+    assert not waiting.done()
+
+    scheduler.release('first')
+    await waiting
+
+
+async def test_call_above_max_queue_is_rejected() -> None:
+    scheduler = Scheduler({'limited': MethodLimits(max_concurrency=1, max_queue=1)})
+    await scheduler.acquire('limited')
+    waiting = await started(scheduler, 'limited')
+
+    with pytest.raises(MethodOverloadedError) as error:
+        await scheduler.acquire('limited')
+
+    assert error.value.details['details']['retryable']
+    assert scheduler.total_stats()['scheduled_rejected'] == 1
+    waiting.cancel()
+
+
+async def test_free_slot_goes_to_best_priority() -> None:
+    scheduler = Scheduler(
+        {'low': MethodLimits(priority=Priority.LOW), 'high': MethodLimits(priority=Priority.HIGH)},
+        max_concurrency=1,
+    )
+    await scheduler.acquire('low')
+    low = await started(scheduler, 'low')
+    high = await started(scheduler, 'high')
+
+    scheduler.release('low')
+    await high
+    assert not low.done()
+
+    scheduler.release('high')
+    await low
+
+
+async def test_waiting_call_is_aged() -> None:
+    aging_interval = 0.01
+    scheduler = Scheduler(
+        {'low': MethodLimits(priority=Priority.LOW), 'high': MethodLimits(priority=Priority.HIGH)},
+        max_concurrency=1,
+        aging_interval=aging_interval,
+    )
+    await scheduler.acquire('high')
+    low = await started(scheduler, 'low')
+    # Low call is raised above high one after two intervals
+    await asyncio.sleep(aging_interval * 3)
+    high = await started(scheduler, 'high')
+
+    scheduler.release('high')
+    await low
+    assert not high.done()
+    high.cancel()
+
+
+async def test_cancelled_waiter_leaves_queue() -> None:
+    scheduler = Scheduler({'limited': MethodLimits(max_concurrency=1)})
+    await scheduler.acquire('limited')
+    waiting = await started(scheduler, 'limited')
+
+    waiting.cancel()
+    await asyncio.sleep(0)
+    scheduler.release('limited')
+
+    assert scheduler.total_stats() == {'scheduled_running': 0, 'scheduled_waiting': 0, 'scheduled_rejected': 0}
+
+
+async def test_method_overloaded_response(message_handler: MessageHandler) -> None:
+    release = asyncio.Event()
+
+    async def blocked(request: ExampleRequest, user: User) -> ExampleResponse:
+        await release.wait()
+        return await echo(request, user)
+
+    message_handler.add_method('blocked', blocked, max_concurrency=1, max_queue=1)  # type:ignore[arg-type]
+    calls = [
+        asyncio.create_task(message_handler.handle(example_request('blocked').dump(), make_user()))
+        for _ in range(3)
+    ]
+
+    done, _ = await asyncio.wait(calls, return_when=asyncio.FIRST_COMPLETED)
+    release.set()
+    responses = [response for response in await asyncio.gather(*calls) if isinstance(response, Response)]
+
+    assert [call in done for call in calls] == [False, False, True]
+    assert [response.success for response in responses] == [True, True, False]
+    assert responses[2].payload.error_code == 'MethodOverloaded'  # type:ignore[attr-defined]
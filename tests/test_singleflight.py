@@ -0,0 +1,97 @@
+import asyncio
+
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Response
+from shiny_rpc.singleflight import SingleFlight
+from shiny_rpc.user import User
+from tests.helpers import (
+    echo,
+    example_request,
+    make_user,
+)
+
+
+class Execution:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.calls
+
+
+async def test_concurrent_calls_share_execution() -> None:
+    singleflight = SingleFlight()
+    execution = Execution()
+
+    calls = [asyncio.create_task(singleflight.run(key, execution)) for key in ('a', 'a', 'b')]
+    await asyncio.sleep(0)
+    execution.release.set()
+
+    assert sorted(await asyncio.gather(*calls)) == [1, 1, 2]
+    assert singleflight.stats() == {'singleflight_in_flight': 0, 'singleflight_executions': 2, 'singleflight_coalesced': 1}
+
+    # Result is not kept after execution is done
+    assert await singleflight.run('a', execution) == execution.calls
+
+
+async def test_execution_survives_cancelled_caller() -> None:
+    singleflight = SingleFlight()
+    execution = Execution()
+
+    cancelled = asyncio.create_task(singleflight.run('a', execution))
+    waiting = asyncio.create_task(singleflight.run('a', execution))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    execution.release.set()
+
+    assert await waiting == 1
+    assert not execution.cancelled
+
+
+async def test_execution_is_cancelled_without_callers() -> None:
+    singleflight = SingleFlight()
+    execution = Execution()
+
+    call = asyncio.create_task(singleflight.run('a', execution))
+    await asyncio.sleep(0)
+    flight = singleflight.flights['a']
+
+    call.cancel()
+    await asyncio.wait([flight.task])
+
+    assert flight.task.cancelled()
+    assert not singleflight.flights
+
+
+async def test_coalesced_method(message_handler: MessageHandler) -> None:
+    calls: list[str] = []
+
+    async def read(request: ExampleRequest, user: User) -> ExampleResponse:
+        calls.append(request.payload.send_this)  # type:ignore[attr-defined]
+        await asyncio.sleep(0.01)
+        return await echo(request, user)
+
+    message_handler.add_method('read', read, coalesce=True)  # type:ignore[arg-type]
+    requests = [example_request('read', send_this=send_this) for send_this in ('a', 'a', 'b')]
+
+    responses = await asyncio.gather(
+        *(message_handler.handle(request.dump(), make_user(connection_id)) for connection_id, request in enumerate(requests)),
+    )
+
+    assert sorted(calls) == ['a', 'b']
+    for request, response in zip(requests, responses, strict=True):
+        assert isinstance(response, Response)
+        # Every caller gets shared response with its own trace_id
+        assert Response.from_bytes(response.dump()).trace_id == request.trace_id
+        assert ExampleResponse.from_bytes(response.dump()).payload.send_this == request.payload.send_this  # type:ignore[attr-defined]
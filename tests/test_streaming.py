@@ -0,0 +1,89 @@
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+
+import pytest
+
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import Response
+from shiny_rpc.user import User
+from tests.helpers import (
+    connected,
+    count,
+    example_request,
+    make_user,
+    serving,
+)
+
+
+async def fail_after_first(request: ExampleRequest, user: User) -> AsyncIterator[ExampleResponse]:
+    async for response in count(request, user):
+        yield response
+        raise RuntimeError
+
+
+@pytest.fixture
+def streaming_handler(message_handler: MessageHandler) -> MessageHandler:
+    message_handler.add_method('count', count)  # type:ignore[arg-type]
+    message_handler.add_method('fail_after_first', fail_after_first)  # type:ignore[arg-type]
+    return message_handler
+
+
+async def stream(message_handler: MessageHandler, method_name: str) -> AsyncGenerator[Response, None]:
+    responses = await message_handler.handle(example_request(method_name).dump(), make_user())
+    assert not isinstance(responses, Response)
+    return responses
+
+
+async def test_stream_frames_are_numbered(streaming_handler: MessageHandler) -> None:
+    responses = [response async for response in await stream(streaming_handler, 'count')]
+
+    assert [(response.status, response.sequence) for response in responses] == [
+        ('ok', 0),
+        ('ok', 1),
+        ('ok', 2),
+        ('end', 3),
+    ]
+    assert len({response.trace_id for response in responses}) == 1
+
+
+async def test_stream_ends_with_error_of_method(streaming_handler: MessageHandler) -> None:
+    responses = [response async for response in await stream(streaming_handler, 'fail_after_first')]
+
+    assert [(response.status, response.sequence) for response in responses] == [('ok', 0), ('err', 1)]
+    assert responses[-1].end_of_stream
+    assert responses[-1].payload.error_code == 'MethodInternal'  # type:ignore[attr-defined]
+
+
+async def test_cancelled_stream_is_not_answered_with_error(message_handler: MessageHandler) -> None:
+    closed = asyncio.Event()
+
+    async def endless(request: ExampleRequest, user: User) -> AsyncIterator[ExampleResponse]:  # noqa: ARG001
+        try:
+            await asyncio.Event().wait()
+            yield ExampleResponse(method_name=request.method_name, trace_id=request.trace_id, success=True)
+        finally:
+            closed.set()
+
+    message_handler.add_method('endless', endless)  # type:ignore[arg-type]
+    responses = await stream(message_handler, 'endless')
+    task = asyncio.ensure_future(anext(responses))
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert closed.is_set()
+    assert message_handler.scheduler.total_stats()['scheduled_running'] == 0
+
+
+async def test_client_stream(streaming_handler: MessageHandler) -> None:
+    async with serving(streaming_handler) as server, connected(server) as client:
+        responses = [response async for response in client.stream(example_request('count'), ExampleResponse)]
+        assert [response.payload.some_param for response in responses] == ['0', '1', '2']  # type:ignore[attr-defined]
+
+        responses = [response async for response in client.stream(example_request('fail_after_first'), ExampleResponse)]
+        assert [response.success for response in responses] == [True, False]
+
+        # Connection is ready for the next request after the stream
+        assert (await client.send(example_request(), ExampleResponse)).success
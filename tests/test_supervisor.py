@@ -0,0 +1,84 @@
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+from collections.abc import Iterator
+
+import pytest
+
+from shiny_rpc.client import BaseClient
+from shiny_rpc.errors import ClientFatalError
+from shiny_rpc.examples import ExampleResponse
+from tests.helpers import example_request, free_port
+
+WORKERS = 2
+SERVER_SCRIPT = '''
+import logging
+import os
+import sys
+
+from shiny_rpc.examples import ExampleRequest, ExampleResponse
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.server import Server
+
+message_handler = MessageHandler()
+
+
+@message_handler.method('pid')
+async def pid(request: ExampleRequest, user) -> ExampleResponse:
+    return ExampleResponse(
+        method_name=request.method_name,
+        trace_id=request.trace_id,
+        success=True,
+        payload={**request.payload.model_dump(), 'some_param': str(os.getpid())},
+    )
+
+
+Server('127.0.0.1', int(sys.argv[1]), message_handler, log_level=logging.WARNING).serve(workers=int(sys.argv[2]))
+'''
+
+
+@pytest.fixture
+def supervisor() -> Iterator[tuple[subprocess.Popen[bytes], int]]:
+    port = free_port()
+    process = subprocess.Popen([sys.executable, '-c', SERVER_SCRIPT, str(port), str(WORKERS)])  # noqa: S603
+    yield process, port
+
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+async def worker_pid(port: int) -> int:
+    # Every connection goes to one of workers, until they are started connections are refused
+    async with asyncio.timeout(5):
+        while True:
+            client = BaseClient('127.0.0.1', port)
+            try:
+                await client.connect()
+            except ClientFatalError:
+                await asyncio.sleep(0.05)
+                continue
+
+            response = await client.send(example_request('pid'), ExampleResponse)
+            client.output.close()
+            return int(response.payload.some_param)  # type:ignore[attr-defined]
+
+
+async def test_workers_share_port_and_are_restarted(supervisor: tuple[subprocess.Popen[bytes], int]) -> None:
+    process, port = supervisor
+
+    pids = {await worker_pid(port) for _ in range(50)}
+    assert len(pids) == WORKERS
+    assert process.pid not in pids
+
+    killed = pids.pop()
+    os.kill(killed, signal.SIGKILL)
+
+    # Worker, which crashed right after start, is restarted with delay
+    restarted = {await worker_pid(port) for _ in range(50)}
+    assert killed not in restarted
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=15) == 0
@@ -0,0 +1,121 @@
+import mmap
+import tempfile
+import threading
+from typing import IO
+
+import pytest
+
+from shiny_rpc.compression import COMPRESSED_MARKER
+from shiny_rpc.errors import MaxMessageSizeReceivedError
+from shiny_rpc.examples import ExampleResponse
+from shiny_rpc.framing import FramingMode
+from shiny_rpc.message_hander import MessageHandler
+from shiny_rpc.messages import ErrorResponse
+from shiny_rpc.upload import ChunkedUpload
+from shiny_rpc.user import User
+from tests.helpers import (
+    LazyExampleRequest,
+    connected,
+    example_request,
+    serving,
+)
+
+LARGE_VALUE = 'x' * 2**14  # 16 KB
+
+
+async def test_upload_is_kept_in_memory_up_to_spool_size() -> None:
+    with ChunkedUpload(spool_size=8, max_size=64) as upload:
+        await upload.write(b'abcd')
+        await upload.write(b'efgh')
+
+        assert not upload.is_spilled
+        assert upload.view() == b'abcdefgh'
+
+
+async def test_upload_is_spilled_to_file() -> None:
+    with ChunkedUpload(spool_size=8, max_size=64) as upload:
+        await upload.write(b'abcdef')
+        await upload.write(b'ghijkl')
+
+        assert upload.is_spilled
+        view = upload.view()
+        assert isinstance(view, mmap.mmap)
+        assert view[:] == b'abcdefghijkl'
+
+
+async def test_upload_is_limited_by_max_size() -> None:
+    with ChunkedUpload(spool_size=8, max_size=16) as upload:
+        await upload.write(b'x' * 16)
+
+        with pytest.raises(MaxMessageSizeReceivedError):
+            await upload.write(b'x')
+
+
+async def test_spill_is_written_outside_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    writers: list[int] = []
+    temporary_file = tempfile.TemporaryFile
+
+    def recording_temporary_file() -> IO[bytes]:
+        writers.append(threading.get_ident())
+        return temporary_file()
+
+    monkeypatch.setattr(tempfile, 'TemporaryFile', recording_temporary_file)
+
+    with ChunkedUpload(spool_size=8, max_size=64) as upload:
+        await upload.write(b'x' * 16)
+
+    assert writers
+    assert writers[0] != threading.get_ident()
+
+
+async def measure(request: LazyExampleRequest, user: User) -> ExampleResponse:  # noqa: ARG001
+    # Payload of spilled upload is read without a copy, until it is validated
+    size = len(request.raw_payload or b'')
+    request.payload  # noqa: B018
+
+    return ExampleResponse(
+        method_name=request.method_name,
+        trace_id=request.trace_id,
+        success=True,
+        payload={**request.payload.model_dump(), 'some_param': str(size), 'send_this': ''},
+    )
+
+
+@pytest.fixture
+def upload_handler(message_handler: MessageHandler) -> MessageHandler:
+    message_handler.add_method('measure', measure)  # type:ignore[arg-type]
+    return message_handler
+
+
+@pytest.mark.parametrize('max_message_size', [2**20, 2**12])
+async def test_chunked_request(upload_handler: MessageHandler, max_message_size: int) -> None:
+    async with (
+        serving(
+            upload_handler,
+            framing_mode=FramingMode.LENGTH_PREFIXED,
+            chunk_size=2**10,
+            max_message_size=max_message_size,
+        ) as server,
+        connected(server, framing_mode=FramingMode.LENGTH_PREFIXED, chunked=True) as client,
+    ):
+        response = await client.send(example_request('measure', send_this=LARGE_VALUE), ExampleResponse)
+
+        assert client.chunk_size == 2**10
+        assert response.success
+        assert int(response.payload.some_param) > len(LARGE_VALUE)  # type:ignore[attr-defined]
+
+
+async def test_invalid_chunk_skips_rest_of_upload(upload_handler: MessageHandler) -> None:
+    async with (
+        serving(upload_handler, framing_mode=FramingMode.LENGTH_PREFIXED) as server,
+        connected(server, framing_mode=FramingMode.LENGTH_PREFIXED, compression=True) as client,
+    ):
+        client.framing.write_chunk(client.output, COMPRESSED_MARKER + b'not zlib', more=True)
+        client.framing.write_chunk(client.output, b'{"send_this":"x"}', more=True)
+        client.framing.write_chunk(client.output, b'{}', more=False)
+
+        error = ErrorResponse.from_bytes(await client._read_message())
+        assert error.payload.error_code == 'ValidationError'  # type:ignore[attr-defined]
+
+        # Next message is read from its first frame
+        assert (await client.send(example_request(), ExampleResponse)).success
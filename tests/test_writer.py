@@ -0,0 +1,73 @@
+import asyncio
+from unittest.mock import Mock
+
+from shiny_rpc.framing import (
+    LENGTH_HEADER,
+    FramingMode,
+    make_framing,
+)
+from shiny_rpc.writer import FLUSH_THRESHOLD, CoalescingWriter
+
+
+def make_writer() -> tuple[CoalescingWriter, Mock]:
+    stream_writer = Mock(spec=asyncio.StreamWriter)
+    stream_writer.transport.get_write_buffer_limits.return_value = (0, 2**16)
+    stream_writer.transport.get_write_buffer_size.return_value = 0
+    stream_writer.transport.is_closing.return_value = False
+    return CoalescingWriter(stream_writer), stream_writer
+
+
+async def test_frames_of_one_iteration_are_written_at_once() -> None:
+    writer, stream_writer = make_writer()
+    framing = make_framing(mode=FramingMode.LENGTH_PREFIXED, max_message_size=2**10)
+
+    framing.write(writer, b'first')
+    framing.write(writer, b'second')
+    stream_writer.writelines.assert_not_called()
+
+    await asyncio.sleep(0)
+
+    stream_writer.writelines.assert_called_once()
+    (fragments,), _ = stream_writer.writelines.call_args
+    # Length headers and bodies are not concatenated
+    assert fragments == [LENGTH_HEADER.pack(5), b'first', LENGTH_HEADER.pack(6), b'second']
+
+
+async def test_writer_is_flushed_above_threshold() -> None:
+    writer, stream_writer = make_writer()
+
+    writer.writelines([b'x' * FLUSH_THRESHOLD])
+
+    stream_writer.writelines.assert_called_once()
+    # Scheduled flush has nothing to write
+    await asyncio.sleep(0)
+    stream_writer.writelines.assert_called_once()
+
+
+async def test_close_flushes_and_abort_drops() -> None:
+    writer, stream_writer = make_writer()
+
+    writer.writelines([b'data'])
+    writer.close()
+    stream_writer.writelines.assert_called_once_with([b'data'])
+    stream_writer.close.assert_called_once()
+
+    writer.writelines([b'lost'])
+    writer.abort()
+    await asyncio.sleep(0)
+    stream_writer.writelines.assert_called_once()
+    stream_writer.transport.abort.assert_called_once()
+
+
+async def test_drain_waits_only_when_congested() -> None:
+    writer, stream_writer = make_writer()
+
+    writer.writelines([b'data'])
+    await writer.drain()
+    stream_writer.drain.assert_not_called()
+
+    # Collected frames are counted along with transport buffer
+    stream_writer.transport.get_write_buffer_size.return_value = 2**16 - 1
+    await writer.drain()
+    stream_writer.writelines.assert_called_once_with([b'data'])
+    stream_writer.drain.assert_called_once()